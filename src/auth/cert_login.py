@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Dict, Optional, Tuple
 import logging
 
+from core.http_session import get_http_session
+
 logger = logging.getLogger("BetfairBot")
 
 
@@ -15,7 +17,8 @@ class BetfairAuthenticator:
     """Handles Betfair certificate-based authentication"""
     
     def __init__(self, app_key: str, username: str, password: str, 
-                 cert_path: str = None, key_path: str = None, login_endpoint: str = None):
+                 cert_path: str = None, key_path: str = None, login_endpoint: str = None,
+                 http_session: Optional[requests.Session] = None):
         """
         Initialize authenticator
         
@@ -26,6 +29,7 @@ class BetfairAuthenticator:
             cert_path: Path to certificate file (.crt) - optional for password login
             key_path: Path to private key file (.key) - optional for password login
             login_endpoint: Betfair login endpoint URL - optional (defaults to cert endpoint)
+            http_session: Optional pooled HTTP session (defaults to the shared one)
         """
         self.app_key = app_key
         self.username = username
@@ -34,6 +38,7 @@ class BetfairAuthenticator:
         self.key_path = Path(key_path) if key_path else None
         self.login_endpoint = login_endpoint or "https://identitysso-cert.betfair.it/api/certlogin"
         self.session_token: Optional[str] = None
+        self.http_session = http_session or get_http_session()
         
         # Validate certificate files exist (only if provided - optional for password login)
         if self.cert_path and not self.cert_path.exists():
@@ -76,7 +81,7 @@ class BetfairAuthenticator:
             if not self.cert_path or not self.key_path:
                 raise ValueError("Certificate files required for certificate-based login")
             
-            response = requests.post(
+            response = self.http_session.post(
                 self.login_endpoint,
                 headers=headers,
                 data=form_data,
@@ -175,7 +180,7 @@ class BetfairAuthenticator:
             })
             
             # Make POST request (no certificate needed)
-            response = requests.post(
+            response = self.http_session.post(
                 login_endpoint,
                 headers=headers,
                 data=form_data,
@@ -8,6 +8,8 @@ import time
 import logging
 from typing import Optional, Callable
 
+from core.http_session import get_http_session
+
 logger = logging.getLogger("BetfairBot")
 
 
@@ -16,7 +18,8 @@ class KeepAliveManager:
     
     def __init__(self, app_key: str, session_token: str, 
                  keep_alive_interval: int = 300,
-                 on_session_expired: Optional[Callable[[], None]] = None):
+                 on_session_expired: Optional[Callable[[], None]] = None,
+                 http_session: Optional[requests.Session] = None):
         """
         Initialize keep-alive manager
         
@@ -25,6 +28,7 @@ class KeepAliveManager:
             session_token: Current session token
             keep_alive_interval: Interval in seconds between keep-alive calls
             on_session_expired: Optional callback function when session expires (will be called with no args)
+            http_session: Optional pooled HTTP session (defaults to the shared one)
         """
         self.app_key = app_key
         self.session_token = session_token
@@ -33,9 +37,11 @@ class KeepAliveManager:
         self.keep_alive_endpoint = "https://identitysso.betfair.it/api/keepAlive"
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self._stop_requested = threading.Event()  # Wakes the loop's interval wait on stop()
         self.last_keep_alive_time: Optional[float] = None
         self.on_session_expired = on_session_expired
         self._session_expired_detected = False
+        self.http_session = http_session or get_http_session()
     
     def start(self):
         """Start keep-alive thread"""
@@ -44,6 +50,7 @@ class KeepAliveManager:
             return
         
         self.running = True
+        self._stop_requested.clear()
         self.thread = threading.Thread(target=self._keep_alive_loop, daemon=True)
         self.thread.start()
         # Logging moved to main.py setup checklist
@@ -51,6 +58,7 @@ class KeepAliveManager:
     def stop(self):
         """Stop keep-alive thread"""
         self.running = False
+        self._stop_requested.set()
         if self.thread:
             try:
                 self.thread.join(timeout=5)
@@ -73,13 +81,11 @@ class KeepAliveManager:
                     self.last_keep_alive_time = time.time()
                 else:
                     logger.warning("Keep-alive request failed")
-                
-                # Sleep until next interval
-                time.sleep(self.keep_alive_interval)
-                
             except Exception as e:
                 logger.error(f"Error in keep-alive loop: {str(e)}")
-                time.sleep(self.keep_alive_interval)
+            
+            # Wait until next interval (returns at once when stop() is called)
+            self._stop_requested.wait(self.keep_alive_interval)
     
     def _send_keep_alive(self) -> bool:
         """
@@ -95,7 +101,7 @@ class KeepAliveManager:
                 'Accept': 'application/json'
             }
             
-            response = requests.post(
+            response = self.http_session.post(
                 self.keep_alive_endpoint,
                 headers=headers,
                 timeout=10
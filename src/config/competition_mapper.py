@@ -5,11 +5,37 @@ Reads competition names from Excel file and maps them to Betfair competition IDs
 import pandas as pd
 import logging
 import re
+import sys
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Any, Tuple
+from typing import List, Dict, Set, FrozenSet, Optional, Any, Tuple
 
 logger = logging.getLogger("BetfairBot")
 
+# Parsed competitions workbook per path: {excel_path: (file mtime_ns, DataFrame)}
+_excel_frame_cache: Dict[str, Tuple[int, pd.DataFrame]] = {}
+
+
+def _read_competitions_excel(excel_path: str) -> pd.DataFrame:
+    """
+    Read the competitions workbook once and reuse it until the file changes on disk
+    
+    Startup reads the same Excel from several functions in this module; only the
+    first call parses it. Callers must treat the returned DataFrame as read-only.
+    
+    Args:
+        excel_path: Path to Excel file
+    
+    Returns:
+        DataFrame with the first sheet
+    """
+    mtime = Path(excel_path).stat().st_mtime_ns
+    cached = _excel_frame_cache.get(excel_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    df = pd.read_excel(excel_path)
+    _excel_frame_cache[excel_path] = (mtime, df)
+    return df
+
 
 def read_competitions_from_excel(excel_path: str) -> Set[str]:
     """
@@ -23,7 +49,7 @@ def read_competitions_from_excel(excel_path: str) -> Set[str]:
         Set of unique competition names (from Competition-Live if available, else Competition)
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         # Priority 1: Use new columns (Competition-Live) if available
         if 'Competition-Live' in df.columns:
@@ -482,7 +508,7 @@ def map_competitions_direct_from_excel(excel_path: str,
         List of competition IDs that match
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         # Check if new columns exist
         if 'Competition-Betfair' not in df.columns:
@@ -576,7 +602,7 @@ def get_competition_ids_from_excel(excel_path: str,
         List of competition IDs
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         # Strategy 1: Direct mapping (new format with Competition-Betfair column)
         if 'Competition-Betfair' in df.columns:
@@ -619,7 +645,7 @@ def get_live_api_competition_ids_from_excel(excel_path: str) -> List[str]:
         List of Live API competition IDs (as strings)
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         competition_ids = []
         
@@ -671,7 +697,7 @@ def get_betfair_to_live_competition_mapping(excel_path: str) -> Dict[int, str]:
         Example: {67387: "96", 13: "24", ...}
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         mapping = {}
         
@@ -736,7 +762,7 @@ def get_live_api_competition_ids_from_excel(excel_path: str) -> List[str]:
         List of Live API competition IDs (as strings)
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         competition_ids = []
         
@@ -780,7 +806,7 @@ def get_live_api_competition_ids_from_excel(excel_path: str) -> List[str]:
         return []
 
 
-def get_competitions_with_zero_zero_exception(excel_path: str) -> Set[str]:
+def get_competitions_with_zero_zero_exception(excel_path: str) -> FrozenSet[str]:
     """
     Read Excel to identify competitions with 0-0 exception
     Supports both old format (Competition column) and new format (Competition-Live column)
@@ -789,15 +815,16 @@ def get_competitions_with_zero_zero_exception(excel_path: str) -> Set[str]:
         excel_path: Path to Excel file
     
     Returns:
-        Set of competition names that have 0-0 exception (Result = "0-0")
+        Frozen set of competition names that have 0-0 exception (Result = "0-0"),
+        interned since they are checked on every tracker update
     """
     try:
-        df = pd.read_excel(excel_path)
+        df = _read_competitions_excel(excel_path)
         
         # Check if 'Result' column exists
         if 'Result' not in df.columns:
             logger.warning("Column 'Result' not found in Excel file, no 0-0 exception competitions")
-            return set()
+            return frozenset()
         
         # Filter rows where Result = "0-0" (case-insensitive, handle whitespace)
         zero_zero_rows = df[
@@ -811,15 +838,15 @@ def get_competitions_with_zero_zero_exception(excel_path: str) -> Set[str]:
             competitions = zero_zero_rows['Competition'].dropna().unique().tolist()
         else:
             logger.warning("Neither 'Competition-Live' nor 'Competition' column found")
-            return set()
+            return frozenset()
         
         # Logging moved to main.py setup checklist
         if competitions:
             logger.debug(f"0-0 exception competitions: {', '.join(competitions[:10])}{'...' if len(competitions) > 10 else ''}")
         
-        return set(competitions)
+        return frozenset(sys.intern(str(name)) for name in competitions)
         
     except Exception as e:
         logger.error(f"Error reading 0-0 exception from Excel: {str(e)}")
-        return set()
+        return frozenset()
 
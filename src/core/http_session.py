@@ -0,0 +1,67 @@
+"""
+HTTP Session Module
+Shared pooled requests.Session so Betfair calls reuse TCP/TLS connections
+"""
+import logging
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("BetfairBot")
+
+# Connection pool sizing (one pool per host: API, account, identity SSO)
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 20
+
+# Only connection failures are retried at transport level: the request never reached
+# Betfair, so it is safe even for placeOrders. Read/status errors are left to callers.
+HTTP_CONNECT_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.3
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def create_http_session(pool_connections: int = HTTP_POOL_CONNECTIONS,
+                        pool_maxsize: int = HTTP_POOL_MAXSIZE) -> requests.Session:
+    """
+    Create a requests.Session with a keep-alive connection pool
+
+    Args:
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Maximum connections kept per host
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    retries = Retry(total=HTTP_CONNECT_RETRIES, connect=HTTP_CONNECT_RETRIES, read=0,
+                    status=0, backoff_factor=HTTP_RETRY_BACKOFF)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive"
+    })
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the process-wide shared session (created on first use)
+
+    Returns:
+        Shared requests.Session
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_http_session()
+                logger.debug("Shared HTTP session created")
+    return _shared_session
@@ -4,9 +4,41 @@ Configures file and console logging with rotation
 """
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import time
+from logging.handlers import RotatingFileHandler, MemoryHandler
 from pathlib import Path
 
+# Whether polling-loop console prints are shown (see console_print); set by setup_logging
+_console_verbose = True
+
+
+class ConsoleDedupFilter(logging.Filter):
+    """Drop console records repeating the previous INFO/DEBUG message within a time window"""
+    
+    def __init__(self, window_seconds: float):
+        """
+        Initialize console dedup filter
+        
+        Args:
+            window_seconds: How long an identical consecutive message stays suppressed
+        """
+        super().__init__()
+        self.window_seconds = window_seconds
+        self._last_key = None
+        self._last_time = 0.0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Warnings and errors always reach the console
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.levelno, record.getMessage())
+        now = time.monotonic()
+        if key == self._last_key and now - self._last_time < self.window_seconds:
+            return False
+        self._last_key = key
+        self._last_time = now
+        return True
+
 
 def setup_logging(log_config: dict) -> logging.Logger:
     """
@@ -20,10 +52,20 @@ def setup_logging(log_config: dict) -> logging.Logger:
             - backup_count: Number of backup log files to keep
             - console_output: Whether to output to console
             - clear_on_start: Whether to clear log file on each start (default: False)
+            - buffer_capacity: Records buffered before writing to the log file (default: 64, 0 = unbuffered);
+                               WARNING and above are written immediately, see flush_logs()
+            - console_verbose: Whether the polling loop prints state changes / bet details to
+                               stdout (default: console_output); logger output is unaffected
+            - console_dedup_seconds: Window in which an INFO/DEBUG console message identical to
+                                     the previous one is not repeated (default: 30, 0 = off);
+                                     the log file still receives every record
     
     Returns:
         Configured logger instance
     """
+    global _console_verbose
+    _console_verbose = bool(log_config.get("console_verbose", log_config.get("console_output", True)))
+    
     # Create logs directory if it doesn't exist
     log_file_path = log_config.get("file_path", "logs/betfair_bot.log")
     log_dir = Path(log_file_path).parent
@@ -62,13 +104,28 @@ def setup_logging(log_config: dict) -> logging.Logger:
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    
+    # Buffer file writes: one write burst per polling iteration instead of one per record
+    buffer_capacity = log_config.get("buffer_capacity", 64)
+    if buffer_capacity and buffer_capacity > 0:
+        buffered_handler = MemoryHandler(
+            capacity=buffer_capacity,
+            flushLevel=logging.WARNING,
+            target=file_handler
+        )
+        buffered_handler.setLevel(log_level)
+        logger.addHandler(buffered_handler)
+    else:
+        logger.addHandler(file_handler)
     
     # Console handler (with error handling for Windows console encoding issues)
     if log_config.get("console_output", True):
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
         console_handler.setFormatter(console_formatter)
+        console_dedup_seconds = log_config.get("console_dedup_seconds", 30)
+        if console_dedup_seconds and console_dedup_seconds > 0:
+            console_handler.addFilter(ConsoleDedupFilter(console_dedup_seconds))
         # Wrap stream to handle encoding errors gracefully
         import sys
         if sys.stdout.encoding and sys.stdout.encoding.lower() in ['cp1252', 'windows-1252']:
@@ -86,3 +143,19 @@ def setup_logging(log_config: dict) -> logging.Logger:
     
     return logger
 
+
+def is_console_verbose() -> bool:
+    """Check if polling-loop console prints are enabled"""
+    return _console_verbose
+
+
+def console_print(*args, **kwargs):
+    """print() for polling-loop output; skipped when console_verbose is off (headless runs)"""
+    if _console_verbose:
+        print(*args, **kwargs)
+
+
+def flush_logs():
+    """Write buffered log records to the log file (call once per polling iteration)"""
+    for handler in logging.getLogger("BetfairBot").handlers:
+        handler.flush()
@@ -5,6 +5,8 @@ Creates services for the bot
 import logging
 from typing import Optional
 
+from core.http_session import get_http_session
+
 logger = logging.getLogger("BetfairBot")
 
 
@@ -19,6 +21,8 @@ class ServiceFactory:
             config: Configuration dictionary
         """
         self.config = config
+        # Betfair services share one pooled session so API calls reuse TCP/TLS connections
+        self.http_session = get_http_session()
     
     def create_betting_service(self, app_key: str, session_token: str, 
                               api_endpoint: str):
@@ -34,7 +38,7 @@ class ServiceFactory:
             BettingService
         """
         from services.betfair import BettingService
-        return BettingService(app_key, session_token, api_endpoint)
+        return BettingService(app_key, session_token, api_endpoint, http_session=self.http_session)
     
     def create_market_service(self, app_key: str, session_token: str,
                              api_endpoint: str, account_endpoint: str):
@@ -52,7 +56,7 @@ class ServiceFactory:
         """
         from services.betfair import MarketService
         # MarketService doesn't need account_endpoint in constructor, but we store it for get_account_funds
-        market_service = MarketService(app_key, session_token, api_endpoint)
+        market_service = MarketService(app_key, session_token, api_endpoint, http_session=self.http_session)
         # Store account_endpoint for get_account_funds method
         market_service.account_endpoint = account_endpoint
         return market_service
@@ -3,8 +3,10 @@ Bet Executor Module
 Main logic for executing lay bets on Over X.5 markets
 """
 import logging
+import re
 import pandas as pd
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Tuple
 from services.betfair import (
     MarketService,
@@ -29,8 +31,93 @@ TARGET_OVER_TO_MARKET_TYPE = {
 }
 
 
+def list_over_under_markets(market_service: MarketService, target_over: float) -> Optional[list]:
+    """
+    Get in-play Over/Under X.5 market catalogue (shared by Over and Under lookups)
+    
+    Args:
+        market_service: MarketService instance
+        target_over: Target Over value (e.g., 2.5)
+    
+    Returns:
+        List of market catalogue entries, or None if target_over has no market type
+    """
+    # Get market type code for target_over
+    market_type_code = TARGET_OVER_TO_MARKET_TYPE.get(target_over)
+    if not market_type_code:
+        logger.warning(f"No market type code for target_over {target_over}")
+        return None
+    
+    return market_service.list_market_catalogue(
+        event_type_ids=[1],  # Football
+        competition_ids=[],
+        in_play_only=True,
+        market_type_codes=[market_type_code],
+        max_results=100
+    )
+
+
+def _find_over_under_runner(markets: list, event_id: str, target_over: float,
+                            side: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the "Over X.5" or "Under X.5" runner for an event in a market catalogue
+    
+    Args:
+        markets: Market catalogue (from list_over_under_markets)
+        event_id: Betfair event ID
+        target_over: Target Over value (e.g., 2.5)
+        side: "over" or "under"
+    
+    Returns:
+        Market/runner info dict or None if not found
+    """
+    for market in markets:
+        market_event = market.get("event", {})
+        if market_event.get("id") != event_id:
+            continue
+        
+        market_name = market.get("marketName", "")
+        
+        # Check if market name contains Over/Under
+        if "over" not in market_name.lower() or "under" not in market_name.lower():
+            continue
+        
+        # Find runner "Over X.5" / "Under X.5"
+        runners = market.get("runners", [])
+        for runner in runners:
+            runner_name = runner.get("runnerName", "")
+            if side in runner_name.lower():
+                # Extract number from runner name (e.g., "Over 2.5 Goals" -> 2.5)
+                numbers = re.findall(r'\d+\.?\d*', runner_name)
+                for num_str in numbers:
+                    try:
+                        num = float(num_str)
+                        if abs(num - target_over) < 0.1:  # Allow small difference
+                            return {
+                                "marketId": market.get("marketId"),
+                                "selectionId": runner.get("selectionId"),
+                                "marketName": market_name,
+                                "runnerName": runner_name
+                            }
+                    except ValueError:
+                        continue
+        
+        # If exact match not found, try to find any runner for this side
+        for runner in runners:
+            runner_name = runner.get("runnerName", "")
+            if side in runner_name.lower() and str(int(target_over)) in runner_name:
+                return {
+                    "marketId": market.get("marketId"),
+                    "selectionId": runner.get("selectionId"),
+                    "marketName": market_name,
+                    "runnerName": runner_name
+                }
+    
+    return None
+
+
 def find_over_market(market_service: MarketService, event_id: str, 
-                    target_over: float) -> Optional[Dict[str, Any]]:
+                    target_over: float, markets: Optional[list] = None) -> Optional[Dict[str, Any]]:
     """
     Find Over X.5 market for an event
     
@@ -38,6 +125,7 @@ def find_over_market(market_service: MarketService, event_id: str,
         market_service: MarketService instance
         event_id: Betfair event ID
         target_over: Target Over value (e.g., 2.5)
+        markets: Optional market catalogue already fetched with list_over_under_markets
     
     Returns:
         {
@@ -48,64 +136,15 @@ def find_over_market(market_service: MarketService, event_id: str,
         } or None if not found
     """
     try:
-        # Get market type code for target_over
-        market_type_code = TARGET_OVER_TO_MARKET_TYPE.get(target_over)
-        if not market_type_code:
-            logger.warning(f"No market type code for target_over {target_over}")
-            return None
+        if markets is None:
+            markets = list_over_under_markets(market_service, target_over)
+            if markets is None:
+                return None
         
-        # Get markets for this event
-        markets = market_service.list_market_catalogue(
-            event_type_ids=[1],  # Football
-            competition_ids=[],
-            in_play_only=True,
-            market_type_codes=[market_type_code],
-            max_results=100
-        )
-        
-        # Find market for this specific event
-        for market in markets:
-            market_event = market.get("event", {})
-            if market_event.get("id") == event_id:
-                market_name = market.get("marketName", "")
-                
-                # Check if market name contains Over/Under
-                if "over" in market_name.lower() and "under" in market_name.lower():
-                    # Find runner "Over X.5"
-                    runners = market.get("runners", [])
-                    for runner in runners:
-                        runner_name = runner.get("runnerName", "")
-                        # Check if runner name contains "Over" and the target number
-                        if "over" in runner_name.lower():
-                            # Extract number from runner name (e.g., "Over 2.5 Goals" -> 2.5)
-                            import re
-                            numbers = re.findall(r'\d+\.?\d*', runner_name)
-                            for num_str in numbers:
-                                try:
-                                    num = float(num_str)
-                                    if abs(num - target_over) < 0.1:  # Allow small difference
-                                        return {
-                                            "marketId": market.get("marketId"),
-                                            "selectionId": runner.get("selectionId"),
-                                            "marketName": market_name,
-                                            "runnerName": runner_name
-                                        }
-                                except ValueError:
-                                    continue
-                    
-                    # If exact match not found, try to find any "Over" runner
-                    for runner in runners:
-                        runner_name = runner.get("runnerName", "")
-                        if "over" in runner_name.lower() and str(int(target_over)) in runner_name:
-                            return {
-                                "marketId": market.get("marketId"),
-                                "selectionId": runner.get("selectionId"),
-                                "marketName": market_name,
-                                "runnerName": runner_name
-                            }
-        
-        logger.debug(f"Over {target_over} market not found for event {event_id}")
-        return None
+        market_info = _find_over_under_runner(markets, event_id, target_over, "over")
+        if not market_info:
+            logger.debug(f"Over {target_over} market not found for event {event_id}")
+        return market_info
         
     except Exception as e:
         logger.error(f"Error finding over market: {str(e)}")
@@ -113,7 +152,7 @@ def find_over_market(market_service: MarketService, event_id: str,
 
 
 def find_under_market(market_service: MarketService, event_id: str, 
-                     target_over: float) -> Optional[Dict[str, Any]]:
+                     target_over: float, markets: Optional[list] = None) -> Optional[Dict[str, Any]]:
     """
     Find Under X.5 market for an event (same market as Over X.5, different selection)
     
@@ -121,6 +160,7 @@ def find_under_market(market_service: MarketService, event_id: str,
         market_service: MarketService instance
         event_id: Betfair event ID
         target_over: Target Over value (e.g., 2.5) - same market, Under X.5 selection
+        markets: Optional market catalogue already fetched with list_over_under_markets
     
     Returns:
         {
@@ -131,72 +171,37 @@ def find_under_market(market_service: MarketService, event_id: str,
         } or None if not found
     """
     try:
-        # Get market type code for target_over (same as Over X.5)
-        market_type_code = TARGET_OVER_TO_MARKET_TYPE.get(target_over)
-        if not market_type_code:
-            logger.warning(f"No market type code for target_over {target_over}")
-            return None
+        if markets is None:
+            markets = list_over_under_markets(market_service, target_over)
+            if markets is None:
+                return None
         
-        # Get markets for this event
-        markets = market_service.list_market_catalogue(
-            event_type_ids=[1],  # Football
-            competition_ids=[],
-            in_play_only=True,
-            market_type_codes=[market_type_code],
-            max_results=100
-        )
-        
-        # Find market for this specific event
-        for market in markets:
-            market_event = market.get("event", {})
-            if market_event.get("id") == event_id:
-                market_name = market.get("marketName", "")
-                
-                # Check if market name contains Over/Under
-                if "over" in market_name.lower() and "under" in market_name.lower():
-                    # Find runner "Under X.5"
-                    runners = market.get("runners", [])
-                    for runner in runners:
-                        runner_name = runner.get("runnerName", "")
-                        # Check if runner name contains "Under" and the target number
-                        if "under" in runner_name.lower():
-                            # Extract number from runner name (e.g., "Under 2.5 Goals" -> 2.5)
-                            import re
-                            numbers = re.findall(r'\d+\.?\d*', runner_name)
-                            for num_str in numbers:
-                                try:
-                                    num = float(num_str)
-                                    if abs(num - target_over) < 0.1:  # Allow small difference
-                                        return {
-                                            "marketId": market.get("marketId"),
-                                            "selectionId": runner.get("selectionId"),
-                                            "marketName": market_name,
-                                            "runnerName": runner_name
-                                        }
-                                except ValueError:
-                                    continue
-                    
-                    # If exact match not found, try to find any "Under" runner
-                    for runner in runners:
-                        runner_name = runner.get("runnerName", "")
-                        if "under" in runner_name.lower() and str(int(target_over)) in runner_name:
-                            return {
-                                "marketId": market.get("marketId"),
-                                "selectionId": runner.get("selectionId"),
-                                "marketName": market_name,
-                                "runnerName": runner_name
-                            }
-        
-        logger.debug(f"Under {target_over} market not found for event {event_id}")
-        return None
+        market_info = _find_over_under_runner(markets, event_id, target_over, "under")
+        if not market_info:
+            logger.debug(f"Under {target_over} market not found for event {event_id}")
+        return market_info
         
     except Exception as e:
         logger.error(f"Error finding under market: {str(e)}")
         return None
 
 
+# Price projection for Over/Under market books (read-only, shared by every call)
+OVER_UNDER_PRICE_PROJECTION = MappingProxyType({
+    "priceData": ("EX_BEST_OFFERS", "EX_TRADED")
+})
+
+
+def list_over_under_market_book(market_service: MarketService, market_id: str) -> list:
+    """Get market book (best offers + traded) for an Over/Under market"""
+    return market_service.list_market_book(
+        market_ids=[market_id],
+        price_projection=OVER_UNDER_PRICE_PROJECTION
+    )
+
+
 def get_market_book_data(market_service: MarketService, market_id: str, 
-                        selection_id: int) -> Optional[Dict[str, Any]]:
+                        selection_id: int, market_books: Optional[list] = None) -> Optional[Dict[str, Any]]:
     """
     Get market book data for a specific selection
     
@@ -204,6 +209,7 @@ def get_market_book_data(market_service: MarketService, market_id: str,
         market_service: MarketService instance
         market_id: Market ID
         selection_id: Selection ID
+        market_books: Optional market book already fetched for market_id (fetched here if None)
     
     Returns:
         {
@@ -215,12 +221,8 @@ def get_market_book_data(market_service: MarketService, market_id: str,
         } or None if error
     """
     try:
-        market_books = market_service.list_market_book(
-            market_ids=[market_id],
-            price_projection={
-                "priceData": ["EX_BEST_OFFERS", "EX_TRADED"]
-            }
-        )
+        if market_books is None:
+            market_books = list_over_under_market_book(market_service, market_id)
         
         if not market_books:
             logger.warning(f"No market book data for market {market_id}")
@@ -659,8 +661,16 @@ def execute_lay_bet(market_service: MarketService, betting_service: BettingServi
     """
     logger.info(f"Executing lay bet for {event_name} (Over {target_over})")
     
+    # Over X.5 and Under X.5 are runners of the same market: fetch the catalogue once for both
+    try:
+        over_under_markets = list_over_under_markets(market_service, target_over)
+    except Exception as e:
+        logger.error(f"Error listing Over/Under markets: {str(e)}")
+        over_under_markets = None
+    over_under_markets = over_under_markets or []
+    
     # Phase 1: Find Under X.5 market (for odds check - best back price)
-    under_market_info = find_under_market(market_service, event_id, target_over)
+    under_market_info = find_under_market(market_service, event_id, target_over, markets=over_under_markets)
     if not under_market_info:
         logger.warning(f"Under {target_over} market not found for {event_name}")
         return {
@@ -677,7 +687,9 @@ def execute_lay_bet(market_service: MarketService, betting_service: BettingServi
     logger.info(f"Found Under market: {under_market_name} (marketId: {under_market_id}, selectionId: {under_selection_id})")
     
     # Phase 2: Get market book data for Under X.5 (to check best back price)
-    under_market_data = get_market_book_data(market_service, under_market_id, under_selection_id)
+    under_market_books = list_over_under_market_book(market_service, under_market_id)
+    under_market_data = get_market_book_data(market_service, under_market_id, under_selection_id,
+                                             market_books=under_market_books)
     if not under_market_data:
         logger.warning(f"Could not get market book data for Under {under_market_name}")
         return {
@@ -697,7 +709,7 @@ def execute_lay_bet(market_service: MarketService, betting_service: BettingServi
     logger.info(f"Under {target_over} prices: Back={under_best_back}, Lay={under_best_lay}")
     
     # Phase 3: Find Over X.5 market (for lay bet placement)
-    over_market_info = find_over_market(market_service, event_id, target_over)
+    over_market_info = find_over_market(market_service, event_id, target_over, markets=over_under_markets)
     if not over_market_info:
         logger.warning(f"Over {target_over} market not found for {event_name}")
         return {
@@ -714,7 +726,10 @@ def execute_lay_bet(market_service: MarketService, betting_service: BettingServi
     logger.info(f"Found Over market: {over_market_name} (marketId: {over_market_id}, selectionId: {over_selection_id})")
     
     # Phase 4: Get market book data for Over X.5 (for lay bet placement)
-    over_market_data = get_market_book_data(market_service, over_market_id, over_selection_id)
+    # Over X.5 is normally a runner of the same market as Under X.5: reuse its book
+    over_market_books = under_market_books if over_market_id == under_market_id else None
+    over_market_data = get_market_book_data(market_service, over_market_id, over_selection_id,
+                                            market_books=over_market_books)
     if not over_market_data:
         logger.warning(f"Could not get market book data for Over {over_market_name}")
         return {
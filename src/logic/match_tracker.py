@@ -3,10 +3,14 @@ Match Tracker Module
 Tracks match state and updates match data from Live Score API
 """
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Iterator, Optional, List, Set
 from enum import Enum
 from datetime import datetime, timedelta
 
+from logic.qualification import (is_qualified, get_competition_targets, normalize_score,
+                                 get_possible_scores_after_multiple_goals, calculate_max_goals_needed,
+                                 is_impossible_match_at_60, check_goal_in_window, filter_cancelled_goals)
+
 logger = logging.getLogger("BetfairBot")
 
 
@@ -20,6 +24,10 @@ class MatchState(Enum):
     FINISHED = "FINISHED"                  # Match finished
 
 
+# States update_state no longer moves a tracker out of (unless a bet was placed on it)
+TERMINAL_STATES = frozenset({MatchState.FINISHED, MatchState.DISQUALIFIED})
+
+
 class MatchTracker:
     """Tracks a single match's state and data"""
     
@@ -54,7 +62,7 @@ class MatchTracker:
         self.competition_name = competition_name
         self.start_minute = start_minute
         self.end_minute = end_minute
-        self.zero_zero_exception_competitions = zero_zero_exception_competitions or set()
+        self.zero_zero_exception_competitions = zero_zero_exception_competitions or frozenset()
         self.var_check_enabled = var_check_enabled
         self.target_over = target_over
         self.early_discard_enabled = early_discard_enabled
@@ -71,10 +79,12 @@ class MatchTracker:
         self.current_minute = -1
         self.goals: List[Dict[str, Any]] = []
         self.last_goal_count = 0
+        self.details_key: Optional[tuple] = None  # (minute, score) of the last goals timeline fetched from match details
         self.score_at_minute_60: Optional[str] = None  # Track score at minute 60 to check if score was reached in 60-74 window
         self.score_after_goal_in_window: Optional[str] = None  # Track score after goal in 60-74 window to verify current score
         
-        # State
+        # State (assigning self.state notifies on_state_change, see the state property)
+        self.on_state_change: Optional[Callable[["MatchTracker", Optional[MatchState]], None]] = None
         self.state = MatchState.WAITING_60
         self.qualified = False
         self.qualification_reason = ""
@@ -92,6 +102,18 @@ class MatchTracker:
         
         # Log removed - not needed
     
+    @property
+    def state(self) -> MatchState:
+        """Current match state"""
+        return self._state
+    
+    @state.setter
+    def state(self, new_state: MatchState):
+        old_state = getattr(self, "_state", None)
+        self._state = new_state
+        if old_state is not new_state and self.on_state_change is not None:
+            self.on_state_change(self, old_state)
+    
     def update_match_data(self, score: str, minute: int, goals: List[Dict[str, Any]]):
         """
         Update match data from Live Score API
@@ -120,7 +142,6 @@ class MatchTracker:
         Args:
             excel_path: Path to Excel file (for early discard check based on Excel targets)
         """
-        from logic.qualification import is_qualified, get_competition_targets, normalize_score
         
         # Check if match is finished
         # IMPORTANT: Don't mark as FINISHED if match is QUALIFIED and hasn't reached minute 75 yet
@@ -163,7 +184,7 @@ class MatchTracker:
                 return
             else:
                 # Don't finish yet - continue tracking
-                logger.debug(f"Match {self.betfair_event_name}: Not finishing yet (minute {self.current_minute}, state {self.state.value})")
+                logger.debug("Match %s: Not finishing yet (minute %s, state %s)", self.betfair_event_name, self.current_minute, self.state.value)
                 return
         
         # MỤC 3.4: Discard if minute > 74 (unless bet already placed OR match is QUALIFIED/READY_FOR_BET)
@@ -201,7 +222,6 @@ class MatchTracker:
         # IMPORTANT: Do NOT discard 0-0 scores at early minutes (< 60) as 0-0 is normal for new matches
         # IMPORTANT: Do NOT discard matches that are already QUALIFIED or READY_FOR_BET - once qualified, they should remain qualified until match ends
         if self.current_minute >= 0 and excel_path and self.state != MatchState.DISQUALIFIED and self.state != MatchState.FINISHED and self.state != MatchState.QUALIFIED and self.state != MatchState.READY_FOR_BET:
-            from logic.qualification import get_possible_scores_after_multiple_goals, calculate_max_goals_needed
             normalized_score = normalize_score(self.current_score)
             target_scores = get_competition_targets(self.competition_name, excel_path)
             
@@ -210,7 +230,7 @@ class MatchTracker:
                 
                 # Skip discard check for 0-0 scores at early minutes (< 60) - 0-0 is normal for new matches
                 if normalized_score == "0-0" and self.current_minute < 60:
-                    logger.debug(f"Score check: Match '{self.betfair_event_name}', Score '0-0' at minute {self.current_minute} - skipping discard check (normal for early match)")
+                    logger.debug("Score check: Match '%s', Score '0-0' at minute %s - skipping discard check (normal for early match)", self.betfair_event_name, self.current_minute)
                 # Check 1: Is current score already in targets?
                 elif normalized_score in normalized_targets:
                     # Score is in targets → Check if adding 1 goal would exit all targets
@@ -232,11 +252,11 @@ class MatchTracker:
                         return
                     else:
                         # At least one possible score after 1 goal is still in targets → OK
-                        logger.debug(f"Score check: Match '{self.betfair_event_name}', Score '{self.current_score}' is in targets {sorted(target_scores)} and can stay in targets after 1 goal → OK")
+                        logger.debug("Score check: Match '%s', Score '%s' is in targets %s and can stay in targets after 1 goal → OK", self.betfair_event_name, self.current_score, sorted(target_scores))
                 else:
                     # Score not in targets → Calculate max_goals needed dynamically based on target scores
                     max_goals_needed = calculate_max_goals_needed(self.current_score, target_scores)
-                    logger.debug(f"Score check: Match '{self.betfair_event_name}', Score '{self.current_score}' needs max {max_goals_needed} goals to reach targets {sorted(target_scores)}")
+                    logger.debug("Score check: Match '%s', Score '%s' needs max %s goals to reach targets %s", self.betfair_event_name, self.current_score, max_goals_needed, sorted(target_scores))
                     
                     # Check if can reach targets by adding up to max_goals_needed goals
                     possible_scores = get_possible_scores_after_multiple_goals(self.current_score, max_goals=max_goals_needed)
@@ -254,10 +274,10 @@ class MatchTracker:
                         return
                     else:
                         # Can reach targets with max_goals_needed goals → OK, don't discard
-                        logger.debug(f"Score check: Match '{self.betfair_event_name}', Score '{self.current_score}' can reach targets {sorted(matching_scores)} with up to {max_goals_needed} goals → OK")
+                        logger.debug("Score check: Match '%s', Score '%s' can reach targets %s with up to %s goals → OK", self.betfair_event_name, self.current_score, sorted(matching_scores), max_goals_needed)
             else:
                 # No targets found - log warning but don't discard (might be new competition not in Excel yet)
-                logger.debug(f"No targets found for competition '{self.competition_name}' at minute {self.current_minute} - skipping discard check")
+                logger.debug("No targets found for competition '%s' at minute %s - skipping discard check", self.competition_name, self.current_minute)
         
         # State transitions
         if self.state == MatchState.WAITING_60:
@@ -280,7 +300,6 @@ class MatchTracker:
                 still_impossible = False
                 
                 if strict_discard and excel_path:
-                    from logic.qualification import is_impossible_match_at_60
                     still_impossible, new_reason = is_impossible_match_at_60(
                         self.current_score, 
                         self.competition_name, 
@@ -319,7 +338,7 @@ class MatchTracker:
                             # Still waiting for delay - log status
                             elapsed = (datetime.now() - self.discard_candidate_since).total_seconds() / 60
                             remaining = self.discard_delay_minutes - elapsed
-                            logger.debug(f"Match {self.betfair_event_name}: Waiting for discard delay ({remaining:.1f} minutes remaining) - {self.discard_candidate_reason}")
+                            logger.debug("Match %s: Waiting for discard delay (%.1f minutes remaining) - %s", self.betfair_event_name, remaining, self.discard_candidate_reason)
                 else:
                     # Can't check - if score changed, clear candidate to be safe
                     if self.current_score != self.discard_candidate_score:
@@ -340,7 +359,7 @@ class MatchTracker:
                             # Still waiting for delay - log status
                             elapsed = (datetime.now() - self.discard_candidate_since).total_seconds() / 60
                             remaining = self.discard_delay_minutes - elapsed
-                            logger.debug(f"Match {self.betfair_event_name}: Waiting for discard delay ({remaining:.1f} minutes remaining) - {self.discard_candidate_reason}")
+                            logger.debug("Match %s: Waiting for discard delay (%.1f minutes remaining) - %s", self.betfair_event_name, remaining, self.discard_candidate_reason)
             
             # Check qualification
             if not self.qualified:
@@ -408,7 +427,6 @@ class MatchTracker:
                 elif self.state != MatchState.DISQUALIFIED:
                     # Match is not qualified and minute > 74 - discard
                     # Check why it wasn't qualified: no goal in 60-74 or no 0-0 exception
-                    from logic.qualification import check_goal_in_window, filter_cancelled_goals
                     
                     # Check if there was a goal in 60-74 window
                     if self.var_check_enabled:
@@ -420,7 +438,6 @@ class MatchTracker:
                     # Check if 0-0 exception could apply
                     has_zero_zero_exception = False
                     if excel_path and self.current_score == "0-0":
-                        from logic.qualification import get_competition_targets, normalize_score
                         target_scores = get_competition_targets(self.competition_name, excel_path)
                         if target_scores:
                             normalized_targets = {normalize_score(t) for t in target_scores}
@@ -470,13 +487,12 @@ class MatchTracker:
             # Check if ready for bet (minute 75 only: 75:00 to 75:59)
             # Entry window is the full 75th minute (75:00 to 75:59)
             # IMPORTANT: Re-check if current score is still in targets at minute 75
-            logger.debug(f"Match {self.betfair_event_name}: QUALIFIED state - current_minute={self.current_minute}, checking if ready for bet...")
+            logger.debug("Match %s: QUALIFIED state - current_minute=%s, checking if ready for bet...", self.betfair_event_name, self.current_minute)
             
             if 75 <= self.current_minute < 76:
                 logger.info(f"Match {self.betfair_event_name}: Minute {self.current_minute} is in bet window (75-76), checking score...")
                 # Re-check if current score is still in targets
                 if excel_path:
-                    from logic.qualification import get_competition_targets, normalize_score
                     normalized_score = normalize_score(self.current_score)
                     target_scores = get_competition_targets(self.competition_name, excel_path)
                     
@@ -491,7 +507,7 @@ class MatchTracker:
                             logger.info(f"Match {self.betfair_event_name}: DISQUALIFIED at minute 75 - score {self.current_score} not in targets {sorted(target_scores)}")
                             return
                         else:
-                            logger.debug(f"Match {self.betfair_event_name}: Score {self.current_score} is still in targets {sorted(target_scores)}")
+                            logger.debug("Match %s: Score %s is still in targets %s", self.betfair_event_name, self.current_score, sorted(target_scores))
                 
                 # Score is still in targets, proceed to READY_FOR_BET
                 self.state = MatchState.READY_FOR_BET
@@ -505,7 +521,7 @@ class MatchTracker:
                 logger.warning(f"⚠️ Match {self.betfair_event_name}: EXPIRED - minute {self.current_minute} > 75, bet not placed during minute 75")
             elif self.current_minute < 75:
                 # Still waiting for minute 75
-                logger.debug(f"Match {self.betfair_event_name}: QUALIFIED but waiting for minute 75 (current: {self.current_minute})")
+                logger.debug("Match %s: QUALIFIED but waiting for minute 75 (current: %s)", self.betfair_event_name, self.current_minute)
         
         elif self.state == MatchState.READY_FOR_BET:
             # Check if minute 75 has passed without bet placement
@@ -520,7 +536,6 @@ class MatchTracker:
             # Continue checking if score is still in targets during minute 75
             # If a goal is scored during minute 75 and moves score outside targets, remove TARGET status
             if 75 <= self.current_minute < 76 and excel_path:
-                from logic.qualification import get_competition_targets, normalize_score
                 normalized_score = normalize_score(self.current_score)
                 target_scores = get_competition_targets(self.competition_name, excel_path)
                 
@@ -569,6 +584,9 @@ class MatchTrackerManager:
     def __init__(self):
         """Initialize match tracker manager"""
         self.trackers: Dict[str, MatchTracker] = {}  # Key: betfair_event_id
+        # Event IDs bucketed by state, kept current through MatchTracker.on_state_change
+        # (dicts used as ordered sets: trackers come back in the order they entered the state)
+        self._ids_by_state: Dict[MatchState, Dict[str, None]] = {state: {} for state in MatchState}
         # Logging moved to main.py setup checklist
     
     def add_tracker(self, tracker: MatchTracker):
@@ -578,9 +596,18 @@ class MatchTrackerManager:
         Args:
             tracker: MatchTracker instance
         """
+        self.remove_tracker(tracker.betfair_event_id)
         self.trackers[tracker.betfair_event_id] = tracker
+        self._ids_by_state[tracker.state][tracker.betfair_event_id] = None
+        tracker.on_state_change = self._on_tracker_state_change
         # Log removed - not needed
     
+    def _on_tracker_state_change(self, tracker: MatchTracker, old_state: Optional[MatchState]):
+        """Move a tracker to its new state bucket"""
+        if old_state is not None:
+            self._ids_by_state[old_state].pop(tracker.betfair_event_id, None)
+        self._ids_by_state[tracker.state][tracker.betfair_event_id] = None
+    
     def get_tracker(self, betfair_event_id: str) -> Optional[MatchTracker]:
         """
         Get tracker for a match
@@ -602,26 +629,68 @@ class MatchTrackerManager:
         """
         if betfair_event_id in self.trackers:
             tracker = self.trackers.pop(betfair_event_id)
+            self._ids_by_state[tracker.state].pop(betfair_event_id, None)
+            tracker.on_state_change = None
             # Log removed - not needed
     
+    def __len__(self) -> int:
+        """Number of trackers (O(1), no list copy)"""
+        return len(self.trackers)
+    
+    def __bool__(self) -> bool:
+        """A manager is always truthy, even when empty (callers use `if manager:` as a None check)"""
+        return True
+    
     def get_all_trackers(self) -> List[MatchTracker]:
         """Get all active trackers"""
         return list(self.trackers.values())
     
+    def iter_active(self) -> Iterator[MatchTracker]:
+        """
+        Iterate trackers that can still change state (skips FINISHED/DISQUALIFIED without a bet)
+        
+        Returns:
+            Iterator over MatchTracker instances (safe to add/remove trackers while iterating)
+        """
+        for tracker in list(self.trackers.values()):
+            if tracker.state not in TERMINAL_STATES or tracker.bet_placed:
+                yield tracker
+    
+    def get_trackers_by_state(self, state: MatchState) -> List[MatchTracker]:
+        """
+        Get trackers currently in a state (O(matching trackers), not O(all trackers))
+        
+        Args:
+            state: MatchState to look up
+        
+        Returns:
+            List of MatchTracker instances in that state, in the order they entered it
+        """
+        return [self.trackers[event_id] for event_id in self._ids_by_state[state]]
+    
     def get_ready_for_bet(self) -> List[MatchTracker]:
         """Get all trackers ready for bet placement"""
         return [t for t in self.trackers.values() if t.is_ready_for_bet()]
     
+    def cleanup(self, states: Set[MatchState]) -> int:
+        """
+        Remove trackers in any of the given states (reads the state buckets, no full scan)
+        
+        Args:
+            states: MatchState values to drop
+        
+        Returns:
+            Number of trackers removed
+        """
+        stale = [event_id for state in states for event_id in self._ids_by_state[state]]
+        for event_id in stale:
+            self.remove_tracker(event_id)
+        return len(stale)
+    
     def cleanup_finished(self):
         """Remove trackers for finished matches"""
-        finished = [event_id for event_id, tracker in self.trackers.items() 
-                   if tracker.state == MatchState.FINISHED]
-        for event_id in finished:
-            self.remove_tracker(event_id)
+        self.cleanup({MatchState.FINISHED})
     
     def cleanup_discarded(self):
         """Remove trackers for discarded matches (MỤC 3.7)"""
-        discarded = [event_id for event_id, tracker in self.trackers.items() 
-                     if tracker.state == MatchState.DISQUALIFIED]
-        for event_id in discarded:
-            self.remove_tracker(event_id)
+        self.cleanup({MatchState.DISQUALIFIED})
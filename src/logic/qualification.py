@@ -16,6 +16,9 @@ logger = logging.getLogger("BetfairBot")
 _competition_map_cache: Dict[str, Dict[str, Any]] = {}
 _competition_id_map_cache: Dict[str, str] = {}  # {competition_id: competition_name}
 _excel_path_cache: Optional[str] = None
+# Cache for get_competition_targets lookups ((competition_name, competition_id) -> targets),
+# valid for the competition map currently in _competition_map_cache
+_competition_targets_cache: Dict[Tuple[str, Optional[str]], Set[str]] = {}
 
 
 def normalize_score(score: str) -> str:
@@ -61,7 +64,7 @@ def filter_cancelled_goals(goals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             valid_goals.append(goal)
         else:
             minute = goal.get('minute', 'N/A')
-            logger.debug(f"Filtered out cancelled goal at minute {minute} (VAR)")
+            logger.debug("Filtered out cancelled goal at minute %s (VAR)", minute)
     
     return valid_goals
 
@@ -127,7 +130,6 @@ def check_zero_zero_exception(score: str, current_minute: int,
     # Per client requirement: If 0-0 is in target list and match is 0-0 at minute 60,
     # match stays TARGET (TRACKING) even if no goal is scored between 60-74
     if excel_path:
-        from logic.qualification import get_competition_targets, normalize_score
         target_scores = get_competition_targets(competition_name, excel_path)
         if target_scores:
             normalized_targets = {normalize_score(t) for t in target_scores}
@@ -141,7 +143,7 @@ def check_zero_zero_exception(score: str, current_minute: int,
         logger.info(f"0-0 exception applies for '{competition_name}' at minute {current_minute}")
         return True, "0-0 exception (competition allowed)"
     else:
-        logger.debug(f"0-0 score but competition '{competition_name}' not in exception list and 0-0 not in targets")
+        logger.debug("0-0 score but competition '%s' not in exception list and 0-0 not in targets", competition_name)
         return False, "0-0 but competition not in exception list and 0-0 not in targets"
 
 
@@ -339,6 +341,7 @@ def load_competition_map_from_excel(excel_path: str) -> Dict[str, Dict[str, Any]
                 competition_id_map[competition_id_from_excel] = competition_name
         
         # Cache the result (include ID map in cache)
+        _competition_targets_cache.clear()
         _competition_map_cache = competition_map
         _competition_id_map_cache = competition_id_map
         _excel_path_cache = excel_path
@@ -359,6 +362,7 @@ def get_competition_targets(competition_name: str, excel_path: str, competition_
     Get target scores for a competition from cached map
     Supports both "ID_Name" format and "Name" format
     Also supports matching by competition ID if provided
+    Lookups are cached until the competition map is reloaded
     
     Args:
         competition_name: Competition name (e.g., "79_Segunda Division" or "Segunda Division")
@@ -374,6 +378,17 @@ def get_competition_targets(competition_name: str, excel_path: str, competition_
     if not competition_map:
         return set()
     
+    cache_key = (competition_name, competition_id)
+    targets = _competition_targets_cache.get(cache_key)
+    if targets is None:
+        targets = _find_competition_targets(competition_map, competition_name, competition_id)
+        _competition_targets_cache[cache_key] = targets
+    return targets
+
+
+def _find_competition_targets(competition_map: Dict[str, Dict[str, Any]], competition_name: str,
+                              competition_id: Optional[str] = None) -> Set[str]:
+    """Match competition (by ID, exact name or normalized name) in the competition map"""
     # Try matching by ID first (most accurate)
     if competition_id:
         # Check if ID is in cached ID map
@@ -660,9 +675,11 @@ def is_impossible_match_at_60(score: str, competition_name: str, excel_path: str
         
         # Check 1: Current score already out of targets
         normalized_targets = {normalize_score(t) for t in excel_targets}
-        logger.debug(f"is_impossible_match_at_60: Score '{score}' (normalized: '{normalized_current}'), Targets: {sorted(excel_targets)} (normalized: {sorted(normalized_targets)}), Competition: '{competition_name}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("is_impossible_match_at_60: Score '%s' (normalized: '%s'), Targets: %s (normalized: %s), Competition: '%s'",
+                         score, normalized_current, sorted(excel_targets), sorted(normalized_targets), competition_name)
         if normalized_current not in normalized_targets:
-            logger.debug(f"is_impossible_match_at_60: Score '{score}' is NOT in targets {sorted(excel_targets)} → IMPOSSIBLE")
+            logger.debug("is_impossible_match_at_60: Score '%s' is NOT in targets %s → IMPOSSIBLE", score, sorted(excel_targets))
             return True, f"Score {score} at minute {current_minute} is already out of targets {sorted(excel_targets)}"
         
         # Check 2: Current score + 1 goal would push it out of ALL targets
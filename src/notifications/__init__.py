@@ -1,5 +1,5 @@
 """
 Notifications Module
-Handles sound notifications for bet events
+Handles sound, Telegram and email notifications for bet events
 """
 
@@ -0,0 +1,97 @@
+"""
+Notification Queue Module
+Dispatches sound/Telegram notifications on a background thread so the polling loop never waits on them
+"""
+import logging
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("BetfairBot")
+
+
+class NotificationQueue:
+    """Runs notification callbacks on a daemon worker thread"""
+
+    def __init__(self, max_size: int = 100):
+        """
+        Initialize notification queue
+
+        Args:
+            max_size: Maximum number of pending notifications (new ones are dropped when full)
+        """
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max_size)
+        self._worker_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker thread"""
+        if self._worker_thread and self._worker_thread.is_alive():
+            logger.warning("Notification queue is already running")
+            return
+
+        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker_thread.start()
+        logger.debug("Notification queue started")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the worker thread after pending notifications are sent
+
+        Args:
+            timeout: Maximum seconds to wait for pending notifications
+        """
+        if not self._worker_thread or not self._worker_thread.is_alive():
+            return
+
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Notification queue is full, pending notifications will be dropped")
+            return
+        self._worker_thread.join(timeout=timeout)
+        logger.debug("Notification queue stopped")
+
+    def submit(self, kind: str, func: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        Queue a notification call
+
+        If the worker is not running, the call is made synchronously instead.
+
+        Args:
+            kind: Notification name (for logging)
+            func: Notifier method to call
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            True if queued (or sent synchronously), False if dropped
+        """
+        if not self._worker_thread or not self._worker_thread.is_alive():
+            self._dispatch(kind, func, args, kwargs)
+            return True
+
+        try:
+            self._queue.put_nowait((kind, func, args, kwargs))
+            return True
+        except queue.Full:
+            logger.warning(f"Notification queue full, dropping {kind} notification")
+            return False
+
+    def _worker_loop(self):
+        """Worker loop: send queued notifications until the stop sentinel arrives"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                kind, func, args, kwargs = item
+                self._dispatch(kind, func, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _dispatch(kind: str, func: Callable[..., Any], args: tuple, kwargs: dict):
+        """Call a notifier method, logging (never raising) errors"""
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to send {kind} notification: {str(e)}")
@@ -4,21 +4,27 @@ Handles bet execution orchestration and notifications
 """
 import logging
 import pandas as pd
-from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Optional
 from logic.match_tracker import MatchTracker, MatchState
 from logic.bet_executor import execute_lay_bet
+from services.tracking import SkippedMatch, EXCEL_PATH
+from core.logging_setup import is_console_verbose
 from logic.qualification import get_competition_targets, normalize_score, load_competition_map_from_excel
 
 logger = logging.getLogger("BetfairBot")
 
+# Bet attempt outcomes (keys of BetOrchestrator._outcome_handlers)
+BET_SUCCESS = "success"
+BET_SKIPPED = "skipped"
+BET_ERROR = "error"
+
 
 class BetOrchestrator:
     """Service for orchestrating bet execution"""
     
     def __init__(self, market_service, betting_service, bet_tracker, excel_writer,
-                 skipped_matches_writer, sound_notifier, telegram_notifier, config: Dict[str, Any]):
+                 skipped_matches_writer, sound_notifier, telegram_notifier, config: Dict[str, Any],
+                 notification_queue=None, excel_write_queue=None):
         """
         Initialize Bet Orchestrator
         
@@ -31,6 +37,8 @@ class BetOrchestrator:
             sound_notifier: Sound notifier
             telegram_notifier: Telegram notifier
             config: Bot configuration
+            notification_queue: Optional NotificationQueue (notifications are sent synchronously if None)
+            excel_write_queue: Optional ExcelWriteQueue (Excel records are written synchronously if None)
         """
         self.market_service = market_service
         self.betting_service = betting_service
@@ -40,10 +48,22 @@ class BetOrchestrator:
         self.sound_notifier = sound_notifier
         self.telegram_notifier = telegram_notifier
         self.config = config
+        self.notification_queue = notification_queue
+        self.excel_write_queue = excel_write_queue
         
         # Get Excel path
-        project_root = Path(__file__).parent.parent.parent
-        self.excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
+        self.excel_path = EXCEL_PATH
+        
+        # Bet settings from config (read once, config doesn't change while running)
+        self.target_over = config.get("match_tracking", {}).get("target_over", 2.5)
+        self.bet_execution_config = config.get("bet_execution", {})
+        
+        # Outcome -> handler(tracker, payload); each returns attempt_bet's result
+        self._outcome_handlers = {
+            BET_SUCCESS: self._on_bet_success,
+            BET_SKIPPED: self._on_bet_skipped,
+            BET_ERROR: self._on_bet_error,
+        }
     
     def attempt_bet(self, tracker: MatchTracker) -> bool:
         """
@@ -65,10 +85,6 @@ class BetOrchestrator:
         
         logger.info(f"🎯 Attempting bet for '{tracker.betfair_event_name}': state={tracker.state.value}, minute={tracker.current_minute}, score={tracker.current_score}")
         
-        match_tracking_config = self.config.get("match_tracking", {})
-        target_over = match_tracking_config.get("target_over", 2.5)
-        bet_execution_config = self.config.get("bet_execution", {})
-        
         logger.info(f"🎲 ATTEMPTING BET: {tracker.betfair_event_name} (min {tracker.current_minute}, score {tracker.current_score}, competition: {tracker.competition_name})")
         
         # Execute bet
@@ -78,50 +94,56 @@ class BetOrchestrator:
                 betting_service=self.betting_service,
                 event_id=tracker.betfair_event_id,
                 event_name=tracker.betfair_event_name,
-                target_over=target_over,
-                bet_config=bet_execution_config,
+                target_over=self.target_over,
+                bet_config=self.bet_execution_config,
                 competition_name=tracker.competition_name,
                 current_score=tracker.current_score,
                 excel_path=str(self.excel_path)
             )
         except Exception as e:
-            # If exception occurs, mark as skipped and return
-            logger.error(f"Exception during bet execution for {tracker.betfair_event_name}: {str(e)}")
-            tracker.bet_skipped = True
-            self._record_skipped_match(tracker, None, f"Exception: {str(e)}")
-            return False
+            return self._outcome_handlers[BET_ERROR](tracker, e)
         
-        # Check result - IMPORTANT: Always set bet_skipped if bet failed to prevent retry
-        if bet_result and isinstance(bet_result, dict) and bet_result.get("success"):
-            # Mark bet as placed
-            tracker.bet_placed = True
-            tracker.bet_id = bet_result.get("betId", "")
-            
-            # Record bet
-            bet_record = self._record_bet(tracker, bet_result)
-            
-            # Console output
-            self._print_bet_details(tracker, bet_result, bet_record)
-            
-            # Notifications
-            self._send_notifications(tracker, bet_result, bet_record)
-            
-            logger.info(f"✅ BET PLACED SUCCESSFULLY: {tracker.betfair_event_name} - BetId={bet_result.get('betId')}, Stake={bet_result.get('stake')}, Liability={bet_result.get('liability')}, LayPrice={bet_result.get('layPrice')}")
-            return True
-        else:
-            # Mark as skipped - IMPORTANT: This prevents retry on next iteration
-            tracker.bet_skipped = True
-            skip_reason = "Unknown reason"
-            if bet_result and isinstance(bet_result, dict):
-                skip_reason = bet_result.get("reason", bet_result.get("skip_reason", "Unknown reason"))
-            elif bet_result is None:
-                skip_reason = "Bet execution returned None"
-            
-            logger.warning(f"❌ BET SKIPPED: {tracker.betfair_event_name} (min {tracker.current_minute}, score {tracker.current_score}) - Reason: {skip_reason}")
-            
-            # Record skipped match
-            self._record_skipped_match(tracker, bet_result, skip_reason)
-            return False
+        outcome = BET_SUCCESS if isinstance(bet_result, dict) and bet_result.get("success") else BET_SKIPPED
+        return self._outcome_handlers[outcome](tracker, bet_result)
+    
+    def _on_bet_success(self, tracker: MatchTracker, bet_result: Dict[str, Any]) -> bool:
+        """Mark tracker as bet placed, record the bet and send notifications"""
+        tracker.bet_placed = True
+        tracker.bet_id = bet_result.get("betId", "")
+        
+        # Record bet
+        bet_record = self._record_bet(tracker, bet_result)
+        
+        # Console output
+        self._print_bet_details(tracker, bet_result, bet_record)
+        
+        # Notifications
+        self._send_notifications(tracker, bet_result, bet_record)
+        
+        logger.info(f"✅ BET PLACED SUCCESSFULLY: {tracker.betfair_event_name} - BetId={bet_result.get('betId')}, Stake={bet_result.get('stake')}, Liability={bet_result.get('liability')}, LayPrice={bet_result.get('layPrice')}")
+        return True
+    
+    def _on_bet_skipped(self, tracker: MatchTracker, bet_result: Optional[Dict[str, Any]]) -> bool:
+        """Mark tracker as skipped (prevents retry on next iteration) and record the skipped match"""
+        tracker.bet_skipped = True
+        skip_reason = "Unknown reason"
+        if bet_result and isinstance(bet_result, dict):
+            skip_reason = bet_result.get("reason", bet_result.get("skip_reason", "Unknown reason"))
+        elif bet_result is None:
+            skip_reason = "Bet execution returned None"
+        
+        logger.warning(f"❌ BET SKIPPED: {tracker.betfair_event_name} (min {tracker.current_minute}, score {tracker.current_score}) - Reason: {skip_reason}")
+        
+        # Record skipped match
+        self._record_skipped_match(tracker, bet_result, skip_reason)
+        return False
+    
+    def _on_bet_error(self, tracker: MatchTracker, error: Exception) -> bool:
+        """Mark tracker as skipped after an exception during bet execution"""
+        logger.error(f"Exception during bet execution for {tracker.betfair_event_name}: {str(error)}")
+        tracker.bet_skipped = True
+        self._record_skipped_match(tracker, None, f"Exception: {str(error)}")
+        return False
     
     def _record_bet(self, tracker: MatchTracker, bet_result: Dict[str, Any]) -> Optional[Any]:
         """Record bet in BetTracker"""
@@ -180,14 +202,18 @@ class BetOrchestrator:
             liability_amount=bet_result.get("liability")
         )
         
-        # Write to Excel if enabled
-        if self.excel_writer:
+        # Write to Excel if enabled (in the background when a write queue is set)
+        if self.excel_write_queue:
+            self.excel_write_queue.submit_bet_record(bet_record)
+        elif self.excel_writer:
             self.excel_writer.write_bet_record(bet_record)
         
         return bet_record
     
     def _print_bet_details(self, tracker: MatchTracker, bet_result: Dict[str, Any], bet_record: Optional[Any]):
         """Print bet details to console"""
+        if not is_console_verbose():
+            return
         print(f"\n[BET PLACED]")
         print(f"Match: {tracker.betfair_event_name}")
         print(f"Competition: {tracker.competition_name}")
@@ -214,43 +240,49 @@ class BetOrchestrator:
             print(f"Condition: Under back {best_back_under:.2f} (reference N/A)")
         print(f"BetId: {bet_result.get('betId', 'N/A')}\n")
     
+    def _notify(self, kind: str, func, *args, **kwargs):
+        """Send a notification via the background queue (or synchronously if no queue)"""
+        if self.notification_queue:
+            self.notification_queue.submit(kind, func, *args, **kwargs)
+            return
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to send {kind} notification: {str(e)}")
+    
     def _send_notifications(self, tracker: MatchTracker, bet_result: Dict[str, Any], bet_record: Optional[Any]):
         """Send notifications for bet placed"""
         # Play sound
         if self.sound_notifier:
-            self.sound_notifier.play_bet_placed_sound()
+            self._notify("bet placed sound", self.sound_notifier.play_bet_placed_sound)
         
-        # Send Telegram notification
+        # Send Telegram notification (snapshot tracker values now, they change while queued)
         if self.telegram_notifier:
-            try:
-                bankroll_before = bet_record.bankroll_before if bet_record else 0.0
-                bet_result_with_info = bet_result.copy()
-                bet_result_with_info["eventName"] = tracker.betfair_event_name
-                bet_result_with_info["referenceOdds"] = bet_record.reference_odds_under_x5 if bet_record else None
-                bet_result_with_info["liabilityPercent"] = bet_record.liability_percent if bet_record else None
-                self.telegram_notifier.send_bet_placed_notification(
-                    bet_result_with_info,
-                    competition=tracker.competition_name,
-                    minute=tracker.current_minute,
-                    score=tracker.current_score,
-                    bankroll_before=bankroll_before
-                )
-            except Exception as e:
-                logger.error(f"Failed to send Telegram bet placed notification: {str(e)}")
+            bankroll_before = bet_record.bankroll_before if bet_record else 0.0
+            bet_result_with_info = bet_result.copy()
+            bet_result_with_info["eventName"] = tracker.betfair_event_name
+            bet_result_with_info["referenceOdds"] = bet_record.reference_odds_under_x5 if bet_record else None
+            bet_result_with_info["liabilityPercent"] = bet_record.liability_percent if bet_record else None
+            self._notify(
+                "Telegram bet placed",
+                self.telegram_notifier.send_bet_placed_notification,
+                bet_result_with_info,
+                competition=tracker.competition_name,
+                minute=tracker.current_minute,
+                score=tracker.current_score,
+                bankroll_before=bankroll_before
+            )
         
         # Check if bet is matched
         size_matched = bet_result.get("sizeMatched", 0.0)
         if size_matched and size_matched > 0:
             if self.sound_notifier:
-                self.sound_notifier.play_bet_matched_sound()
+                self._notify("bet matched sound", self.sound_notifier.play_bet_matched_sound)
             
             if self.telegram_notifier:
-                try:
-                    bet_result_with_info = bet_result.copy()
-                    bet_result_with_info["eventName"] = tracker.betfair_event_name
-                    self.telegram_notifier.send_bet_matched_notification(bet_result_with_info)
-                except Exception as e:
-                    logger.error(f"Failed to send Telegram bet matched notification: {str(e)}")
+                bet_result_with_info = bet_result.copy()
+                bet_result_with_info["eventName"] = tracker.betfair_event_name
+                self._notify("Telegram bet matched", self.telegram_notifier.send_bet_matched_notification, bet_result_with_info)
             
             logger.info(f"Bet matched immediately: BetId={bet_result.get('betId')}, SizeMatched={size_matched}")
     
@@ -264,32 +296,30 @@ class BetOrchestrator:
         if self.excel_path.exists():
             targets_list = get_competition_targets(tracker.competition_name, str(self.excel_path))
         
-        skipped_data = {
-            "match_name": tracker.betfair_event_name,
-            "competition": tracker.competition_name,
-            "minute": tracker.current_minute if tracker.current_minute >= 0 else "N/A",
-            "minute_75_score": tracker.current_score,
-            "targets_list": targets_list,
-            "status": tracker.state.value if hasattr(tracker.state, 'value') else str(tracker.state),
-            "timestamp": datetime.now()
-        }
+        skipped = SkippedMatch(
+            match_name=tracker.betfair_event_name,
+            reason=skip_reason,
+            competition=tracker.competition_name,
+            minute=tracker.current_minute if tracker.current_minute >= 0 else "N/A",
+            minute_75_score=tracker.current_score,
+            targets_list=targets_list,
+            status=tracker.state.value if hasattr(tracker.state, 'value') else str(tracker.state)
+        )
         
+        # If bet_result is a dict with skip information, use it
         if bet_result and isinstance(bet_result, dict):
-            skipped_data["reason"] = bet_result.get("reason", bet_result.get("skip_reason", skip_reason))
-            skipped_data["best_back"] = bet_result.get("bestBackPrice")
-            skipped_data["best_lay"] = bet_result.get("bestLayPrice")
-            skipped_data["spread_ticks"] = bet_result.get("spread_ticks")
-            skipped_data["current_odds"] = bet_result.get("bestLayPrice") or bet_result.get("calculatedLayPrice")
-        else:
-            skipped_data["reason"] = skip_reason
-            skipped_data["best_back"] = None
-            skipped_data["best_lay"] = None
-            skipped_data["spread_ticks"] = None
-            skipped_data["current_odds"] = None
+            skipped.reason = bet_result.get("reason", bet_result.get("skip_reason", skip_reason))
+            skipped.best_back = bet_result.get("bestBackPrice")
+            skipped.best_lay = bet_result.get("bestLayPrice")
+            skipped.spread_ticks = bet_result.get("spread_ticks")
+            skipped.current_odds = bet_result.get("bestLayPrice") or bet_result.get("calculatedLayPrice")
         
         try:
-            self.skipped_matches_writer.write_skipped_match(skipped_data)
-            logger.info(f"Skipped match recorded: {tracker.betfair_event_name} - {skipped_data['reason']}")
+            if self.excel_write_queue:
+                self.excel_write_queue.submit_skipped_match(skipped)
+            else:
+                self.skipped_matches_writer.write_skipped_match(skipped)
+                logger.info(f"Skipped match recorded: {tracker.betfair_event_name} - {skipped.reason}")
         except Exception as e:
             logger.error(f"Error writing skipped match: {str(e)}")
 
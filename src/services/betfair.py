@@ -3,13 +3,19 @@ Betfair Services Module
 Consolidated Betfair services: Market Service, Betting Service, Stream API, Price Ladder, Market Filter
 """
 import requests
+import re
 import socket
 import ssl
 import json
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 
+from core.http_session import get_http_session
+
 logger = logging.getLogger("BetfairBot")
 
 # ============================================================================
@@ -156,7 +162,7 @@ def round_to_valid_price(price: float, ladder_type: str = "CLASSIC") -> float:
 # MARKET FILTER FUNCTIONS
 # ============================================================================
 
-ALLOWED_MARKET_TYPES = [
+ALLOWED_MARKET_TYPES = frozenset([
     "OVER_UNDER_25", "OVER_UNDER_15", "OVER_UNDER_35", "OVER_UNDER_05", "OVER_UNDER_45",
     "MATCH_ODDS", "BOTH_TEAMS_TO_SCORE", "CORRECT_SCORE", "FIRST_GOAL_SCORER", "NEXT_GOAL",
     "HALF_TIME_SCORE", "HALF_TIME_FULL_TIME", "DRAW_NO_BET", "DOUBLE_CHANCE",
@@ -166,12 +172,12 @@ ALLOWED_MARKET_TYPES = [
     "TO_WIN_MATCH", "TO_WIN_TO_NIL", "TO_WIN_EITHER_HALF", "TO_WIN_BOTH_HALVES",
     "CLEAN_SHEET", "TEAM_TOTAL_GOALS", "EXACT_GOALS", "ODD_OR_EVEN",
     "GOAL_BOTH_HALVES", "MOST_GOALS", "TO_QUALIFY", "TO_LIFT_TROPHY",
-]
+])
 
-EXCLUDED_MARKET_TYPES = [
+EXCLUDED_MARKET_TYPES = frozenset([
     "OUTRIGHT", "TOP_GOALSCORER", "RELEGATION", "PROMOTION", "CHAMPION",
     "WINNER", "SEASON_WINNER", "LEAGUE_WINNER", "TITLE_WINNER",
-]
+])
 
 EXCLUDED_KEYWORDS = [
     "winner", "champion", "outright", "season", "league winner", "top scorer",
@@ -181,58 +187,77 @@ EXCLUDED_KEYWORDS = [
     "goalkeeper", "defender", "midfielder", "forward", "team of the season",
 ]
 
+MATCH_INDICATORS = [
+    "over", "under", "match odds", "both teams", "correct score", "first goal", "next goal",
+    "half time", "full time", "draw", "handicap", "total goals", "to score",
+    "clean sheet", "win to nil", "exact goals", "odd or even", "both halves", "to qualify"
+]
+
+# Keyword lists compiled once into single alternations (one C-level scan per market name)
+_EXCLUDED_KEYWORDS_RE = re.compile("|".join(map(re.escape, EXCLUDED_KEYWORDS)))
+_MATCH_INDICATORS_RE = re.compile("|".join(map(re.escape, MATCH_INDICATORS)))
+
 
 def is_match_specific_market(market: Dict[str, Any]) -> bool:
     """Check if market is match-specific (not season-long)"""
     market_name = market.get("marketName", "").lower()
     market_type = market.get("marketType", "").upper()
     
-    for keyword in EXCLUDED_KEYWORDS:
-        if keyword in market_name:
-            logger.debug(f"Excluded market (keyword '{keyword}'): {market.get('marketName', 'N/A')}")
-            return False
+    excluded_keyword = _EXCLUDED_KEYWORDS_RE.search(market_name)
+    if excluded_keyword:
+        logger.debug("Excluded market (keyword '%s'): %s", excluded_keyword.group(0), market.get('marketName', 'N/A'))
+        return False
     
     if market_type in EXCLUDED_MARKET_TYPES:
-        logger.debug(f"Excluded market (type '{market_type}'): {market.get('marketName', 'N/A')}")
+        logger.debug("Excluded market (type '%s'): %s", market_type, market.get('marketName', 'N/A'))
         return False
     
     if market_type in ALLOWED_MARKET_TYPES:
         return True
     
-    match_indicators = [
-        "over", "under", "match odds", "both teams", "correct score", "first goal", "next goal",
-        "half time", "full time", "draw", "handicap", "total goals", "to score",
-        "clean sheet", "win to nil", "exact goals", "odd or even", "both halves", "to qualify"
-    ]
-    
-    for indicator in match_indicators:
-        if indicator in market_name:
-            return True
+    if _MATCH_INDICATORS_RE.search(market_name):
+        return True
     
-    logger.debug(f"Uncertain market type, excluding (safer): {market.get('marketName', 'N/A')} (type: {market_type})")
+    logger.debug("Uncertain market type, excluding (safer): %s (type: %s)", market.get('marketName', 'N/A'), market_type)
     return False
 
 
+# Match-specific verdict per market ID (a market's name/type never change, so the
+# keyword scan only runs for markets not seen before)
+MATCH_SPECIFIC_CACHE_MAX_SIZE = 5000
+_match_specific_cache: Dict[str, bool] = {}
+
+
 def filter_match_specific_markets(markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Filter markets to only keep match-specific markets"""
     if not markets:
         return []
     
+    if len(_match_specific_cache) > MATCH_SPECIFIC_CACHE_MAX_SIZE:
+        _match_specific_cache.clear()
+    
     filtered = []
     excluded_count = 0
     excluded_markets = []
     
     for market in markets:
-        if is_match_specific_market(market):
+        market_id = market.get("marketId")
+        is_match_specific = _match_specific_cache.get(market_id) if market_id else None
+        if is_match_specific is None:
+            is_match_specific = is_match_specific_market(market)
+            if market_id:
+                _match_specific_cache[market_id] = is_match_specific
+        
+        if is_match_specific:
             filtered.append(market)
         else:
             excluded_count += 1
             excluded_markets.append(market.get("marketName", "N/A"))
     
     if excluded_count > 0:
-        logger.debug(f"Filtered out {excluded_count} season-related market(s), kept {len(filtered)} match-specific market(s)")
-        if excluded_markets:
-            logger.debug(f"Excluded markets (sample): {', '.join(excluded_markets[:5])}{'...' if len(excluded_markets) > 5 else ''}")
+        logger.debug("Filtered out %d season-related market(s), kept %d match-specific market(s)", excluded_count, len(filtered))
+        if excluded_markets and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Excluded markets (sample): %s%s", ', '.join(excluded_markets[:5]), '...' if len(excluded_markets) > 5 else '')
     
     return filtered
 
@@ -288,12 +313,47 @@ def calculate_price_projection_weight(price_projection: Dict[str, Any]) -> int:
 # STREAM API FUNCTION
 # ============================================================================
 
+# OPEN/inPlay status of a market rarely changes second-to-second, so a Stream API
+# verification is reused for a short time as long as no new market IDs appear
+STREAM_VERIFICATION_TTL_SECONDS = 20.0
+_stream_verification_cache: Dict[str, Any] = {
+    "timestamp": 0.0,
+    "verified_ids": frozenset(),  # Market IDs subscribed in the last verification
+    "live_ids": frozenset()       # Subset that was OPEN and inPlay
+}
+
+
+# SSL context for Stream API connections (built once: loading the default CA store is costly)
+_stream_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _get_stream_ssl_context() -> ssl.SSLContext:
+    """Get the Stream API SSL context (created on first use)"""
+    global _stream_ssl_context
+    if _stream_ssl_context is None:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        _stream_ssl_context = context
+    return _stream_ssl_context
+
+
+def clear_stream_verification_cache():
+    """Forget the last Stream API verification (next call reconnects)"""
+    _stream_verification_cache["timestamp"] = 0.0
+    _stream_verification_cache["verified_ids"] = frozenset()
+    _stream_verification_cache["live_ids"] = frozenset()
+
 def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpoint: str, 
                                      market_type_codes: List[str] = None,
-                                     collect_duration: float = 5.0) -> List[Dict[str, Any]]:
+                                     collect_duration: float = 5.0,
+                                     verification_ttl: float = STREAM_VERIFICATION_TTL_SECONDS) -> List[Dict[str, Any]]:
     """
     Get live markets from Betfair Stream API (same as test_betfair_stream_realtime.py).
     Only returns markets that are actually OPEN and inPlay (verified by Stream API).
+    
+    The Stream API verification is skipped if the previous one is younger than
+    verification_ttl seconds and covered every market ID returned by the catalogue.
     """
     if not market_type_codes:
         market_type_codes = ["OVER_UNDER_05", "OVER_UNDER_15", "OVER_UNDER_25", "OVER_UNDER_35", "OVER_UNDER_45"]
@@ -318,7 +378,7 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
     }
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = get_http_session().post(url, json=payload, headers=headers, timeout=30)
         if response.status_code != 200:
             logger.warning(f"Failed to get markets from REST API: {response.status_code}")
             return []
@@ -337,7 +397,14 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
             if market_id:
                 market_data_map[str(market_id)] = m
         
-        logger.debug(f"Got {len(market_ids)} market IDs from REST API, connecting to Stream API...")
+        # Reuse recent verification if it covered all current markets
+        verified_age = time.monotonic() - _stream_verification_cache["timestamp"]
+        if verified_age < verification_ttl and _stream_verification_cache["verified_ids"].issuperset(market_ids):
+            live_ids = _stream_verification_cache["live_ids"]
+            logger.debug("Reusing Stream API verification from %.1fs ago (%d live markets)", verified_age, len(live_ids))
+            return [market_data_map[mid] for mid in market_ids if mid in live_ids]
+        
+        logger.debug("Got %d market IDs from REST API, connecting to Stream API...", len(market_ids))
         
     except Exception as e:
         logger.warning(f"Error getting markets from REST API: {str(e)}")
@@ -353,10 +420,7 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
         sock.settimeout(30)
         sock.connect(("stream-api.betfair.com", 443))
         
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        ssl_sock = context.wrap_socket(sock, server_hostname="stream-api.betfair.com")
+        ssl_sock = _get_stream_ssl_context().wrap_socket(sock, server_hostname="stream-api.betfair.com")
         
         # Authenticate
         auth_msg = {
@@ -424,6 +488,7 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
         
         # Subscribe to markets (max 200 per subscription)
         if len(market_ids) > 200:
+            logger.warning(f"Stream API subscription limited to 200 markets, {len(market_ids) - 200} market(s) not verified this iteration")
             market_ids = market_ids[:200]
         
         sub_msg = {
@@ -441,13 +506,13 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
         payload_sub = json.dumps(sub_msg) + "\r\n"
         ssl_sock.send(payload_sub.encode('utf-8'))
         
-        logger.debug(f"Subscribed to {len(market_ids)} markets, collecting messages for {collect_duration}s...")
+        logger.debug("Subscribed to %d markets, collecting messages for %ss...", len(market_ids), collect_duration)
         
         # Step 3: Collect messages
         message_buffer = b""
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while time.time() - start_time < collect_duration:
+        while time.monotonic() - start_time < collect_duration:
             try:
                 ssl_sock.settimeout(1.0)
                 data = ssl_sock.recv(4096)
@@ -480,7 +545,7 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
                         except json.JSONDecodeError:
                             continue
                         except Exception as e:
-                            logger.debug(f"Error processing Stream API message: {str(e)}")
+                            logger.debug("Error processing Stream API message: %s", e)
                             continue
             except socket.timeout:
                 continue
@@ -488,7 +553,12 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
                 logger.debug(f"Error receiving from Stream API: {str(e)}")
                 break
         
-        logger.debug(f"Collected {len(live_markets)} live markets from Stream API")
+        logger.debug("Collected %d live markets from Stream API", len(live_markets))
+        
+        if live_markets:
+            _stream_verification_cache["timestamp"] = time.monotonic()
+            _stream_verification_cache["verified_ids"] = frozenset(market_ids)
+            _stream_verification_cache["live_ids"] = frozenset(live_markets)
         
     except Exception as e:
         logger.warning(f"Error connecting to Stream API: {str(e)}")
@@ -511,21 +581,39 @@ def get_live_markets_from_stream_api(app_key: str, session_token: str, api_endpo
 # MARKET SERVICE CLASS
 # ============================================================================
 
+# Maximum concurrent listMarketBook requests when a call needs several weight-limited batches
+MAX_PARALLEL_MARKET_BOOK_REQUESTS = 4
+
+# Default listMarketBook price projection (read-only, shared by every call)
+DEFAULT_PRICE_PROJECTION = MappingProxyType({
+    "priceData": ("EX_BEST_OFFERS", "SP_AVAILABLE", "SP_TRADED")
+})
+
+# Cached listMarketCatalogue responses (one per distinct request payload)
+CATALOGUE_CACHE_MAX_SIZE = 100
+
+
 class MarketService:
     """Handles Betfair market data retrieval"""
     
     def __init__(self, app_key: str, session_token: str, api_endpoint: str, 
-                 max_data_weight_points: int = 190):
+                 max_data_weight_points: int = 190,
+                 http_session: Optional[requests.Session] = None):
         self.app_key = app_key
         self.session_token = session_token
         self.api_endpoint = api_endpoint.rstrip('/')
         self.max_data_weight_points = max_data_weight_points
+        self.http_session = http_session or get_http_session()
         self.headers = {
             'X-Application': app_key,
             'X-Authentication': session_token,
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
+        
+        # listMarketCatalogue payload -> (raw response body, parsed markets). Betfair sends no
+        # ETag/Last-Modified, so an unchanged body is detected by comparing the raw bytes.
+        self._catalogue_cache: Dict[str, tuple] = {}
     
     def update_session_token(self, new_token: str):
         """Update session token after re-authentication"""
@@ -539,7 +627,7 @@ class MarketService:
             url = f"{self.api_endpoint}/listEventTypes/"
             payload = {"filter": {}}
             
-            response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+            response = self.http_session.post(url, json=payload, headers=self.headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -562,7 +650,7 @@ class MarketService:
                 }
             }
             
-            response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+            response = self.http_session.post(url, json=payload, headers=self.headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -576,6 +664,29 @@ class MarketService:
             logger.error(f"Error listing competitions: {str(e)}")
             return []
     
+    def _post_catalogue(self, url: str, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        POST a listMarketCatalogue request (raises on HTTP error)
+        
+        If the raw response body is identical to the previous one for the same payload,
+        the previously parsed markets are returned without JSON-decoding again.
+        """
+        response = self.http_session.post(url, json=payload, headers=self.headers, timeout=30)
+        response.raise_for_status()
+        
+        body = response.content
+        cache_key = json.dumps(payload, sort_keys=True)
+        cached = self._catalogue_cache.get(cache_key)
+        if cached is not None and cached[0] == body:
+            return cached[1]
+        
+        result = response.json()
+        markets = result if isinstance(result, list) else []
+        if len(self._catalogue_cache) >= CATALOGUE_CACHE_MAX_SIZE:
+            self._catalogue_cache.clear()
+        self._catalogue_cache[cache_key] = (body, markets)
+        return markets
+    
     def list_market_catalogue(self, event_type_ids: List[int], 
                              competition_ids: List[int] = None,
                              in_play_only: bool = True,
@@ -629,11 +740,7 @@ class MarketService:
                         "marketProjection": market_projection
                     }
                     
-                    response = requests.post(url, json=payload, headers=self.headers, timeout=30)
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    batch_markets = result if isinstance(result, list) else []
+                    batch_markets = self._post_catalogue(url, payload)
                     all_markets.extend(batch_markets)
                     
                     if len(batch_markets) >= max_results_per_request:
@@ -648,12 +755,7 @@ class MarketService:
                             }
                             
                             try:
-                                response_individual = requests.post(url, json=payload_individual, headers=self.headers, timeout=30)
-                                response_individual.raise_for_status()
-                                
-                                result_individual = response_individual.json()
-                                individual_markets = result_individual if isinstance(result_individual, list) else []
-                                all_markets.extend(individual_markets)
+                                all_markets.extend(self._post_catalogue(url, payload_individual))
                             except Exception:
                                 continue
             
@@ -666,12 +768,7 @@ class MarketService:
                     "marketProjection": market_projection
                 }
                 
-                response = requests.post(url, json=payload, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                
-                result = response.json()
-                markets = result if isinstance(result, list) else []
-                all_markets.extend(markets)
+                all_markets.extend(self._post_catalogue(url, payload))
             
             seen_market_ids = set()
             unique_markets = []
@@ -681,8 +778,8 @@ class MarketService:
                     seen_market_ids.add(market_id)
                     unique_markets.append(market)
             
-            logger.debug(f"Retrieved {len(unique_markets)} unique markets from catalogue "
-                        f"(from {len(all_markets)} total, {len(all_markets) - len(unique_markets)} duplicates removed)")
+            logger.debug("Retrieved %d unique markets from catalogue (from %d total, %d duplicates removed)",
+                        len(unique_markets), len(all_markets), len(all_markets) - len(unique_markets))
             
             return unique_markets
             
@@ -702,50 +799,56 @@ class MarketService:
             logger.error(f"Unexpected error listing market catalogue: {str(e)}")
             return []
     
+    def _post_market_book_batch(self, url: str, batch_market_ids: List[str],
+                                price_projection: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """POST a single listMarketBook batch (raises on HTTP error)"""
+        payload = {
+            "marketIds": batch_market_ids,
+            "priceProjection": dict(price_projection)
+        }
+        
+        response = self.http_session.post(url, json=payload, headers=self.headers, timeout=30)
+        response.raise_for_status()
+        
+        result = response.json()
+        return result if isinstance(result, list) else []
+    
     def list_market_book(self, market_ids: List[str], 
                         price_projection: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Get detailed market book data including prices"""
+        """
+        Get detailed market book data including prices
+        
+        Market IDs are split into batches that each stay within max_data_weight_points;
+        when more than one batch is needed they are requested concurrently.
+        """
         try:
             url = f"{self.api_endpoint}/listMarketBook/"
             
             if price_projection is None:
-                price_projection = {
-                    "priceData": ["EX_BEST_OFFERS", "SP_AVAILABLE", "SP_TRADED"]
-                }
+                price_projection = DEFAULT_PRICE_PROJECTION
             
             projection_weight = calculate_price_projection_weight(price_projection)
-            max_markets_per_request = self.max_data_weight_points // projection_weight if projection_weight > 0 else 1
+            max_markets_per_request = max(1, self.max_data_weight_points // projection_weight) if projection_weight > 0 else 1
             
-            all_market_books = []
-            for i in range(0, len(market_ids), max_markets_per_request):
-                batch_market_ids = market_ids[i:i + max_markets_per_request]
-                
-                total_weight = projection_weight * len(batch_market_ids)
-                if total_weight > self.max_data_weight_points:
-                    max_batch_size = self.max_data_weight_points // projection_weight
-                    batch_market_ids = batch_market_ids[:max_batch_size]
-                    logger.warning(f"Reduced batch size to {len(batch_market_ids)} markets to stay within "
-                                 f"data weight limit ({projection_weight} weight × {len(batch_market_ids)} = "
-                                 f"{projection_weight * len(batch_market_ids)} points)")
-                
-                payload = {
-                    "marketIds": batch_market_ids,
-                    "priceProjection": price_projection
-                }
-                
-                response = requests.post(url, json=payload, headers=self.headers, timeout=30)
-                response.raise_for_status()
-                
-                result = response.json()
-                batch_market_books = result if isinstance(result, list) else []
-                all_market_books.extend(batch_market_books)
-                
-                if len(market_ids) > max_markets_per_request:
-                    logger.debug(f"Split request: {len(batch_market_ids)}/{len(market_ids)} markets "
-                               f"(weight: {projection_weight} × {len(batch_market_ids)} = "
-                               f"{projection_weight * len(batch_market_ids)} points)")
+            batches = [market_ids[i:i + max_markets_per_request]
+                       for i in range(0, len(market_ids), max_markets_per_request)]
+            
+            if len(batches) > 1:
+                logger.debug("Split request into %d batches of up to %d markets (weight: %d × %d = %d points each)",
+                           len(batches), max_markets_per_request, projection_weight, max_markets_per_request,
+                           projection_weight * max_markets_per_request)
+            
+            if len(batches) <= 1:
+                all_market_books = [book for batch in batches
+                                    for book in self._post_market_book_batch(url, batch, price_projection)]
+            else:
+                # Network-bound: run batches in parallel, keep result order
+                with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_MARKET_BOOK_REQUESTS, len(batches))) as executor:
+                    futures = [executor.submit(self._post_market_book_batch, url, batch, price_projection)
+                               for batch in batches]
+                    all_market_books = list(chain.from_iterable(future.result() for future in futures))
             
-            logger.debug(f"Retrieved market book for {len(all_market_books)} markets")
+            logger.debug("Retrieved market book for %d markets", len(all_market_books))
             return all_market_books
             
         except Exception as e:
@@ -765,7 +868,7 @@ class MarketService:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, json={}, headers=account_headers, timeout=30)
+            response = self.http_session.post(url, json={}, headers=account_headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -786,10 +889,12 @@ class MarketService:
 class BettingService:
     """Handles bet placement on Betfair Exchange"""
     
-    def __init__(self, app_key: str, session_token: str, api_endpoint: str):
+    def __init__(self, app_key: str, session_token: str, api_endpoint: str,
+                 http_session: Optional[requests.Session] = None):
         self.app_key = app_key
         self.session_token = session_token
         self.api_endpoint = api_endpoint.rstrip('/')
+        self.http_session = http_session or get_http_session()
         self.headers = {
             'X-Application': app_key,
             'X-Authentication': session_token,
@@ -815,7 +920,7 @@ class BettingService:
             
             logger.debug(f"Placing orders on market {market_id}: {len(instructions)} instruction(s)")
             
-            response = requests.post(url, json=payload, headers=self.headers, timeout=30)
+            response = self.http_session.post(url, json=payload, headers=self.headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -0,0 +1,144 @@
+"""
+Excel Write Queue Module
+Writes bet records and skipped matches to Excel on a background thread, batching saves
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("BetfairBot")
+
+# Queue item kinds
+BET_RECORD = "bet record"
+SKIPPED_MATCH = "skipped match"
+
+
+class ExcelWriteQueue:
+    """Runs ExcelWriter / SkippedMatchesWriter writes on a daemon worker thread"""
+
+    def __init__(self, excel_writer=None, skipped_matches_writer=None,
+                 max_batch_size: int = 20, batch_window_seconds: float = 0.5):
+        """
+        Initialize Excel write queue
+
+        Args:
+            excel_writer: ExcelWriter for bet records (bet records are dropped if None)
+            skipped_matches_writer: SkippedMatchesWriter (skipped matches are dropped if None)
+            max_batch_size: Maximum records written with one save
+            batch_window_seconds: How long the worker keeps collecting records after the first one
+        """
+        self.excel_writer = excel_writer
+        self.skipped_matches_writer = skipped_matches_writer
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window_seconds = batch_window_seconds
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker thread (pending writes are flushed at interpreter exit)"""
+        if self._worker_thread and self._worker_thread.is_alive():
+            logger.warning("Excel write queue is already running")
+            return
+
+        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True, name="ExcelWriter")
+        self._worker_thread.start()
+        atexit.register(self.stop)
+        logger.debug("Excel write queue started")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the worker thread after pending records are written
+
+        Args:
+            timeout: Maximum seconds to wait for pending writes
+        """
+        if not self._worker_thread or not self._worker_thread.is_alive():
+            return
+
+        self._queue.put(None)
+        self._worker_thread.join(timeout=timeout)
+        if self._worker_thread.is_alive():
+            logger.warning("Excel write queue did not finish pending writes within %ss", timeout)
+        else:
+            logger.debug("Excel write queue stopped")
+
+    def submit_bet_record(self, bet_record):
+        """
+        Queue a bet record for the bet log Excel
+
+        The record is converted to a dict now, so later changes (e.g. settlement) don't
+        leak into the appended row. If the worker is not running, it is written synchronously.
+
+        Args:
+            bet_record: BetRecord or bet record dictionary
+        """
+        record = bet_record.to_dict() if hasattr(bet_record, 'to_dict') else dict(bet_record)
+        self._submit(BET_RECORD, record)
+
+    def submit_skipped_match(self, skipped):
+        """
+        Queue a skipped match for the Skipped Matches Excel
+
+        Args:
+            skipped: SkippedMatch instance
+        """
+        self._submit(SKIPPED_MATCH, skipped)
+
+    def _submit(self, kind: str, item: Any):
+        """Queue an item, or write it right away if the worker is not running"""
+        if not self._worker_thread or not self._worker_thread.is_alive():
+            self._write({kind: [item]})
+            return
+        self._queue.put((kind, item))
+
+    def _worker_loop(self):
+        """Worker loop: collect a batch, write it with one save per file, until the stop sentinel"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch: Dict[str, List[Any]] = {}
+            count = 0
+            deadline = time.monotonic() + self.batch_window_seconds
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    kind, payload = item
+                    batch.setdefault(kind, []).append(payload)
+                    count += 1
+                if stopping or count >= self.max_batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: Dict[str, List[Any]]):
+        """Write a batch, logging (never raising) errors"""
+        bet_records = batch.get(BET_RECORD)
+        if bet_records:
+            if self.excel_writer:
+                try:
+                    self.excel_writer.write_bet_records(bet_records)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(bet_records)} bet record(s) to Excel: {str(e)}")
+            else:
+                logger.warning(f"No Excel writer, dropping {len(bet_records)} bet record(s)")
+
+        skipped_matches = batch.get(SKIPPED_MATCH)
+        if skipped_matches:
+            if self.skipped_matches_writer:
+                try:
+                    self.skipped_matches_writer.write_skipped_matches(skipped_matches)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(skipped_matches)} skipped match(es) to Excel: {str(e)}")
+            else:
+                logger.warning(f"No skipped matches writer, dropping {len(skipped_matches)} record(s)")
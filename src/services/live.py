@@ -5,12 +5,23 @@ Consolidated Live Score API services: Client, Matcher, Parser
 import requests
 import time
 import logging
+import random
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+from core.http_session import create_http_session
 
 logger = logging.getLogger("BetfairBot")
 
+# Parallel /scores/events.json requests per batch (see LiveScoreClient.get_match_details_batch)
+MATCH_DETAILS_WORKERS = 8
+
+# Keep-alive connections to the Live API host: one per details worker plus the live-matches poll
+LIVE_API_POOL_MAXSIZE = 16
+
 # ============================================================================
 # PARSER FUNCTIONS
 # ============================================================================
@@ -104,7 +115,7 @@ def parse_match_minute(match_data: Dict[str, Any]) -> int:
                 return minute
             else:
                 if len(str(time_str)) == 4 and minute > 1000:
-                    logger.debug(f"Time field '{time_str}' appears to be kickoff time, not current minute")
+                    logger.debug("Time field '%s' appears to be kickoff time, not current minute", time_str)
                     return -1
                 return minute
         except ValueError:
@@ -114,7 +125,7 @@ def parse_match_minute(match_data: Dict[str, Any]) -> int:
                 if 0 <= minute <= 120:
                     return minute
                 if len(minute_str) == 4 and minute > 1000:
-                    logger.debug(f"Time field '{time_str}' appears to be kickoff time, not current minute")
+                    logger.debug("Time field '%s' appears to be kickoff time, not current minute", time_str)
                     return -1
         
         if status == "IN PLAY" or "LIVE" in status:
@@ -182,7 +193,7 @@ def parse_goals_timeline(match_data: Dict[str, Any]) -> List[Dict[str, Any]]:
                 logger.warning(f"Error parsing individual goal: {str(e)}")
                 continue
         
-        logger.debug(f"Parsed {len(goals)} goal(s) from match data")
+        logger.debug("Parsed %d goal(s) from match data", len(goals))
         return goals
         
     except Exception as e:
@@ -265,6 +276,39 @@ def parse_match_competition(match_data: Dict[str, Any]) -> str:
         return ""
 
 
+@dataclass(slots=True)
+class ParsedLiveMatch:
+    """Live API match with its display/tracking fields parsed once"""
+    match: Dict[str, Any]
+    match_id: str
+    home: str
+    away: str
+    competition: str
+    minute: int
+    score: str
+    status: str
+    is_finished: bool
+
+
+def parse_live_matches(live_matches: List[Dict[str, Any]]) -> List[ParsedLiveMatch]:
+    """Parse teams, competition, minute, score and status of each live match once"""
+    parsed_matches = []
+    for lm in live_matches:
+        home, away = parse_match_teams(lm)
+        parsed_matches.append(ParsedLiveMatch(
+            match=lm,
+            match_id=str(lm.get("id", "")),
+            home=home,
+            away=away,
+            competition=parse_match_competition(lm),
+            minute=parse_match_minute(lm),
+            score=parse_match_score(lm),
+            status=lm.get("status", "N/A"),
+            is_finished="FINISHED" in str(lm.get("status", "")).upper()
+        ))
+    return parsed_matches
+
+
 # ============================================================================
 # RATE LIMITER
 # ============================================================================
@@ -280,6 +324,8 @@ class RateLimiter:
         self.last_reset_date = datetime.now().date()
         self.last_reset_hour = datetime.now().hour
         self.request_times = []
+        # Requests may be recorded from several threads (background refresh, batched details)
+        self._lock = threading.RLock()
         
     def _reset_if_needed(self):
         """Reset counters if day or hour has changed"""
@@ -290,36 +336,57 @@ class RateLimiter:
         if current_date != self.last_reset_date:
             self.requests_today = 0
             self.last_reset_date = current_date
-            logger.info(f"Rate limiter: Daily counter reset (limit: {self.requests_per_day}/day)")
+            logger.info("Rate limiter: Daily counter reset (limit: %s/day)", self.requests_per_day)
         
         if current_hour != self.last_reset_hour:
             self.requests_this_hour = 0
             self.last_reset_hour = current_hour
             cutoff = now - timedelta(hours=1)
             self.request_times = [t for t in self.request_times if t > cutoff]
-            logger.debug(f"Rate limiter: Hourly counter reset (limit: {self.requests_per_hour:.1f}/hour)")
+            logger.debug("Rate limiter: Hourly counter reset (limit: %.1f/hour)", self.requests_per_hour)
     
     def can_make_request(self) -> bool:
         """Check if a request can be made without exceeding limits"""
-        self._reset_if_needed()
-        
-        if self.requests_today >= self.requests_per_day:
-            logger.warning(f"Rate limit exceeded: {self.requests_today}/{self.requests_per_day} requests today")
-            return False
-        
-        if self.requests_this_hour >= self.requests_per_hour:
-            logger.warning(f"Rate limit exceeded: {self.requests_this_hour:.1f}/{self.requests_per_hour:.1f} requests this hour")
-            return False
-        
-        return True
+        with self._lock:
+            self._reset_if_needed()
+            
+            if self.requests_today >= self.requests_per_day:
+                logger.warning(f"Rate limit exceeded: {self.requests_today}/{self.requests_per_day} requests today")
+                return False
+            
+            if self.requests_this_hour >= self.requests_per_hour:
+                logger.warning(f"Rate limit exceeded: {self.requests_this_hour:.1f}/{self.requests_per_hour:.1f} requests this hour")
+                return False
+            
+            return True
     
     def record_request(self):
         """Record that a request was made"""
+        with self._lock:
+            self._reset_if_needed()
+            self.requests_today += 1
+            self.requests_this_hour += 1
+            self.request_times.append(datetime.now())
+        logger.debug("Rate limiter: %s/%s requests today, %.1f/%.1f this hour",
+                     self.requests_today, self.requests_per_day, self.requests_this_hour, self.requests_per_hour)
+    
+    def get_paced_interval(self) -> float:
+        """
+        Seconds between requests that spreads the remaining hourly budget over the rest of the hour
+        
+        Short while plenty of budget is left (bursts stay possible), longer as it runs out,
+        so polling slows down instead of hitting the limit and stalling until the next hour.
+        
+        Returns:
+            Minimum interval in seconds (0.0 when the budget is unconstrained)
+        """
         self._reset_if_needed()
-        self.requests_today += 1
-        self.requests_this_hour += 1
-        self.request_times.append(datetime.now())
-        logger.debug(f"Rate limiter: {self.requests_today}/{self.requests_per_day} requests today, {self.requests_this_hour:.1f}/{self.requests_per_hour:.1f} this hour")
+        now = datetime.now()
+        seconds_left_in_hour = 3600 - (now.minute * 60 + now.second)
+        remaining_this_hour = self.requests_per_hour - self.requests_this_hour
+        if remaining_this_hour < 1:
+            return float(seconds_left_in_hour)
+        return seconds_left_in_hour / remaining_this_hour
     
     def get_status(self) -> Dict[str, Any]:
         """Get current rate limiter status"""
@@ -347,8 +414,10 @@ class LiveScoreClient:
         self.api_secret = api_secret
         self.base_url = base_url.rstrip('/')
         self.rate_limiter = RateLimiter(rate_limit_per_day)
+        self._details_executor: Optional[ThreadPoolExecutor] = None
         
-        self.session = requests.Session()
+        # Pooled keep-alive session: repeated calls reuse the TCP/TLS connection
+        self.session = create_http_session(pool_connections=1, pool_maxsize=LIVE_API_POOL_MAXSIZE)
         self.session.headers.update({
             'Accept': 'application/json',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -364,11 +433,11 @@ class LiveScoreClient:
         
         for attempt in range(max_retries + 1):
             try:
-                logger.debug(f"Making request to: {url} (attempt {attempt + 1}/{max_retries + 1})")
+                logger.debug("Making request to: %s (attempt %d/%d)", url, attempt + 1, max_retries + 1)
                 response = self.session.get(url, params=params, timeout=30)
                 
-                logger.debug(f"Response status: {response.status_code}")
-                logger.debug(f"Response headers: {dict(response.headers)}")
+                logger.debug("Response status: %s", response.status_code)
+                logger.debug("Response headers: %s", response.headers)
                 
                 if not response.text or not response.text.strip():
                     logger.error(f"Empty response from Live Score API: {url}")
@@ -404,7 +473,6 @@ class LiveScoreClient:
                 
                 if is_connection_error or isinstance(e, requests.exceptions.Timeout):
                     if attempt < max_retries:
-                        import random
                         delay = random.uniform(0.5, 1.0)
                         logger.warning(f"Connection error in Live Score API request (attempt {attempt + 1}/{max_retries + 1}): {error_str}")
                         logger.warning(f"Retrying in {delay:.2f} seconds...")
@@ -462,6 +530,7 @@ class LiveScoreClient:
                 
                 live_matches = []
                 allowed_competition_ids = set(competition_ids) if competition_ids else None
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 
                 for match in matches:
                     if allowed_competition_ids:
@@ -474,28 +543,32 @@ class LiveScoreClient:
                                 pass
                         
                         if match_comp_id and match_comp_id not in allowed_competition_ids:
-                            logger.debug(f"Skipping match (competition not in filter): {match.get('home', {}).get('name', 'N/A')} v {match.get('away', {}).get('name', 'N/A')} - Competition ID: {match_comp_id}")
+                            if debug_enabled:
+                                logger.debug("Skipping match (competition not in filter): %s v %s - Competition ID: %s", match.get('home', {}).get('name', 'N/A'), match.get('away', {}).get('name', 'N/A'), match_comp_id)
                             continue
                     
                     status = str(match.get("status", "")).upper()
                     
                     if "NOT STARTED" in status or "SCHEDULED" in status or "POSTPONED" in status:
-                        logger.debug(f"Skipping match (not started): {match.get('home', {}).get('name', 'N/A')} v {match.get('away', {}).get('name', 'N/A')} - Status: {status}")
+                        if debug_enabled:
+                            logger.debug("Skipping match (not started): %s v %s - Status: %s", match.get('home', {}).get('name', 'N/A'), match.get('away', {}).get('name', 'N/A'), status)
                         continue
                     
                     if "FINISHED" in status:
-                        logger.debug(f"Skipping match (finished): {match.get('home', {}).get('name', 'N/A')} v {match.get('away', {}).get('name', 'N/A')} - Status: {status}")
+                        if debug_enabled:
+                            logger.debug("Skipping match (finished): %s v %s - Status: %s", match.get('home', {}).get('name', 'N/A'), match.get('away', {}).get('name', 'N/A'), status)
                         continue
                     
                     minute = parse_match_minute(match)
                     # Filter out matches at minute 90 or above (match finished or about to finish)
                     if minute < 0 or minute >= 90:
-                        logger.debug(f"Skipping match (not live or finished): {match.get('home', {}).get('name', 'N/A')} v {match.get('away', {}).get('name', 'N/A')} - Minute: {minute}")
+                        if debug_enabled:
+                            logger.debug("Skipping match (not live or finished): %s v %s - Minute: %s", match.get('home', {}).get('name', 'N/A'), match.get('away', {}).get('name', 'N/A'), minute)
                         continue
                     
                     live_matches.append(match)
                 
-                logger.debug(f"Retrieved {len(matches)} match(es) from API, filtered to {len(live_matches)} live match(es)")
+                logger.debug("Retrieved %d match(es) from API, filtered to %d live match(es)", len(matches), len(live_matches))
                 return live_matches
             else:
                 logger.warning(f"API response indicates failure or unexpected structure: {result}")
@@ -505,7 +578,7 @@ class LiveScoreClient:
     
     def get_match_details(self, match_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific match"""
-        logger.debug(f"Fetching match details for match ID: {match_id}")
+        logger.debug("Fetching match details for match ID: %s", match_id)
         
         # Try to convert match_id to int if it's a string number
         try:
@@ -531,12 +604,37 @@ class LiveScoreClient:
                     if "match" in match_data:
                         match_data = match_data["match"]
                     # If data is already a match object, use it directly
-                    logger.debug(f"Retrieved match details for match ID: {match_id} - structure: {list(match_data.keys())[:5] if isinstance(match_data, dict) else 'not dict'}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Retrieved match details for match ID: %s - structure: %s", match_id,
+                                     list(match_data.keys())[:5] if isinstance(match_data, dict) else 'not dict')
                     return match_data
         
         logger.warning(f"Failed to get match details for match ID: {match_id} - result: {result}")
         return None
     
+    def get_match_details_batch(self, match_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get match details for several matches, fetching them in parallel
+        
+        The Live API has no multi-ID events endpoint, so requests are issued concurrently
+        on a small worker pool instead of one round-trip after another.
+        
+        Args:
+            match_ids: Live API match IDs (duplicates are fetched once)
+        
+        Returns:
+            Dictionary {match_id: match details or None if the request failed}
+        """
+        unique_ids = list(dict.fromkeys(match_ids))
+        if len(unique_ids) <= 1:
+            return {match_id: self.get_match_details(match_id) for match_id in unique_ids}
+        
+        if self._details_executor is None:
+            self._details_executor = ThreadPoolExecutor(max_workers=MATCH_DETAILS_WORKERS,
+                                                        thread_name_prefix="LiveScoreDetails")
+        logger.debug("Fetching match details for %d match(es) in parallel", len(unique_ids))
+        return dict(zip(unique_ids, self._details_executor.map(self.get_match_details, unique_ids)))
+    
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status"""
         return self.rate_limiter.get_status()
@@ -580,6 +678,43 @@ class MatchMatcher:
     
     def __init__(self):
         self.match_cache: Dict[str, str] = {}
+        # Live matches indexed by ID, rebuilt only when a new live_matches list is passed
+        self._live_by_id_source: Optional[List[Dict[str, Any]]] = None
+        self._live_by_id: Dict[str, Dict[str, Any]] = {}
+        self._parsed_matches: List[ParsedLiveMatch] = []
+    
+    def get_live_matches_by_id(self, live_matches: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get live matches indexed by Live API match ID (reused while the list is unchanged)
+        
+        Args:
+            live_matches: List of live matches (as returned by the Live API / poller cache)
+        
+        Returns:
+            Dictionary {match_id: live_match}
+        """
+        self._refresh_live_index(live_matches)
+        return self._live_by_id
+    
+    def get_parsed_matches(self, live_matches: List[Dict[str, Any]]) -> List[ParsedLiveMatch]:
+        """
+        Get live matches with teams/competition parsed once (reused while the list is unchanged)
+        
+        Args:
+            live_matches: List of live matches (as returned by the Live API / poller cache)
+        
+        Returns:
+            List of ParsedLiveMatch in the same order
+        """
+        self._refresh_live_index(live_matches)
+        return self._parsed_matches
+    
+    def _refresh_live_index(self, live_matches: List[Dict[str, Any]]):
+        """Rebuild the parsed list and ID index when a new live_matches list is passed"""
+        if live_matches is not self._live_by_id_source:
+            self._live_by_id_source = live_matches
+            self._parsed_matches = parse_live_matches(live_matches)
+            self._live_by_id = {p.match_id: p.match for p in self._parsed_matches}
     
     def normalize_team_name(self, team_name: str) -> str:
         """Normalize team name for matching"""
@@ -675,16 +810,16 @@ class MatchMatcher:
         threshold = 0.30
         
         if home_similarity >= threshold and away_similarity >= threshold:
-            logger.debug(f"Teams matched: '{betfair_home}' vs '{live_home}' ({home_similarity:.2f}), "
-                        f"'{betfair_away}' vs '{live_away}' ({away_similarity:.2f})")
+            logger.debug("Teams matched: '%s' vs '%s' (%.2f), '%s' vs '%s' (%.2f)",
+                        betfair_home, live_home, home_similarity, betfair_away, live_away, away_similarity)
             return True
         
         swapped_home_similarity = self.calculate_team_similarity(betfair_home, live_away)
         swapped_away_similarity = self.calculate_team_similarity(betfair_away, live_home)
         
         if swapped_home_similarity >= threshold and swapped_away_similarity >= threshold:
-            logger.debug(f"Teams matched (swapped): '{betfair_home}' vs '{live_away}' ({swapped_home_similarity:.2f}), "
-                        f"'{betfair_away}' vs '{live_home}' ({swapped_away_similarity:.2f})")
+            logger.debug("Teams matched (swapped): '%s' vs '%s' (%.2f), '%s' vs '%s' (%.2f)",
+                        betfair_home, live_away, swapped_home_similarity, betfair_away, live_home, swapped_away_similarity)
             return True
         
         return False
@@ -780,13 +915,13 @@ class MatchMatcher:
         """Match a Betfair event with a Live API match"""
         betfair_event_id = betfair_event.get("id", "")
         betfair_event_name = betfair_event.get("name", "")
+        parsed_matches = self.get_parsed_matches(live_matches)
         
         if betfair_event_id in self.match_cache:
-            cached_match_id = self.match_cache[betfair_event_id]
-            for live_match in live_matches:
-                if str(live_match.get("id", "")) == cached_match_id:
-                    logger.debug(f"Using cached match for Betfair event {betfair_event_id}")
-                    return live_match
+            live_match = self.get_live_matches_by_id(live_matches).get(self.match_cache[betfair_event_id])
+            if live_match is not None:
+                logger.debug("Using cached match for Betfair event %s", betfair_event_id)
+                return live_match
         
         betfair_competition_id = None
         if "competition" in betfair_event:
@@ -822,9 +957,10 @@ class MatchMatcher:
             
             # Fallback: Try to match by team names only (without competition ID filter)
             if betfair_home_team and betfair_away_team:
-                for live_match in live_matches:
+                for parsed in parsed_matches:
+                    live_match = parsed.match
                     try:
-                        live_home_team, live_away_team = parse_match_teams(live_match)
+                        live_home_team, live_away_team = parsed.home, parsed.away
                         if self.match_teams(betfair_home_team, betfair_away_team, live_home_team, live_away_team):
                             # Also check time if available
                             if betfair_time and ("kickoff" in live_match or "start_time" in live_match):
@@ -866,9 +1002,9 @@ class MatchMatcher:
         
         # Count matches in the same competition
         matches_in_same_competition = []
-        for live_match in live_matches:
+        for parsed in parsed_matches:
             try:
-                live_competition = parse_match_competition(live_match)
+                live_competition = parsed.competition
                 live_match_competition_id = None
                 if live_competition and "_" in live_competition:
                     try:
@@ -880,21 +1016,21 @@ class MatchMatcher:
                         pass
                 
                 if live_api_competition_id and live_match_competition_id and live_api_competition_id == live_match_competition_id:
-                    matches_in_same_competition.append(live_match)
+                    matches_in_same_competition.append(parsed)
             except:
                 pass
         
         # If only one match in the same competition, match with it (even if team names don't match)
         if len(matches_in_same_competition) == 1 and live_api_competition_id:
-            single_match = matches_in_same_competition[0]
-            live_home, live_away = parse_match_teams(single_match)
-            logger.debug(f"Only one match in competition {live_api_competition_id}, matching '{betfair_event_name}' with '{live_home} v {live_away}' (team names may not match)")
-            self.match_cache[betfair_event_id] = str(single_match.get("id", ""))
-            return single_match
+            single = matches_in_same_competition[0]
+            logger.debug(f"Only one match in competition {live_api_competition_id}, matching '{betfair_event_name}' with '{single.home} v {single.away}' (team names may not match)")
+            self.match_cache[betfair_event_id] = single.match_id
+            return single.match
         
-        for live_match in live_matches:
+        for parsed in parsed_matches:
+            live_match = parsed.match
             try:
-                live_competition = parse_match_competition(live_match)
+                live_competition = parsed.competition
                 
                 live_match_competition_id = None
                 if live_competition and "_" in live_competition:
@@ -916,7 +1052,7 @@ class MatchMatcher:
                 # If competition ID matches, try to match teams
                 teams_match = False
                 if betfair_home_team and betfair_away_team:
-                    live_home_team, live_away_team = parse_match_teams(live_match)
+                    live_home_team, live_away_team = parsed.home, parsed.away
                     teams_match = self.match_teams(
                         betfair_home_team, betfair_away_team,
                         live_home_team, live_away_team
@@ -976,9 +1112,9 @@ class MatchMatcher:
             best_fallback_match = None
             best_fallback_similarity = 0.0
             
-            for live_match in live_matches:
+            for parsed in parsed_matches:
                 try:
-                    live_home_team, live_away_team = parse_match_teams(live_match)
+                    live_home_team, live_away_team = parsed.home, parsed.away
                     
                     # Calculate similarity to find best match
                     home_sim = self.calculate_team_similarity(betfair_home_team, live_home_team)
@@ -994,16 +1130,15 @@ class MatchMatcher:
                     if match_sim >= 0.30:
                         if match_sim > best_fallback_similarity:
                             best_fallback_similarity = match_sim
-                            best_fallback_match = live_match
+                            best_fallback_match = parsed
                 except Exception as e:
                     logger.debug(f"Error in fallback matching: {str(e)}")
                     continue
             
             if best_fallback_match:
-                live_home, live_away = parse_match_teams(best_fallback_match)
-                logger.info(f"✓ Matched '{betfair_event_name}' with '{live_home} v {live_away}' by team names only (similarity: {best_fallback_similarity:.2f}, competition ID: {live_api_competition_id or 'N/A'})")
-                self.match_cache[betfair_event_id] = str(best_fallback_match.get("id", ""))
-                return best_fallback_match
+                logger.info(f"✓ Matched '{betfair_event_name}' with '{best_fallback_match.home} v {best_fallback_match.away}' by team names only (similarity: {best_fallback_similarity:.2f}, competition ID: {live_api_competition_id or 'N/A'})")
+                self.match_cache[betfair_event_id] = best_fallback_match.match_id
+                return best_fallback_match.match
             else:
                 logger.debug(f"No team name match found in fallback for '{betfair_event_name}' (Betfair: '{betfair_home_team} v {betfair_away_team}')")
         
@@ -1016,6 +1151,7 @@ class MatchMatcher:
         """Analyze why a Betfair event was not matched"""
         if not live_matches:
             return "No Live API matches available"
+        parsed_matches = self.get_parsed_matches(live_matches)
         
         betfair_competition_id = None
         if "competition" in betfair_event:
@@ -1048,9 +1184,10 @@ class MatchMatcher:
         time_match_found = False
         team_match_found = False
         
-        for live_match in live_matches:
+        for parsed in parsed_matches:
+            live_match = parsed.match
             try:
-                live_competition = parse_match_competition(live_match)
+                live_competition = parsed.competition
                 
                 live_match_competition_id = None
                 if live_competition and "_" in live_competition:
@@ -1067,7 +1204,7 @@ class MatchMatcher:
                 
                 # Check team names if competition ID matches
                 if competition_id_found and betfair_home_team and betfair_away_team:
-                    live_home_team, live_away_team = parse_match_teams(live_match)
+                    live_home_team, live_away_team = parsed.home, parsed.away
                     if self.match_teams(betfair_home_team, betfair_away_team, live_home_team, live_away_team):
                         team_match_found = True
                 
@@ -1113,15 +1250,15 @@ class MatchMatcher:
             potential_teams = []
             min_similarity_threshold = 0.3  # Only consider matches with at least 30% similarity
             
-            for live_match in live_matches:
+            for parsed in parsed_matches:
                 try:
-                    live_competition = parse_match_competition(live_match)
+                    live_competition = parsed.competition
                     live_match_competition_id = None
                     if live_competition and "_" in live_competition:
                         parts = live_competition.split("_", 1)
                         live_match_competition_id = parts[0].strip()
                         if live_match_competition_id.isdigit() and live_match_competition_id == live_api_competition_id:
-                            live_home, live_away = parse_match_teams(live_match)
+                            live_home, live_away = parsed.home, parsed.away
                             
                             # Calculate similarity for this match
                             home_sim = self.calculate_team_similarity(betfair_home_team, live_home)
@@ -1167,15 +1304,15 @@ class MatchMatcher:
             else:
                 # No matches found with reasonable similarity - check if there are any matches in this competition at all
                 all_teams_in_competition = []
-                for live_match in live_matches:
+                for parsed in parsed_matches:
                     try:
-                        live_competition = parse_match_competition(live_match)
+                        live_competition = parsed.competition
                         live_match_competition_id = None
                         if live_competition and "_" in live_competition:
                             parts = live_competition.split("_", 1)
                             live_match_competition_id = parts[0].strip()
                             if live_match_competition_id.isdigit() and live_match_competition_id == live_api_competition_id:
-                                live_home, live_away = parse_match_teams(live_match)
+                                live_home, live_away = parsed.home, parsed.away
                                 all_teams_in_competition.append(f"{live_home} v {live_away}")
                                 if len(all_teams_in_competition) >= 5:  # Limit to 5 examples
                                     break
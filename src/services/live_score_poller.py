@@ -4,8 +4,9 @@ Handles Live Score API polling with dynamic intervals and caching
 """
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait
 from typing import List, Dict, Any, Optional
-from services.live import parse_match_score, parse_match_minute, parse_match_teams, parse_match_competition
+from services.live import ParsedLiveMatch, parse_live_matches
 
 logger = logging.getLogger("BetfairBot")
 
@@ -13,76 +14,192 @@ logger = logging.getLogger("BetfairBot")
 class LiveScorePoller:
     """Service for polling Live Score API with dynamic intervals"""
     
-    def __init__(self, live_score_client, live_api_competition_ids: Optional[List[int]] = None):
+    def __init__(self, live_score_client, live_api_competition_ids: Optional[List[int]] = None,
+                 background_refresh: bool = True, prefetch_wait_seconds: float = 5.0):
         """
         Initialize Live Score Poller
         
         Args:
             live_score_client: Live Score API client
             live_api_competition_ids: List of Live API competition IDs to filter
+            background_refresh: Serve cached matches and refresh them in a background thread
+                                (only the very first call blocks)
+            prefetch_wait_seconds: How long poll() waits for an in-flight background call
+                                   before falling back to the cached matches
         """
         self.live_score_client = live_score_client
         self.live_api_competition_ids = live_api_competition_ids
         self.cached_matches: List[Dict[str, Any]] = []
-        self.last_call_time: Optional[float] = None
+        self.last_call_time: Optional[float] = None  # time.monotonic() of last successful call
+        self.background_refresh = background_refresh
+        self.prefetch_wait_seconds = prefetch_wait_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_future: Optional[Future] = None
+        self._refresh_started_at: Optional[float] = None
+        
+        # Parsed view of cached_matches (rebuilt only when the cache changes)
+        self._parsed_source: Optional[List[Dict[str, Any]]] = None
+        self._parsed_matches: List[ParsedLiveMatch] = []
+        self._parsed_by_id: Dict[str, ParsedLiveMatch] = {}
+    
+    def _fetch_live_matches(self) -> Optional[List[Dict[str, Any]]]:
+        """Call Live API (None means connection error after retries)"""
+        # Pass Live API competition IDs to filter matches
+        return self.live_score_client.get_live_matches(
+            competition_ids=self.live_api_competition_ids if self.live_api_competition_ids else None
+        )
+    
+    def _apply_result(self, live_matches: Optional[List[Dict[str, Any]]], call_time: float) -> List[Dict[str, Any]]:
+        """
+        Update cache from an API result
+        
+        Returns:
+            Live matches to use (fresh data, or cached data if the result is unusable)
+        """
+        # Check if API is not reachable (None means connection error after retries)
+        if live_matches is None:
+            # Use cached data if available
+            # Don't update last_call_time so we retry sooner
+            return self.cached_matches if self.cached_matches else []
+        
+        # API call successful - update cache and timestamp
+        self.last_call_time = call_time
+        # Only cache if we got valid data (list)
+        if isinstance(live_matches, list):
+            self.cached_matches = live_matches
+            return live_matches
+        logger.warning(f"Live Score API returned invalid data type, using cached data")
+        return self.cached_matches if self.cached_matches else []
+    
+    def _collect_background_refresh(self):
+        """Apply the result of a finished background refresh (if any)"""
+        if not self._refresh_future or not self._refresh_future.done():
+            return
+        future = self._refresh_future
+        self._refresh_future = None
+        try:
+            self._apply_result(future.result(), self._refresh_started_at)
+        except Exception as api_error:
+            logger.warning(f"Live Score API call failed, using cached data: {str(api_error)[:100]}")
+    
+    def _is_call_due(self, current_time: float, polling_interval: int) -> bool:
+        """
+        Check if the Live API should be called (first call or enough time has passed)
+        
+        The interval is stretched to the rate limiter's paced interval when the hourly
+        budget would not last at the requested rate.
+        """
+        if self.last_call_time is None:
+            return True
+        rate_limiter = getattr(self.live_score_client, "rate_limiter", None)
+        if rate_limiter is not None:
+            polling_interval = max(polling_interval, rate_limiter.get_paced_interval())
+        return current_time - self.last_call_time >= polling_interval
+    
+    def _start_background_refresh(self, current_time: float):
+        """Submit a Live API call to the worker thread (no-op if one is already running)"""
+        if self._refresh_future is not None:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LiveScoreRefresh")
+        self._refresh_started_at = current_time
+        self._refresh_future = self._executor.submit(self._fetch_live_matches)
+    
+    def prefetch(self, polling_interval: int):
+        """
+        Start a due Live API call in the background without waiting for it
+        
+        Called before Betfair market detection so both round-trips overlap; the
+        following poll() picks up the result.
+        
+        Args:
+            polling_interval: Polling interval in seconds
+        """
+        if not self.background_refresh:
+            return
+        self._collect_background_refresh()
+        current_time = time.monotonic()
+        if self._is_call_due(current_time, polling_interval):
+            self._start_background_refresh(current_time)
     
     def poll(self, polling_interval: int) -> List[Dict[str, Any]]:
         """
         Poll Live Score API with caching
         
+        With background_refresh, a due API call is started in a worker thread and the
+        cached matches are returned immediately; the fresh data is used from the next poll.
+        A call already in flight (e.g. started by prefetch()) is waited for up to
+        prefetch_wait_seconds, then the cached matches are used.
+        
         Args:
             polling_interval: Polling interval in seconds
         
         Returns:
             List of live matches (from API or cache)
         """
-        current_time = time.time()
+        if self._refresh_future is not None:
+            # Bounded wait for the in-flight call, so a slow Live API can't stall the loop
+            wait((self._refresh_future,), timeout=self.prefetch_wait_seconds)
+            self._collect_background_refresh()
+            # Fresh data if the call finished; otherwise the cache, and the result is picked up later
+            return self.cached_matches
         
-        # Check if we need to call API (first call or enough time has passed)
-        should_call_api = False
-        if self.last_call_time is None:
-            # First call - always call API
-            should_call_api = True
-        else:
-            time_since_last_call = current_time - self.last_call_time
-            if time_since_last_call >= polling_interval:
-                should_call_api = True
-        
-        if should_call_api:
-            # Time to call Live API
-            api_unreachable = False
-            try:
-                # Pass Live API competition IDs to filter matches
-                live_matches = self.live_score_client.get_live_matches(
-                    competition_ids=self.live_api_competition_ids if self.live_api_competition_ids else None
-                )
-                
-                # Check if API is not reachable (None means connection error after retries)
-                if live_matches is None:
-                    api_unreachable = True
-                    # Use cached data if available
-                    live_matches = self.cached_matches if self.cached_matches else []
-                    # Don't update last_call_time so we retry sooner
-                else:
-                    # API call successful - update cache and timestamp
-                    self.last_call_time = current_time
-                    # Only cache if we got valid data (list)
-                    if isinstance(live_matches, list):
-                        self.cached_matches = live_matches
-                    else:
-                        logger.warning(f"Live Score API returned invalid data type, using cached data")
-                        live_matches = self.cached_matches if self.cached_matches else []
-            except Exception as api_error:
-                # If API call fails with exception, use cached data if available
-                logger.warning(f"Live Score API call failed, using cached data: {str(api_error)[:100]}")
-                live_matches = self.cached_matches if self.cached_matches else []
-                # Don't update last_call_time so we retry sooner
-        else:
+        # Monotonic clock: NTP adjustments / suspend-resume can't break the polling interval
+        current_time = time.monotonic()
+        
+        if not self._is_call_due(current_time, polling_interval):
             # Use cached matches
-            live_matches = self.cached_matches
-            api_unreachable = False  # Not calling API, so not unreachable
+            return self.cached_matches
+        
+        if self.background_refresh and self.cached_matches:
+            # Stale-while-revalidate: serve cache, refresh in background
+            self._start_background_refresh(current_time)
+            return self.cached_matches
+        
+        # Time to call Live API (blocking: nothing cached yet or background refresh disabled)
+        try:
+            return self._apply_result(self._fetch_live_matches(), current_time)
+        except Exception as api_error:
+            # If API call fails with exception, use cached data if available
+            logger.warning(f"Live Score API call failed, using cached data: {str(api_error)[:100]}")
+            # Don't update last_call_time so we retry sooner
+            return self.cached_matches if self.cached_matches else []
+    
+    def close(self):
+        """Stop the background refresh worker (pending refresh is abandoned)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._refresh_future = None
+    
+    def get_parsed_matches(self, live_matches: List[Dict[str, Any]]) -> List[ParsedLiveMatch]:
+        """
+        Get parsed live matches, reusing the previous parse while the list is unchanged
+        
+        Args:
+            live_matches: List of live matches (as returned by poll)
+        
+        Returns:
+            List of ParsedLiveMatch in the same order
+        """
+        if live_matches is not self._parsed_source:
+            self._parsed_source = live_matches
+            self._parsed_matches = parse_live_matches(live_matches)
+            self._parsed_by_id = {p.match_id: p for p in self._parsed_matches}
+        return self._parsed_matches
+    
+    def get_parsed_by_id(self, live_matches: List[Dict[str, Any]]) -> Dict[str, ParsedLiveMatch]:
+        """
+        Get parsed live matches indexed by Live API match ID
+        
+        Args:
+            live_matches: List of live matches (as returned by poll)
         
-        return live_matches
+        Returns:
+            Dictionary {match_id: ParsedLiveMatch}
+        """
+        self.get_parsed_matches(live_matches)
+        return self._parsed_by_id
     
     def log_matches(self, live_matches: List[Dict[str, Any]]):
         """
@@ -91,31 +208,24 @@ class LiveScorePoller:
         Args:
             live_matches: List of live matches
         """
+        # Nothing to format when INFO is disabled
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         if not live_matches:
             # Log when no matches available
             logger.info(f"Live API: 0 available matches after comparing with Excel.")
             return
         
         # Filter out FINISHED matches and matches at minute 90+ before logging
-        actual_live = []
-        for lm in live_matches:
-            status = str(lm.get("status", "")).upper()
-            minute = parse_match_minute(lm)
+        actual_live = [
+            p for p in self.get_parsed_matches(live_matches)
             # Skip if FINISHED or minute >= 90 (match finished or about to finish)
-            if "FINISHED" not in status and minute >= 0 and minute < 90:
-                actual_live.append(lm)
-        
-        # Format log message
-        live_api_msg = f"Live API: {len(actual_live)} available matches after comparing with Excel."
-        logger.info(live_api_msg)
-        
-        # Log ALL matches (not just first 5)
-        for i, lm in enumerate(actual_live, 1):
-            home, away = parse_match_teams(lm)
-            comp = parse_match_competition(lm)
-            minute = parse_match_minute(lm)
-            score = parse_match_score(lm)
-            status = lm.get("status", "N/A")
-            match_msg = f"  [{i}] {home} v {away} ({comp}) - {score} @ {minute}' [{status}]"
-            logger.info(match_msg)
-
+            if not p.is_finished and 0 <= p.minute < 90
+        ]
+        
+        # Log ALL matches (not just first 5) with a single logging call
+        lines = [f"Live API: {len(actual_live)} available matches after comparing with Excel."]
+        lines.extend(f"  [{i}] {p.home} v {p.away} ({p.competition}) - {p.score} @ {p.minute}' [{p.status}]"
+                     for i, p in enumerate(actual_live, 1))
+        logger.info("\n".join(lines))
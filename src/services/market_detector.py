@@ -3,8 +3,10 @@ Market Detector Service
 Handles Betfair market detection and filtering
 """
 import logging
+import threading
 from typing import Dict, Any, List, Set, Optional
 from services.betfair import get_live_markets_from_stream_api
+from config.competition_mapper import get_competition_ids_from_excel
 
 logger = logging.getLogger("BetfairBot")
 
@@ -27,6 +29,81 @@ class MarketDetector:
         self.cached_markets: List[Dict[str, Any]] = []
         self.market_type_codes = ["OVER_UNDER_05", "OVER_UNDER_15", "OVER_UNDER_25", 
                                    "OVER_UNDER_35", "OVER_UNDER_45"]
+        
+        # Background competition mapping refresh (see start_competition_refresh)
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._refresh_stopped = True
+    
+    def start_competition_refresh(self, excel_path: str, event_type_ids: List[int], interval_seconds: float):
+        """
+        Re-map competition IDs from Excel periodically on a background timer
+        
+        The polling loop never waits for list_competitions / Excel reads: the new IDs
+        replace self.competition_ids in one assignment when the refresh finishes.
+        
+        Args:
+            excel_path: Path to Competitions Excel file
+            event_type_ids: Betfair event type IDs for list_competitions
+            interval_seconds: Seconds between refreshes
+        """
+        with self._refresh_lock:
+            self._refresh_stopped = False
+            self._schedule_competition_refresh(excel_path, event_type_ids, interval_seconds)
+        logger.debug(f"Competition mapping refresh scheduled every {interval_seconds}s")
+    
+    def stop_competition_refresh(self):
+        """Cancel the background competition mapping refresh"""
+        with self._refresh_lock:
+            self._refresh_stopped = True
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+    
+    def _schedule_competition_refresh(self, excel_path: str, event_type_ids: List[int], interval_seconds: float):
+        """Arm the next refresh timer (caller holds _refresh_lock)"""
+        self._refresh_timer = threading.Timer(
+            interval_seconds, self._refresh_competition_ids,
+            args=(excel_path, event_type_ids, interval_seconds)
+        )
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+    
+    def _refresh_competition_ids(self, excel_path: str, event_type_ids: List[int], interval_seconds: float):
+        """Timer callback: re-map competition IDs, swap them in and re-arm"""
+        try:
+            betfair_competitions = self.market_service.list_competitions(event_type_ids)
+            if betfair_competitions:
+                mapped_ids = get_competition_ids_from_excel(excel_path, betfair_competitions)
+                if mapped_ids:
+                    new_ids = [int(cid) for cid in mapped_ids if cid is not None]
+                    if set(new_ids) != set(self.competition_ids):
+                        logger.info(f"Competition mapping refreshed: {len(self.competition_ids)} -> {len(new_ids)} competitions")
+                    self.competition_ids = new_ids
+        except Exception as e:
+            logger.warning(f"Competition mapping refresh failed, keeping current IDs: {str(e)}")
+        finally:
+            with self._refresh_lock:
+                if not self._refresh_stopped:
+                    self._schedule_competition_refresh(excel_path, event_type_ids, interval_seconds)
+    
+    def _get_competition_ids_int(self) -> Set[int]:
+        """Convert competition_ids to ints for comparison (invalid IDs are skipped)"""
+        competition_ids_int = set()
+        for cid in self.competition_ids:
+            try:
+                if isinstance(cid, int):
+                    competition_ids_int.add(cid)
+                elif isinstance(cid, str):
+                    cid_clean = str(cid).strip()
+                    if cid_clean:
+                        competition_ids_int.add(int(cid_clean))
+                else:
+                    competition_ids_int.add(int(cid))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"⚠️ Failed to convert competition_id '{cid}' (type: {type(cid)}) to int: {e}")
+                continue
+        return competition_ids_int
     
     def detect_markets(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -50,91 +127,14 @@ class MarketDetector:
         elif not markets or len(markets) == 0:
             # Use cached data if available
             if self.cached_markets:
-                logger.debug(f"Stream API returned 0 markets, using cached {len(self.cached_markets)} markets from previous iteration")
+                logger.debug("Stream API returned 0 markets, using cached %d markets from previous iteration", len(self.cached_markets))
                 markets = self.cached_markets
         
         # Filter by competition_ids from Excel
-        unique_events: Dict[str, Dict[str, Any]] = {}
         if markets:
-            logger.debug(f"Betfair Stream API returned {len(markets)} markets before Excel filtering")
-            for market in markets:
-                event = market.get("event", {})
-                event_id = event.get("id", "")
-                competition = market.get("competition", {})
-                competition_id = competition.get("id")
-                competition_name = competition.get("name", "N/A")
-                event_name = event.get("name", "N/A")
-                
-                # Filter by competition_ids from Excel
-                if self.competition_ids:
-                    if not competition_id:
-                        # Market has no competition_id - skip it
-                        continue
-                    
-                    # Convert competition_id to int for comparison
-                    try:
-                        comp_id_int = int(competition_id)
-                    except (ValueError, TypeError):
-                        continue
-                    
-                    # Convert competition_ids to ints for comparison
-                    competition_ids_int = set()
-                    for cid in self.competition_ids:
-                        try:
-                            if isinstance(cid, int):
-                                competition_ids_int.add(cid)
-                            elif isinstance(cid, str):
-                                cid_clean = str(cid).strip()
-                                if cid_clean:
-                                    competition_ids_int.add(int(cid_clean))
-                            else:
-                                competition_ids_int.add(int(cid))
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"⚠️ Failed to convert competition_id '{cid}' (type: {type(cid)}) to int: {e}")
-                            continue
-                    
-                    # Check if competition_id is in Excel competitions list
-                    if comp_id_int not in competition_ids_int:
-                        # Log first few mismatches for debugging
-                        if len(competition_ids_int) <= 20:
-                            logger.debug(f"❌ Competition ID {comp_id_int} NOT in Excel filter {sorted(competition_ids_int)} - skipping market '{event_name}'")
-                        continue  # Skip this market - not in Excel competitions
-                    else:
-                        logger.debug(f"✅ Competition ID {comp_id_int} MATCHED in Excel filter for '{event_name}'")
-                
-                if event_id and event_id not in unique_events:
-                    # Ensure competition has ID before storing
-                    comp_id = competition_id
-                    
-                    # Make sure competition object has the ID field
-                    if competition and isinstance(competition, dict):
-                        # Ensure competition dict has "id" field
-                        if "id" not in competition or competition.get("id") != competition_id:
-                            # Create a new competition dict with ID
-                            competition = {
-                                "id": competition_id,
-                                "name": competition.get("name", competition_name)
-                            }
-                    elif not competition:
-                        # Create competition object if it doesn't exist
-                        competition = {
-                            "id": competition_id,
-                            "name": competition_name
-                        }
-                    
-                    # Make a copy of competition to avoid reference issues
-                    competition_copy = competition.copy() if isinstance(competition, dict) else competition
-                    unique_events[event_id] = {
-                        "event": event,
-                        "competition": competition_copy,
-                        "markets": []
-                    }
-                    # Debug: log competition ID when storing
-                    logger.debug(f"✅ Stored event {event_id} ({event_name}) with competition ID: {comp_id}, name: {competition.get('name') if isinstance(competition, dict) else competition_name}")
-                if event_id:
-                    unique_events[event_id]["markets"].append(market)
-        
-        return unique_events
+            logger.debug("Betfair Stream API returned %d markets before Excel filtering", len(markets))
+        competition_ids_int = self._get_competition_ids_int() if markets and self.competition_ids else None
+        return build_unique_events(markets, competition_ids_int)
     
     def log_markets(self, unique_events: Dict[str, Dict[str, Any]]):
         """
@@ -143,28 +143,109 @@ class MarketDetector:
         Args:
             unique_events: Dictionary of unique events
         """
+        # Nothing to format when INFO is disabled
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         # Log Betfair events clearly - show ALL matches EVERY iteration
         # Always log, even if 0 matches
-        betfair_msg = f"Betfair: {len(unique_events)} available matches after comparing with Excel."
-        logger.info(betfair_msg)
+        lines = [f"Betfair: {len(unique_events)} available matches after comparing with Excel."]
         
         # Show ALL events (not just first 5) - log every iteration
-        if unique_events:
-            event_list = list(unique_events.values())
-            for i, event_data in enumerate(event_list, 1):
-                event = event_data["event"]
-                event_name = event.get("name", "N/A")
-                competition_obj = event_data.get("competition", {})
-                competition_id = competition_obj.get("id", "") if isinstance(competition_obj, dict) else ""
-                competition_name = competition_obj.get("name", "N/A") if isinstance(competition_obj, dict) else "N/A"
-                market_count = len(event_data["markets"])
-                
-                # Format: ID_Name (same format as Live API)
-                if competition_id:
-                    competition_display = f"{competition_id}_{competition_name}"
-                else:
-                    competition_display = competition_name
-                
-                event_msg = f"  [{i}] {event_name} ({competition_display}) - {market_count} market(s)"
-                logger.info(event_msg)
+        for i, event_data in enumerate(unique_events.values(), 1):
+            event = event_data["event"]
+            event_name = event.get("name", "N/A")
+            competition_obj = event_data.get("competition", {})
+            competition_id = competition_obj.get("id", "") if isinstance(competition_obj, dict) else ""
+            competition_name = competition_obj.get("name", "N/A") if isinstance(competition_obj, dict) else "N/A"
+            market_count = len(event_data["markets"])
+            
+            # Format: ID_Name (same format as Live API)
+            if competition_id:
+                competition_display = f"{competition_id}_{competition_name}"
+            else:
+                competition_display = competition_name
+            
+            lines.append(f"  [{i}] {event_name} ({competition_display}) - {market_count} market(s)")
+        
+        # One logging call for the whole list (one lock acquisition / handler write)
+        logger.info("\n".join(lines))
+
+
+def _is_competition_allowed(competition_id: Any, competition_ids_int: Set[int], event_name: str) -> bool:
+    """Check a market's competition ID against the Excel competitions filter"""
+    if not competition_id:
+        # Market has no competition_id - skip it
+        return False
+    
+    # Convert competition_id to int for comparison
+    try:
+        comp_id_int = int(competition_id)
+    except (ValueError, TypeError):
+        return False
+    
+    # Check if competition_id is in Excel competitions list
+    if comp_id_int not in competition_ids_int:
+        # Log first few mismatches for debugging
+        if len(competition_ids_int) <= 20:
+            logger.debug("❌ Competition ID %s NOT in Excel filter %s - skipping market '%s'", comp_id_int, sorted(competition_ids_int), event_name)
+        return False
+    logger.debug("✅ Competition ID %s MATCHED in Excel filter for '%s'", comp_id_int, event_name)
+    return True
 
+
+def build_unique_events(markets: List[Dict[str, Any]],
+                        competition_ids_int: Optional[Set[int]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Group markets by event, keeping only competitions in the Excel filter
+    
+    Args:
+        markets: Markets from Stream API
+        competition_ids_int: Allowed competition IDs (None = no filtering)
+    
+    Returns:
+        Dictionary of unique events: {event_id: {event, competition, markets}}
+    """
+    unique_events: Dict[str, Dict[str, Any]] = {}
+    if not markets:
+        return unique_events
+    
+    # Filter verdict per competition ID (most events share a handful of competitions)
+    allowed_by_competition: Dict[Any, bool] = {}
+    
+    for market in markets:
+        event = market.get("event") or {}
+        event_id = event.get("id")
+        if not event_id:
+            continue
+        competition = market.get("competition") or {}
+        competition_id = competition.get("id")
+        
+        # Filter by competition_ids from Excel
+        if competition_ids_int is not None:
+            allowed = allowed_by_competition.get(competition_id)
+            if allowed is None:
+                allowed = allowed_by_competition[competition_id] = _is_competition_allowed(
+                    competition_id, competition_ids_int, event.get("name", "N/A")
+                )
+            if not allowed:
+                continue  # Skip this market - not in Excel competitions
+        
+        entry = unique_events.get(event_id)
+        if entry is None:
+            # Own copy of the competition object, always with an "id" field
+            if "id" in competition:
+                competition_copy = competition.copy()
+            else:
+                competition_copy = {"id": competition_id, "name": competition.get("name", "N/A")}
+            entry = unique_events[event_id] = {
+                "event": event,
+                "competition": competition_copy,
+                "markets": []
+            }
+            # Debug: log competition ID when storing
+            logger.debug("✅ Stored event %s (%s) with competition ID: %s, name: %s", event_id, event.get('name', 'N/A'),
+                         competition_id, competition_copy.get('name'))
+        entry["markets"].append(market)
+    
+    return unique_events
@@ -3,16 +3,76 @@ Matching Service
 Handles matching between Betfair events and LiveScore matches
 """
 import logging
-from pathlib import Path
-from typing import Dict, Any, List, Tuple, Set
+import time
+from functools import partial
+from typing import Dict, Any, List, Tuple, Set, Optional
 from datetime import datetime
 
 from logic.match_tracker import MatchTracker, MatchTrackerManager, MatchState
-from services.live import parse_match_score, parse_match_minute, parse_match_teams, parse_match_competition, parse_goals_timeline
+from logic.qualification import get_competition_targets
+from services.live import ParsedLiveMatch, parse_live_matches, parse_goals_timeline
+from services.tracking import SkippedMatch, UnmatchedEvent, EXCEL_PATH, excel_path_or_none
 from config.competition_mapper import get_betfair_to_live_competition_mapping
 
 logger = logging.getLogger("BetfairBot")
 
+# Rejection reasons cache: (event_name, competition_name) -> (expires_at, reason)
+# Unmatched events are re-analyzed on every pass, but the reason rarely changes within a minute
+REJECTION_REASON_TTL_SECONDS = 60
+REJECTION_REASON_CACHE_MAX_SIZE = 2048
+_rejection_reason_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+
+def get_rejection_reason(match_matcher, betfair_event: Dict[str, Any], live_matches: List[Dict[str, Any]],
+                         competition_name: str, betfair_to_live_mapping: Dict[int, str],
+                         now: Optional[float] = None) -> str:
+    """
+    Get why a Betfair event was not matched, reusing a recent analysis if available
+    
+    Args:
+        match_matcher: Match matcher instance
+        betfair_event: Betfair event (with competition)
+        live_matches: List of live matches from LiveScore API
+        competition_name: Betfair competition name
+        betfair_to_live_mapping: Betfair competition ID -> Live API competition ID mapping
+        now: time.monotonic() snapshot of the caller's matching pass (read here if None)
+    
+    Returns:
+        Rejection reason string
+    """
+    if not live_matches:
+        return "No Live API matches available"
+    if not match_matcher:
+        return "Unknown reason"
+    
+    key = (betfair_event.get("name", ""), competition_name)
+    if now is None:
+        now = time.monotonic()
+    cached = _rejection_reason_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    reason = match_matcher.analyze_rejection_reason(
+        betfair_event, live_matches, competition_name, betfair_to_live_mapping
+    )
+    
+    if len(_rejection_reason_cache) >= REJECTION_REASON_CACHE_MAX_SIZE:
+        # Drop expired entries first; if still full, start over
+        for expired_key in [k for k, (expires_at, _) in _rejection_reason_cache.items() if expires_at <= now]:
+            del _rejection_reason_cache[expired_key]
+        if len(_rejection_reason_cache) >= REJECTION_REASON_CACHE_MAX_SIZE:
+            _rejection_reason_cache.clear()
+    _rejection_reason_cache[key] = (now + REJECTION_REASON_TTL_SECONDS, reason)
+    return reason
+
+
+def log_unmatched_events(unmatched_events: List[UnmatchedEvent]):
+    """Log all unmatched events of a matching pass as one record"""
+    if not unmatched_events:
+        return
+    logger.info("⏭️  Skipping %d event(s) with no Live API match:\n%s", len(unmatched_events),
+                "\n".join(f"  - {u.event_name} ({u.competition}) - {u.reason}" for u in unmatched_events))
+
 
 class MatchingService:
     """Service for matching Betfair events with LiveScore matches"""
@@ -35,18 +95,39 @@ class MatchingService:
         self.config = config
         self.zero_zero_exception_competitions = zero_zero_exception_competitions
         self._logged_skipped_events: Set[str] = set()
+        # Inputs of the last matching pass: (event IDs, live matches list, tracked event IDs)
+        self._last_matching_inputs: Optional[Tuple[frozenset, List[Dict[str, Any]], frozenset]] = None
+        
+        # MatchTracker settings from config (read once, config doesn't change while running)
+        match_tracking_config = config.get("match_tracking", {})
+        goal_window = match_tracking_config.get("goal_detection_window", {})
+        self.tracker_settings: Dict[str, Any] = {
+            "start_minute": goal_window.get("start_minute", 60),
+            "end_minute": goal_window.get("end_minute", 74),
+            "var_check_enabled": match_tracking_config.get("var_check_enabled", True),
+            "target_over": match_tracking_config.get("target_over", None),
+            "early_discard_enabled": match_tracking_config.get("early_discard_enabled", True),
+            "strict_discard_at_60": match_tracking_config.get("strict_discard_at_60", False),
+            "discard_delay_minutes": match_tracking_config.get("discard_delay_minutes", 4),
+        }
+        
+        # MatchTracker factory with the settings above bound once (only per-event fields remain)
+        self._make_tracker = partial(
+            MatchTracker,
+            zero_zero_exception_competitions=zero_zero_exception_competitions,
+            **self.tracker_settings
+        )
         
         # Load mapping from Excel
-        project_root = Path(__file__).parent.parent.parent
-        excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
         self.betfair_to_live_mapping = {}
-        if excel_path.exists():
-            self.betfair_to_live_mapping = get_betfair_to_live_competition_mapping(str(excel_path))
+        if EXCEL_PATH.exists():
+            self.betfair_to_live_mapping = get_betfair_to_live_competition_mapping(str(EXCEL_PATH))
     
     def perform_matching(self, unique_events: Dict[str, Dict[str, Any]], 
                         live_matches: List[Dict[str, Any]],
                         iteration: int, is_refresh: bool = False,
-                        matching_refresh_interval: int = 3600) -> Tuple[int, int, List[Dict], List[Dict], List[Dict]]:
+                        matching_refresh_interval: int = 3600,
+                        parsed_by_id: Optional[Dict[str, ParsedLiveMatch]] = None) -> Tuple[int, int, List[Dict], List[SkippedMatch], List[UnmatchedEvent]]:
         """
         Perform matching between Betfair events and LiveScore matches
         
@@ -56,6 +137,7 @@ class MatchingService:
             iteration: Current iteration number
             is_refresh: Whether this is a refresh matching
             matching_refresh_interval: Matching refresh interval in seconds
+            parsed_by_id: Optional pre-parsed live matches by match ID (parsed here if None)
         
         Returns:
             Tuple of (matched_count, total_events, new_tracked_matches, skipped_matches_list, unmatched_events)
@@ -66,6 +148,23 @@ class MatchingService:
         skipped_matches_list = []
         unmatched_events = []
         
+        # Skip the pass when nothing changed since the last one: same Betfair events, same
+        # Live API list (poller returns the same cached list object between API calls) and
+        # same tracked events - matching would only repeat the previous result
+        matching_inputs = (frozenset(unique_events), live_matches, frozenset(self.match_tracker_manager.trackers))
+        last_inputs = self._last_matching_inputs
+        if (not is_refresh and last_inputs is not None
+                and matching_inputs[0] == last_inputs[0]
+                and matching_inputs[1] is last_inputs[1]
+                and matching_inputs[2] == last_inputs[2]):
+            logger.debug("Matching inputs unchanged, skipping matching pass")
+            return matched_count, total_events, new_tracked_matches, skipped_matches_list, unmatched_events
+        
+        # One clock read per pass (shared by all rejection-reason cache lookups)
+        pass_started_at = time.monotonic()
+        # Newly matched (tracker, ParsedLiveMatch) pairs, started after the loop
+        pending_trackers: List[Tuple[MatchTracker, ParsedLiveMatch]] = []
+        
         # Log refresh message if this is a refresh
         if is_refresh:
             refresh_interval_minutes = (matching_refresh_interval // 60) if matching_refresh_interval >= 60 else (matching_refresh_interval / 60)
@@ -81,7 +180,7 @@ class MatchingService:
             competition_name = competition_obj.get("name", "") if isinstance(competition_obj, dict) else ""
             betfair_event_name = betfair_event.get("name", "N/A")
             
-            logger.debug(f"Matching: {betfair_event_name}")
+            logger.debug("Matching: %s", betfair_event_name)
             
             # Check if already tracking
             tracker = self.match_tracker_manager.get_tracker(event_id)
@@ -150,12 +249,12 @@ class MatchingService:
                 
                 # Skip if no competition ID
                 if not competition_id:
-                    logger.info(f"⏭️  Skipping: No competition ID - {betfair_event_name}")
+                    logger.info("⏭️  Skipping: No competition ID - %s", betfair_event_name)
                     continue
                 
                 # Double-check: Ensure betfair_event_with_comp has competition with ID
                 if "competition" not in betfair_event_with_comp or not betfair_event_with_comp["competition"].get("id"):
-                    logger.warning(f"⚠️  Competition ID {competition_id} found but not set in betfair_event_with_comp for '{betfair_event_name}' - setting it now")
+                    logger.warning("⚠️  Competition ID %s found but not set in betfair_event_with_comp for '%s' - setting it now", competition_id, betfair_event_name)
                     betfair_event_with_comp["competition"] = {
                         "id": competition_id,
                         "name": competition_name
@@ -168,120 +267,125 @@ class MatchingService:
                 if live_match:
                     matched_count += 1
                     live_match_id = str(live_match.get("id", ""))
-                    live_home, live_away = parse_match_teams(live_match)
-                    live_comp = parse_match_competition(live_match)
-                    live_event_name = f"{live_home} v {live_away}"
-                    
-                    # Get match tracking config
-                    match_tracking_config = self.config.get("match_tracking", {})
-                    goal_window = match_tracking_config.get("goal_detection_window", {})
-                    start_minute = goal_window.get("start_minute", 60)
-                    end_minute = goal_window.get("end_minute", 74)
-                    var_check_enabled = match_tracking_config.get("var_check_enabled", True)
-                    target_over = match_tracking_config.get("target_over", None)
-                    early_discard_enabled = match_tracking_config.get("early_discard_enabled", True)
+                    if parsed_by_id is None:
+                        parsed_by_id = {p.match_id: p for p in parse_live_matches(live_matches)}
+                    parsed = parsed_by_id.get(live_match_id)
+                    if parsed is None or parsed.match is not live_match:
+                        parsed = parse_live_matches([live_match])[0]
+                    live_event_name = f"{parsed.home} v {parsed.away}"
                     
                     # Get competition name from Live API
-                    live_competition_name = parse_match_competition(live_match)
+                    live_competition_name = parsed.competition
                     tracker_competition_name = live_competition_name if live_competition_name else competition_name
                     
                     # Parse initial match data
-                    score = parse_match_score(live_match)
-                    minute = parse_match_minute(live_match)
+                    minute = parsed.minute
                     
                     # Check if match is too late to start tracking
                     if minute > 74:
                         if event_id not in self._logged_skipped_events:
-                            project_root = Path(__file__).parent.parent.parent
-                            excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
                             target_scores = []
-                            if excel_path.exists():
-                                from logic.qualification import get_competition_targets
+                            excel_path = excel_path_or_none()
+                            if excel_path:
                                 comp_id = event_data["competition"].get("id", "")
                                 comp_id_str = str(comp_id) if comp_id else None
-                                targets = get_competition_targets(tracker_competition_name, str(excel_path), competition_id=comp_id_str)
+                                targets = get_competition_targets(tracker_competition_name, excel_path, competition_id=comp_id_str)
                                 if targets:
                                     target_scores = sorted(list(targets))
                             
                             reason = f"minute {minute} > 74 (not qualified)"
-                            logger.info(f"✘ {betfair_event_name}: DISQUALIFIED - {reason}")
+                            logger.info("✘ %s: DISQUALIFIED - %s", betfair_event_name, reason)
                             self._logged_skipped_events.add(event_id)
                         continue
                     
-                    # Get strict_discard_at_60 and discard_delay_minutes from config
-                    strict_discard_at_60 = match_tracking_config.get("strict_discard_at_60", False)
-                    discard_delay_minutes = match_tracking_config.get("discard_delay_minutes", 4)
-                    
                     # Create tracker
-                    tracker = MatchTracker(
+                    tracker = self._make_tracker(
                         betfair_event_id=event_id,
                         betfair_event_name=betfair_event.get("name", "N/A"),
                         live_match_id=live_match_id,
                         competition_name=tracker_competition_name,
-                        start_minute=start_minute,
-                        end_minute=end_minute,
-                        zero_zero_exception_competitions=self.zero_zero_exception_competitions,
-                        var_check_enabled=var_check_enabled,
-                        target_over=target_over,
-                        early_discard_enabled=early_discard_enabled,
-                        strict_discard_at_60=strict_discard_at_60,
-                        discard_delay_minutes=discard_delay_minutes,
                         live_event_name=live_event_name
                     )
                     
-                    # Get goals from events endpoint if match is in monitoring window
-                    goals = []
-                    if minute >= start_minute or minute >= 60:
-                        if self.live_score_client:
-                            events_data = self.live_score_client.get_match_details(live_match_id)
-                            if events_data:
-                                goals = parse_goals_timeline(events_data)
-                            else:
-                                goals = parse_goals_timeline(live_match)
-                    else:
-                        goals = parse_goals_timeline(live_match)
-                    
-                    tracker.update_match_data(score, minute, goals)
-                    
-                    # Get Excel path for early discard check
-                    project_root = Path(__file__).parent.parent.parent
-                    excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
-                    
-                    tracker.update_state(excel_path=str(excel_path) if excel_path.exists() else None)
-                    
-                    # Check if tracker was immediately disqualified
-                    if tracker.state == MatchState.DISQUALIFIED:
-                        continue
-                    
-                    # Add to manager
-                    self.match_tracker_manager.add_tracker(tracker)
-                    
-                    # Collect match info for batch logging
-                    new_tracked_matches.append({
-                        "name": tracker.betfair_event_name,
-                        "live_name": tracker.live_event_name,
-                        "minute": minute,
-                        "score": score,
-                        "competition": tracker_competition_name,
-                        "excel_path": str(excel_path) if excel_path.exists() else None
-                    })
+                    # Initial data/state is applied after the loop, once goal timelines
+                    # for all new matches in the monitoring window are fetched together
+                    pending_trackers.append((tracker, parsed))
                 else:
                     # Analyze rejection reason
-                    rejection_reason = "Unknown reason"
-                    if self.match_matcher and live_matches:
-                        rejection_reason = self.match_matcher.analyze_rejection_reason(
-                            betfair_event_with_comp, live_matches, competition_name, self.betfair_to_live_mapping
-                        )
-                    elif not live_matches:
-                        rejection_reason = "No Live API matches available"
-                    
-                    logger.info(f"⏭️  Skipping: No Live API match - {betfair_event_name} ({competition_name}) - {rejection_reason}")
+                    rejection_reason = get_rejection_reason(
+                        self.match_matcher, betfair_event_with_comp, live_matches,
+                        competition_name, self.betfair_to_live_mapping, now=pass_started_at
+                    )
                     
-                    unmatched_events.append({
-                        "event_name": betfair_event_name,
-                        "competition": competition_name,
-                        "reason": rejection_reason
-                    })
+                    unmatched_events.append(UnmatchedEvent(betfair_event_name, competition_name, rejection_reason))
+        
+        if pending_trackers:
+            new_tracked_matches.extend(self._start_pending_trackers(pending_trackers))
+        
+        log_unmatched_events(unmatched_events)
+        
+        # Remember inputs including trackers created by this pass
+        self._last_matching_inputs = (matching_inputs[0], live_matches, frozenset(self.match_tracker_manager.trackers))
         
         return matched_count, total_events, new_tracked_matches, skipped_matches_list, unmatched_events
-
+    
+    def _start_pending_trackers(self, pending_trackers: List[Tuple[MatchTracker, ParsedLiveMatch]]) -> List[Dict[str, Any]]:
+        """
+        Apply initial match data/state to newly matched trackers and add the ones still in play
+        
+        Goal timelines for matches already in the monitoring window are fetched in one
+        parallel batch instead of one request per matched event.
+        
+        Args:
+            pending_trackers: (tracker, parsed live match) pairs created by perform_matching
+        
+        Returns:
+            Match info dicts of the trackers added (for batch logging)
+        """
+        window_start = min(self.tracker_settings["start_minute"], 60)
+        details_by_id = {}
+        if self.live_score_client:
+            ids_to_fetch = [tracker.live_match_id for tracker, parsed in pending_trackers
+                            if parsed.minute >= window_start]
+            if ids_to_fetch:
+                try:
+                    details_by_id = self.live_score_client.get_match_details_batch(ids_to_fetch)
+                except Exception as e:
+                    logger.warning(f"Error fetching match details: {str(e)}")
+        
+        excel_path = excel_path_or_none()
+        new_tracked_matches = []
+        for tracker, parsed in pending_trackers:
+            # Get goals from events endpoint if match is in monitoring window
+            goals = []
+            if parsed.minute >= window_start:
+                if self.live_score_client:
+                    events_data = details_by_id.get(tracker.live_match_id)
+                    if events_data:
+                        goals = parse_goals_timeline(events_data)
+                    else:
+                        goals = parse_goals_timeline(parsed.match)
+            else:
+                goals = parse_goals_timeline(parsed.match)
+            
+            tracker.update_match_data(parsed.score, parsed.minute, goals)
+            
+            tracker.update_state(excel_path=excel_path)
+            
+            # Check if tracker was immediately disqualified
+            if tracker.state == MatchState.DISQUALIFIED:
+                continue
+            
+            # Add to manager
+            self.match_tracker_manager.add_tracker(tracker)
+            
+            # Collect match info for batch logging
+            new_tracked_matches.append({
+                "name": tracker.betfair_event_name,
+                "live_name": tracker.live_event_name,
+                "minute": parsed.minute,
+                "score": parsed.score,
+                "competition": tracker.competition_name,
+                "excel_path": excel_path
+            })
+        return new_tracked_matches
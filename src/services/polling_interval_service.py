@@ -3,7 +3,9 @@ Polling Interval Service
 Calculates dynamic polling intervals based on match states
 """
 import logging
-from typing import List
+import math
+from datetime import datetime
+from typing import List, Optional, Tuple
 from logic.match_tracker import MatchState, MatchTrackerManager
 
 logger = logging.getLogger("BetfairBot")
@@ -13,7 +15,11 @@ class PollingIntervalService:
     """Service for calculating polling intervals"""
     
     def __init__(self, default_interval: int = 60, intensive_interval: int = 10, 
-                 fast_interval: int = 1, fast_polling_enabled: bool = True):
+                 fast_interval: int = 1, fast_polling_enabled: bool = True,
+                 idle_backoff_enabled: bool = True, idle_iterations_per_step: int = 5,
+                 max_idle_multiplier: int = 8, quiet_hours: Optional[Tuple[int, int]] = None,
+                 idle_backoff_base: float = 0.0, max_idle_interval: Optional[float] = None,
+                 live_idle_interval: Optional[int] = None):
         """
         Initialize Polling Interval Service
         
@@ -22,11 +28,35 @@ class PollingIntervalService:
             intensive_interval: Intensive polling interval in seconds (10s)
             fast_interval: Fast polling interval in seconds (1s)
             fast_polling_enabled: Whether fast polling is enabled
+            idle_backoff_enabled: Whether to slow down Betfair polling while nothing is live
+            idle_iterations_per_step: Idle iterations before the interval multiplier grows by 1
+            max_idle_multiplier: Maximum multiplier applied to the interval while idle
+            quiet_hours: Optional (start_hour, end_hour) local time window where idle polling
+                         jumps straight to the maximum multiplier (e.g. (3, 8))
+            idle_backoff_base: Growth factor per idle iteration (e.g. 1.3); values <= 1 keep
+                               the stepwise multiplier driven by idle_iterations_per_step
+            max_idle_interval: Optional cap in seconds on the idle polling interval
+            live_idle_interval: Live API interval in seconds while no tracker is near the
+                                goal window (defaults to default_interval)
         """
         self.default_interval = default_interval
         self.intensive_interval = intensive_interval
         self.fast_interval = fast_interval
         self.fast_polling_enabled = fast_polling_enabled
+        self.idle_backoff_enabled = idle_backoff_enabled
+        self.idle_iterations_per_step = max(1, idle_iterations_per_step)
+        self.max_idle_multiplier = max(1, max_idle_multiplier)
+        self.quiet_hours = quiet_hours
+        self.idle_backoff_base = idle_backoff_base
+        # Idle iterations after which the geometric multiplier reaches max_idle_multiplier
+        # (the exponent is clamped there, so a long idle period can't overflow the float power)
+        self.max_idle_exponent = (math.ceil(math.log(self.max_idle_multiplier, idle_backoff_base))
+                                  if idle_backoff_base > 1 else 0)
+        self.max_idle_interval = max_idle_interval
+        self.live_idle_interval = max(default_interval, live_idle_interval or default_interval)
+        # A WAITING_60 tracker this many minutes before 60' ends the idle Live API interval
+        self.live_idle_lead_minutes = math.ceil(self.live_idle_interval / 60)
+        self.idle_iterations = 0
     
     def calculate_live_api_interval(self, match_tracker_manager: MatchTrackerManager) -> int:
         """
@@ -36,6 +66,7 @@ class PollingIntervalService:
         - 0-60: 60s
         - 60-74 (all matches, regardless of QUALIFIED): 10s
         - 74-76 with QUALIFIED/READY_FOR_BET: 10s
+        - No tracker, or only WAITING_60 trackers more than one idle interval before 60': idle interval
         
         Args:
             match_tracker_manager: Match tracker manager
@@ -46,34 +77,35 @@ class PollingIntervalService:
         if not match_tracker_manager:
             return self.default_interval
         
-        all_trackers = match_tracker_manager.get_all_trackers()
-        
-        # Check for matches in 60-74 range (MONITORING_60_74 or QUALIFIED)
-        matches_in_60_74 = [
-            t for t in all_trackers
-            if 60 <= t.current_minute < 74
-            and (t.state == MatchState.MONITORING_60_74 or t.state == MatchState.QUALIFIED)
-            and t.state != MatchState.FINISHED
-            and t.state != MatchState.DISQUALIFIED
-        ]
-        
-        # Check for QUALIFIED/READY_FOR_BET matches in 74-76 range
-        qualified_in_74_76 = [
-            t for t in all_trackers
-            if 74 <= t.current_minute < 76
-            and (t.state == MatchState.QUALIFIED or t.state == MatchState.READY_FOR_BET)
-            and t.state != MatchState.FINISHED
-            and t.state != MatchState.DISQUALIFIED
-        ]
+        # Single pass: matches in 60-74 (MONITORING_60_74 or QUALIFIED),
+        # QUALIFIED/READY_FOR_BET matches in 74-76, and whether any tracker needs timely updates
+        monitoring, qualified, ready = MatchState.MONITORING_60_74, MatchState.QUALIFIED, MatchState.READY_FOR_BET
+        waiting = MatchState.WAITING_60
+        idle_until_minute = 60 - self.live_idle_lead_minutes
+        matches_in_60_74 = 0
+        qualified_in_74_76 = 0
+        needs_updates = False
+        for t in match_tracker_manager.iter_active():
+            state = t.state
+            minute = t.current_minute
+            if 60 <= minute < 74 and (state is monitoring or state is qualified):
+                matches_in_60_74 += 1
+            elif 74 <= minute < 76 and (state is qualified or state is ready):
+                qualified_in_74_76 += 1
+            if not (state is waiting and minute < idle_until_minute):
+                needs_updates = True
         
         # Determine Live API polling interval
         if matches_in_60_74 or qualified_in_74_76:
             # Has matches in 60-74 (all states) or QUALIFIED/READY_FOR_BET in 74-76: use 10s
             if matches_in_60_74:
-                logger.debug(f"Intensive polling active: {len(matches_in_60_74)} match(es) in 60'-74' window (MONITORING_60_74 or QUALIFIED) - using 10s interval")
+                logger.debug("Intensive polling active: %d match(es) in 60'-74' window (MONITORING_60_74 or QUALIFIED) - using 10s interval", matches_in_60_74)
             if qualified_in_74_76:
-                logger.debug(f"Intensive polling active: {len(qualified_in_74_76)} QUALIFIED/READY_FOR_BET match(es) in 74'-76' window - using 10s interval")
+                logger.debug("Intensive polling active: %d QUALIFIED/READY_FOR_BET match(es) in 74'-76' window - using 10s interval", qualified_in_74_76)
             return self.intensive_interval
+        elif not needs_updates:
+            # Nothing tracked close to the goal window: poll the Live API slowly
+            return self.live_idle_interval
         else:
             # No matches in 60-74 or QUALIFIED/READY_FOR_BET in 74-76: use 60s
             return self.default_interval
@@ -97,34 +129,80 @@ class PollingIntervalService:
         if not match_tracker_manager:
             return self.default_interval
         
-        all_trackers = match_tracker_manager.get_all_trackers()
-        
-        # Check for QUALIFIED matches in different minute ranges
-        qualified_in_60_74 = [
-            t for t in all_trackers
-            if 60 <= t.current_minute < 74
-            and t.state == MatchState.QUALIFIED
-            and t.state != MatchState.FINISHED
-        ]
-        
-        qualified_in_74_76 = [
-            t for t in all_trackers
-            if 74 <= t.current_minute < 76
-            and (t.state == MatchState.QUALIFIED or t.state == MatchState.READY_FOR_BET)
-            and t.state != MatchState.FINISHED
-            and not t.bet_placed
-            and not getattr(t, 'bet_skipped', False)
-        ]
+        # Single pass: QUALIFIED matches in 60-74, and QUALIFIED/READY_FOR_BET matches
+        # in 74-76 that still need a bet decision
+        qualified, ready = MatchState.QUALIFIED, MatchState.READY_FOR_BET
+        qualified_in_60_74 = 0
+        qualified_in_74_76 = 0
+        for t in match_tracker_manager.trackers.values():
+            state = t.state
+            minute = t.current_minute
+            if 60 <= minute < 74:
+                if state is qualified:
+                    qualified_in_60_74 += 1
+            elif (74 <= minute < 76 and (state is qualified or state is ready)
+                  and not t.bet_placed and not getattr(t, 'bet_skipped', False)):
+                qualified_in_74_76 += 1
         
         if qualified_in_74_76 and self.fast_polling_enabled:
             # Has QUALIFIED in 74-76: use 1s for Betfair
-            logger.debug(f"Fast polling active: {len(qualified_in_74_76)} QUALIFIED match(es) in 74'-76' window")
+            logger.debug("Fast polling active: %d QUALIFIED match(es) in 74'-76' window", qualified_in_74_76)
             return self.fast_interval
         elif qualified_in_60_74:
             # Has QUALIFIED in 60-74: use 10s for Betfair
-            logger.debug(f"Intensive polling active: {len(qualified_in_60_74)} QUALIFIED match(es) in 60'-74' window")
+            logger.debug("Intensive polling active: %d QUALIFIED match(es) in 60'-74' window", qualified_in_60_74)
             return self.intensive_interval
         else:
             # No QUALIFIED: use 60s for Betfair (0-60 or 60-74 without QUALIFIED)
             return self.default_interval
-
+    
+    def _in_quiet_hours(self) -> bool:
+        """Check if current local time is within the configured quiet hours"""
+        if not self.quiet_hours:
+            return False
+        start_hour, end_hour = self.quiet_hours
+        hour = datetime.now().hour
+        if start_hour <= end_hour:
+            return start_hour <= hour < end_hour
+        # Window wraps around midnight (e.g. 23 -> 6)
+        return hour >= start_hour or hour < end_hour
+    
+    def apply_idle_backoff(self, interval: int, has_activity: bool) -> int:
+        """
+        Stretch the Betfair polling interval while no live events/trackers exist
+        
+        Rules:
+        - Any live event or tracker: reset, use interval as is
+        - Idle: multiply by idle_backoff_base ** idle_iterations when a base > 1 is set,
+          otherwise by 1 + idle_iterations // idle_iterations_per_step (capped)
+        - Idle during quiet hours: use the maximum multiplier
+        - The result never exceeds max_idle_interval (when set)
+        
+        Args:
+            interval: Interval from calculate_betfair_interval
+            has_activity: Whether this iteration found live events or active trackers
+        
+        Returns:
+            Polling interval in seconds
+        """
+        if has_activity or not self.idle_backoff_enabled:
+            if self.idle_iterations >= self.idle_iterations_per_step or (self.idle_backoff_base > 1 and self.idle_iterations):
+                logger.info("Live events detected - back to normal polling interval")
+            self.idle_iterations = 0
+            return interval
+        
+        self.idle_iterations += 1
+        if self._in_quiet_hours():
+            multiplier = self.max_idle_multiplier
+        elif self.idle_backoff_base > 1:
+            exponent = min(self.idle_iterations, self.max_idle_exponent)
+            multiplier = min(self.max_idle_multiplier, self.idle_backoff_base ** exponent)
+        else:
+            multiplier = min(self.max_idle_multiplier, 1 + self.idle_iterations // self.idle_iterations_per_step)
+        
+        idle_interval = interval * multiplier
+        if self.max_idle_interval:
+            idle_interval = max(interval, min(idle_interval, self.max_idle_interval))
+        if idle_interval > interval:
+            logger.debug("Idle polling: no live events for %d iteration(s) - waiting %.1fs", self.idle_iterations, idle_interval)
+        return idle_interval
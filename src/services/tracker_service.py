@@ -3,13 +3,45 @@ Tracker Service
 Handles tracker updates and state management
 """
 import logging
-from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from logic.match_tracker import MatchTrackerManager, MatchState
-from services.live import parse_match_score, parse_match_minute, parse_goals_timeline
+from services.live import ParsedLiveMatch, parse_live_matches, parse_goals_timeline
+from services.tracking import EXCEL_PATH, excel_path_or_none
+from core.logging_setup import console_print
 
 logger = logging.getLogger("BetfairBot")
 
+# State transitions announced on log/console: state -> (icon, label)
+STATE_ANNOUNCEMENTS = {
+    MatchState.QUALIFIED: ("✓", "QUALIFIED"),
+    MatchState.READY_FOR_BET: ("🎯", "READY FOR BET"),
+}
+
+
+def announce_state_change(tracker, old_state: MatchState) -> bool:
+    """
+    Log and print a tracker state transition if it is one worth announcing
+    
+    Args:
+        tracker: MatchTracker instance (after update_state)
+        old_state: State before the update
+    
+    Returns:
+        True if the transition was announced, False otherwise
+    """
+    if tracker.state == old_state:
+        return False
+    announcement = STATE_ANNOUNCEMENTS.get(tracker.state)
+    if announcement is None:
+        return False
+    
+    icon, label = announcement
+    headline = f"{icon} {label}: {tracker.betfair_event_name}"
+    reason = f" - {tracker.qualification_reason}" if tracker.state == MatchState.QUALIFIED else ""
+    logger.info("%s (min %s, score %s)%s", headline, tracker.current_minute, tracker.current_score, reason)
+    console_print(f"  {headline}{reason}")
+    return True
+
 
 class TrackerService:
     """Service for updating and managing trackers"""
@@ -25,18 +57,18 @@ class TrackerService:
         self.match_tracker_manager = match_tracker_manager
         self.live_score_client = live_score_client
         
-        # Get Excel path
-        project_root = Path(__file__).parent.parent.parent
-        self.excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
+        self.excel_path = EXCEL_PATH
     
     def update_trackers(self, live_matches: List[Dict[str, Any]], 
-                       fetch_goals_for_states: List[MatchState] = None) -> List[Dict[str, Any]]:
+                       fetch_goals_for_states: List[MatchState] = None,
+                       parsed_by_id: Optional[Dict[str, ParsedLiveMatch]] = None) -> List[Dict[str, Any]]:
         """
         Update all trackers with latest Live API data
         
         Args:
             live_matches: List of live matches from cache or API
             fetch_goals_for_states: List of states that need fresh goals data
+            parsed_by_id: Optional pre-parsed live matches by match ID (parsed here if None)
         
         Returns:
             List of trackers that changed state
@@ -47,32 +79,54 @@ class TrackerService:
         if fetch_goals_for_states is None:
             fetch_goals_for_states = [MatchState.MONITORING_60_74, MatchState.QUALIFIED, MatchState.READY_FOR_BET]
         
-        all_trackers = self.match_tracker_manager.get_all_trackers()
+        # FINISHED/DISQUALIFIED trackers (without a bet) can't change state anymore
+        all_trackers = list(self.match_tracker_manager.iter_active())
         state_changes = []
         
         if all_trackers:
+            if parsed_by_id is None:
+                parsed_by_id = {p.match_id: p for p in parse_live_matches(live_matches)}
+            
+            # Fetch goal timelines for all trackers that need them in one parallel batch.
+            # Trackers whose (minute, score) hasn't moved since their last fetch reuse their goals.
+            details_by_id = {}
+            if self.live_score_client:
+                ids_to_fetch = []
+                for t in all_trackers:
+                    if t.state not in fetch_goals_for_states:
+                        continue
+                    p = parsed_by_id.get(t.live_match_id)
+                    if p and (p.minute, p.score) != t.details_key:
+                        ids_to_fetch.append(t.live_match_id)
+                if ids_to_fetch:
+                    try:
+                        details_by_id = self.live_score_client.get_match_details_batch(ids_to_fetch)
+                    except Exception as e:
+                        logger.warning(f"Error fetching match details: {str(e)}")
+            
+            excel_path_str = excel_path_or_none()
             for tracker in all_trackers:
                 try:
                     # Find matching live match from cache
-                    live_match = None
-                    for lm in live_matches:
-                        if str(lm.get("id", "")) == tracker.live_match_id:
-                            live_match = lm
-                            break
+                    parsed = parsed_by_id.get(tracker.live_match_id)
                     
-                    if live_match:
+                    if parsed:
                         # Update match data from cached live_match
-                        score = parse_match_score(live_match)
-                        minute = parse_match_minute(live_match)
+                        live_match = parsed.match
+                        score = parsed.score
+                        minute = parsed.minute
                         
                         # Get goals - fetch fresh if in important states
                         goals = []
                         if tracker.state in fetch_goals_for_states:
                             # Fetch events to get goals timeline
                             if self.live_score_client:
-                                events_data = self.live_score_client.get_match_details(tracker.live_match_id)
+                                events_data = details_by_id.get(tracker.live_match_id)
                                 if events_data:
                                     goals = parse_goals_timeline(events_data)
+                                    tracker.details_key = (minute, score)
+                                elif (minute, score) == tracker.details_key:
+                                    goals = tracker.goals
                                 else:
                                     goals = parse_goals_timeline(live_match)
                         else:
@@ -84,23 +138,12 @@ class TrackerService:
                         tracker.update_match_data(score, minute, goals)
                         
                         # Update state
-                        excel_path_str = str(self.excel_path) if self.excel_path.exists() else None
                         if not excel_path_str:
                             logger.warning(f"⚠️ Excel path not available for tracker '{tracker.betfair_event_name}' - discard logic will not run")
                         tracker.update_state(excel_path=excel_path_str)
                         
                         # Log status changes
-                        if tracker.state == MatchState.QUALIFIED and old_state != MatchState.QUALIFIED:
-                            logger.info(f"✓ QUALIFIED: {tracker.betfair_event_name} (min {tracker.current_minute}, score {tracker.current_score}) - {tracker.qualification_reason}")
-                            print(f"  ✓ QUALIFIED: {tracker.betfair_event_name} - {tracker.qualification_reason}")
-                            state_changes.append({
-                                "tracker": tracker,
-                                "old_state": old_state,
-                                "new_state": tracker.state
-                            })
-                        elif tracker.state == MatchState.READY_FOR_BET and old_state != MatchState.READY_FOR_BET:
-                            logger.info(f"🎯 READY FOR BET: {tracker.betfair_event_name} (min {tracker.current_minute}, score {tracker.current_score})")
-                            print(f"  🎯 READY FOR BET: {tracker.betfair_event_name}")
+                        if announce_state_change(tracker, old_state):
                             state_changes.append({
                                 "tracker": tracker,
                                 "old_state": old_state,
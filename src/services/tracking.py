@@ -3,13 +3,31 @@ Tracking Services Module
 Consolidated tracking services: Bet Tracker, Excel Writer, Skipped Matches Writer
 """
 import logging
+import threading
 import pandas as pd
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, AbstractSet
 from datetime import datetime
 
+from logic.match_tracker import MatchState
+from logic.qualification import get_competition_targets
+
 logger = logging.getLogger("BetfairBot")
 
+# Project paths are invariant - resolve them once at import (whether the competitions
+# Excel exists is checked by callers, since it may be created while the bot runs)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+COMPETITIONS_DIR = PROJECT_ROOT / "competitions"
+EXCEL_PATH = COMPETITIONS_DIR / "Competitions_Results_Odds_Stake.xlsx"
+SKIPPED_MATCHES_PATH = COMPETITIONS_DIR / "Skipped Matches.xlsx"
+EXCEL_PATH_STR = str(EXCEL_PATH)
+
+
+def excel_path_or_none() -> Optional[str]:
+    """Competitions Excel path as a string, or None if the file doesn't exist (yet)"""
+    return EXCEL_PATH_STR if EXCEL_PATH.exists() else None
+
 
 # ============================================================================
 # BET RECORD
@@ -18,6 +36,14 @@ logger = logging.getLogger("BetfairBot")
 class BetRecord:
     """Represents a single bet record"""
     
+    __slots__ = (
+        "bet_id", "match_id", "competition", "market_name", "selection", "odds", "stake",
+        "bet_time", "bankroll_before", "match_name", "minute_of_entry", "live_score_at_entry",
+        "target_score_used", "best_back_under_x5", "reference_odds_under_x5", "best_lay_over_x5",
+        "final_lay_price", "spread_ticks", "liability_percent", "liability_amount",
+        "outcome", "profit_loss", "bankroll_after", "settled_at", "status"
+    )
+    
     def __init__(self, bet_id: str, match_id: str, competition: str,
                  market_name: str, selection: str, odds: float, stake: float,
                  bet_time: datetime, bankroll_before: float,
@@ -70,6 +96,16 @@ class BetRecord:
         
         logger.info(f"Bet {self.bet_id} settled: {outcome}, P/L: {profit_loss:.2f}")
     
+    def to_settlement_update(self) -> Dict[str, Any]:
+        """Excel columns that change when the bet is settled (same values as to_dict)"""
+        return {
+            "Outcome": self.outcome or "Pending",
+            "Profit_Loss": self.profit_loss if self.profit_loss is not None else 0.0,
+            "Updated_Bankroll": self.bankroll_after if self.bankroll_after is not None else self.bankroll_before,
+            "Status": self.status,
+            "Settled_At": self.settled_at if self.settled_at else None
+        }
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Excel export"""
         return {
@@ -260,72 +296,126 @@ class BetTracker:
 # EXCEL WRITER
 # ============================================================================
 
+# Bet log columns (order of a newly created file)
+BET_RECORD_COLUMNS = (
+    "Bet_ID", "Match_ID", "Match", "Competition",
+    "Minute_of_Entry", "Live_Score_at_Entry", "Target_Score_Used",
+    "Market_Name", "Selection",
+    "Best_BACK_Under_X5", "Reference_Under_X5_Odds",
+    "Best_LAY_Over_X5", "Final_LAY_Price",
+    "Spread_Ticks", "Liability_Percent", "Liability_Amount",
+    "Lay_Stake", "Odds",
+    "Bet_Time", "Starting_Bankroll",
+    "Outcome", "Profit_Loss", "Updated_Bankroll",
+    "Status", "Settled_At"
+)
+
+
 class ExcelWriter:
     """Writes bet tracking data to Excel file"""
     
     def __init__(self, excel_path: str):
         self.excel_path = Path(excel_path)
         self.excel_path.parent.mkdir(parents=True, exist_ok=True)
+        # Last written/read contents, reused while the file is unchanged on disk
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_mtime: Optional[int] = None
+        # Writes may come from the polling loop and the ExcelWriteQueue worker
+        self._lock = threading.RLock()
+    
+    def _file_mtime(self) -> Optional[int]:
+        """Modification time of the Excel file (None if it doesn't exist)"""
+        try:
+            return self.excel_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _load_frame(self) -> pd.DataFrame:
+        """Get the bet log, re-reading the file only if it changed since the last read/write"""
+        mtime = self._file_mtime()
+        if self._frame is None or mtime != self._frame_mtime:
+            if mtime is None:
+                self._frame = pd.DataFrame(columns=list(BET_RECORD_COLUMNS))
+            else:
+                self._frame = pd.read_excel(self.excel_path)
+            self._frame_mtime = mtime
+        return self._frame
+    
+    def _save_frame(self, df: pd.DataFrame):
+        """Write the bet log and keep it as the cached copy"""
+        # Drop the cache first so a failed write can't leave it out of sync with the file
+        self._frame = None
+        
+        if 'Bet_Time' in df.columns:
+            df['Bet_Time'] = pd.to_datetime(df['Bet_Time'], errors='coerce')
+        if 'Settled_At' in df.columns:
+            df['Settled_At'] = pd.to_datetime(df['Settled_At'], errors='coerce')
+            df['Settled_At'] = df['Settled_At'].where(pd.notna(df['Settled_At']), None)
+        
+        with pd.ExcelWriter(self.excel_path, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, sheet_name='Sheet1')
+            worksheet = writer.sheets['Sheet1']
+            if 'Bet_Time' in df.columns:
+                worksheet.column_dimensions['H'].width = 20
+            if 'Settled_At' in df.columns:
+                worksheet.column_dimensions['N'].width = 20
+        
+        self._frame = df
+        self._frame_mtime = self._file_mtime()
     
     def write_bet_record(self, bet_record):
         """Write a bet record to Excel"""
-        if hasattr(bet_record, 'to_dict'):
-            bet_record = bet_record.to_dict()
-        self.append_bet_record(bet_record)
+        self.write_bet_records([bet_record])
+    
+    def write_bet_records(self, bet_records: List[Any]):
+        """
+        Write several bet records (BetRecord or dict) to Excel with a single save
+        
+        Args:
+            bet_records: Bet records to append
+        """
+        self.append_bet_records([r.to_dict() if hasattr(r, 'to_dict') else r for r in bet_records])
     
     def append_bet_record(self, bet_record: Dict[str, Any]):
         """Append a bet record to Excel file"""
+        self.append_bet_records([bet_record])
+    
+    def append_bet_records(self, bet_records: List[Dict[str, Any]]):
+        """
+        Append several bet records to the Excel file with a single save
+        
+        Args:
+            bet_records: Bet record dictionaries (column -> value)
+        """
+        if not bet_records:
+            return
+        
         try:
-            if self.excel_path.exists():
-                df = pd.read_excel(self.excel_path)
-            else:
-                df = pd.DataFrame(columns=[
-                    "Bet_ID", "Match_ID", "Match", "Competition",
-                    "Minute_of_Entry", "Live_Score_at_Entry", "Target_Score_Used",
-                    "Market_Name", "Selection",
-                    "Best_BACK_Under_X5", "Reference_Under_X5_Odds",
-                    "Best_LAY_Over_X5", "Final_LAY_Price",
-                    "Spread_Ticks", "Liability_Percent", "Liability_Amount",
-                    "Lay_Stake", "Odds",
-                    "Bet_Time", "Starting_Bankroll",
-                    "Outcome", "Profit_Loss", "Updated_Bankroll",
-                    "Status", "Settled_At"
-                ])
+            with self._lock:
+                df = self._load_frame()
+                
+                for bet_record in bet_records:
+                    if 'Bet_Time' in bet_record:
+                        if isinstance(bet_record['Bet_Time'], str):
+                            try:
+                                bet_record['Bet_Time'] = pd.to_datetime(bet_record['Bet_Time'])
+                            except:
+                                pass
+                    
+                    if 'Settled_At' in bet_record:
+                        if isinstance(bet_record['Settled_At'], str) and bet_record['Settled_At']:
+                            try:
+                                bet_record['Settled_At'] = pd.to_datetime(bet_record['Settled_At'])
+                            except:
+                                pass
+                        elif bet_record.get('Settled_At') == '' or bet_record.get('Settled_At') is None:
+                            bet_record['Settled_At'] = None
+                
+                new_rows = pd.DataFrame(bet_records)
+                df = pd.concat([df, new_rows], ignore_index=True)
+                self._save_frame(df)
             
-            if 'Bet_Time' in bet_record:
-                if isinstance(bet_record['Bet_Time'], str):
-                    try:
-                        bet_record['Bet_Time'] = pd.to_datetime(bet_record['Bet_Time'])
-                    except:
-                        pass
-            
-            if 'Settled_At' in bet_record:
-                if isinstance(bet_record['Settled_At'], str) and bet_record['Settled_At']:
-                    try:
-                        bet_record['Settled_At'] = pd.to_datetime(bet_record['Settled_At'])
-                    except:
-                        pass
-                elif bet_record.get('Settled_At') == '' or bet_record.get('Settled_At') is None:
-                    bet_record['Settled_At'] = None
-            
-            new_row = pd.DataFrame([bet_record])
-            df = pd.concat([df, new_row], ignore_index=True)
-            
-            if 'Bet_Time' in df.columns:
-                df['Bet_Time'] = pd.to_datetime(df['Bet_Time'], errors='coerce')
-            if 'Settled_At' in df.columns:
-                df['Settled_At'] = pd.to_datetime(df['Settled_At'], errors='coerce')
-                df['Settled_At'] = df['Settled_At'].where(pd.notna(df['Settled_At']), None)
-            
-            with pd.ExcelWriter(self.excel_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Sheet1')
-                worksheet = writer.sheets['Sheet1']
-                if 'Bet_Time' in df.columns:
-                    worksheet.column_dimensions['H'].width = 20
-                if 'Settled_At' in df.columns:
-                    worksheet.column_dimensions['N'].width = 20
-            
-            logger.info(f"Bet record appended to Excel: {bet_record.get('Bet_ID', 'N/A')}")
+            logger.info(f"Bet record(s) appended to Excel: {', '.join(str(r.get('Bet_ID', 'N/A')) for r in bet_records)}")
             
         except Exception as e:
             logger.error(f"Error appending bet record to Excel: {str(e)}")
@@ -338,30 +428,19 @@ class ExcelWriter:
                 logger.warning(f"Excel file not found: {self.excel_path}")
                 return
             
-            df = pd.read_excel(self.excel_path)
-            
-            mask = df['Bet_ID'] == bet_id
-            if not mask.any():
-                logger.warning(f"Bet ID {bet_id} not found in Excel file")
-                return
-            
-            for key, value in updates.items():
-                if key in df.columns:
-                    df.loc[mask, key] = value
-            
-            if 'Bet_Time' in df.columns:
-                df['Bet_Time'] = pd.to_datetime(df['Bet_Time'], errors='coerce')
-            if 'Settled_At' in df.columns:
-                df['Settled_At'] = pd.to_datetime(df['Settled_At'], errors='coerce')
-                df['Settled_At'] = df['Settled_At'].where(pd.notna(df['Settled_At']), None)
-            
-            with pd.ExcelWriter(self.excel_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Sheet1')
-                worksheet = writer.sheets['Sheet1']
-                if 'Bet_Time' in df.columns:
-                    worksheet.column_dimensions['H'].width = 20
-                if 'Settled_At' in df.columns:
-                    worksheet.column_dimensions['N'].width = 20
+            with self._lock:
+                df = self._load_frame()
+                
+                mask = df['Bet_ID'] == bet_id
+                if not mask.any():
+                    logger.warning(f"Bet ID {bet_id} not found in Excel file")
+                    return
+                
+                for key, value in updates.items():
+                    if key in df.columns:
+                        df.loc[mask, key] = value
+                
+                self._save_frame(df)
             
             logger.info(f"Bet record updated in Excel: {bet_id}")
             
@@ -412,6 +491,35 @@ class ExcelWriter:
             return pd.DataFrame()
 
 
+# ============================================================================
+# SKIPPED / UNMATCHED RECORDS
+# ============================================================================
+
+@dataclass(slots=True)
+class SkippedMatch:
+    """A match skipped at bet time (console display + Skipped Matches Excel)"""
+    match_name: str
+    reason: str = "Unknown reason"
+    competition: str = ""
+    minute: Union[int, str] = ""
+    minute_75_score: str = ""
+    targets_list: AbstractSet[str] = frozenset()
+    status: str = ""
+    timestamp: datetime = field(default_factory=datetime.now)
+    best_back: Optional[float] = None
+    best_lay: Optional[float] = None
+    spread_ticks: Optional[int] = None
+    current_odds: Optional[float] = None
+
+
+@dataclass(slots=True)
+class UnmatchedEvent:
+    """A Betfair event that could not be matched to a Live API match"""
+    event_name: str
+    competition: str
+    reason: str
+
+
 # ============================================================================
 # SKIPPED MATCHES WRITER
 # ============================================================================
@@ -423,8 +531,52 @@ class SkippedMatchesWriter:
         self.excel_path = Path(excel_path)
         self.excel_path.parent.mkdir(parents=True, exist_ok=True)
     
-    def write_skipped_match(self, skipped_data: Dict[str, Any]):
+    def write_skipped_match(self, skipped: SkippedMatch):
         """Write a skipped match record to Excel file"""
+        self.write_skipped_matches([skipped])
+    
+    @staticmethod
+    def _to_row(skipped: SkippedMatch) -> Dict[str, Any]:
+        """Build the Excel row for a skipped match"""
+        timestamp = skipped.timestamp
+        if isinstance(timestamp, str):
+            try:
+                timestamp = pd.to_datetime(timestamp)
+            except:
+                timestamp = datetime.now()
+        elif not isinstance(timestamp, datetime):
+            timestamp = datetime.now()
+        
+        date_str = timestamp.strftime("%Y-%m-%d") if isinstance(timestamp, datetime) else datetime.now().strftime("%Y-%m-%d")
+        
+        targets_list = skipped.targets_list
+        if isinstance(targets_list, (list, set, frozenset)):
+            targets_list = ", ".join(sorted(str(t) for t in targets_list))
+        
+        return {
+            "Date": date_str,
+            "Match_Name": skipped.match_name,
+            "Competition": skipped.competition,
+            "Minute_75_Score": skipped.minute_75_score,
+            "Targets_List": targets_list,
+            "Reason": skipped.reason,
+            "BestBack": skipped.best_back,
+            "BestLay": skipped.best_lay,
+            "Spread_Ticks": skipped.spread_ticks,
+            "Current_Odds": skipped.current_odds,
+            "Timestamp": timestamp
+        }
+    
+    def write_skipped_matches(self, skipped_matches: List[SkippedMatch]):
+        """
+        Write several skipped match records to the Excel file with a single save
+        
+        Args:
+            skipped_matches: Skipped matches to append
+        """
+        if not skipped_matches:
+            return
+        
         try:
             if self.excel_path.exists():
                 df = pd.read_excel(self.excel_path)
@@ -435,36 +587,7 @@ class SkippedMatchesWriter:
                     "Current_Odds", "Timestamp"
                 ])
             
-            timestamp = skipped_data.get("timestamp", datetime.now())
-            if isinstance(timestamp, str):
-                try:
-                    timestamp = pd.to_datetime(timestamp)
-                except:
-                    timestamp = datetime.now()
-            elif not isinstance(timestamp, datetime):
-                timestamp = datetime.now()
-            
-            date_str = timestamp.strftime("%Y-%m-%d") if isinstance(timestamp, datetime) else datetime.now().strftime("%Y-%m-%d")
-            
-            targets_list = skipped_data.get("targets_list", "")
-            if isinstance(targets_list, (list, set)):
-                targets_list = ", ".join(sorted(str(t) for t in targets_list))
-            
-            new_row = {
-                "Date": date_str,
-                "Match_Name": skipped_data.get("match_name", ""),
-                "Competition": skipped_data.get("competition", ""),
-                "Minute_75_Score": skipped_data.get("minute_75_score", skipped_data.get("minute", "")),
-                "Targets_List": targets_list,
-                "Reason": skipped_data.get("reason", ""),
-                "BestBack": skipped_data.get("best_back", 0.0),
-                "BestLay": skipped_data.get("best_lay", 0.0),
-                "Spread_Ticks": skipped_data.get("spread_ticks", 0.0),
-                "Current_Odds": skipped_data.get("current_odds", 0.0),
-                "Timestamp": timestamp
-            }
-            
-            new_df = pd.DataFrame([new_row])
+            new_df = pd.DataFrame([self._to_row(skipped) for skipped in skipped_matches])
             df = pd.concat([df, new_df], ignore_index=True)
             
             if 'Timestamp' in df.columns:
@@ -476,7 +599,8 @@ class SkippedMatchesWriter:
                 if 'Timestamp' in df.columns:
                     worksheet.column_dimensions['J'].width = 20
             
-            logger.info(f"Skipped match recorded: {skipped_data.get('match_name', 'N/A')} - {skipped_data.get('reason', 'N/A')}")
+            for skipped in skipped_matches:
+                logger.info(f"Skipped match recorded: {skipped.match_name} - {skipped.reason}")
             
         except Exception as e:
             logger.error(f"Error writing skipped match to Excel: {str(e)}")
@@ -487,10 +611,20 @@ class SkippedMatchesWriter:
 # TRACKING LIST LOGGER
 # ============================================================================
 
+# Last rendered tracking table: (fingerprint, text) - reused while no tracked match changed
+_last_tracking_table: Optional[tuple] = None
+# An unchanged table is only re-logged every N calls (heartbeat)
+TRACKING_TABLE_HEARTBEAT_CALLS = 30
+_unchanged_tracking_table_calls = 0
+
+
 def log_tracking_list(match_tracker_manager, excel_path: Optional[str] = None):
     """
     Log tracking list for all active trackers with real-time data
     
+    The table is logged when any tracked match changes (minute/score/trackers), and
+    otherwise only every TRACKING_TABLE_HEARTBEAT_CALLS calls.
+    
     Args:
         match_tracker_manager: MatchTrackerManager instance
         excel_path: Optional path to Excel file for target scores
@@ -498,22 +632,23 @@ def log_tracking_list(match_tracker_manager, excel_path: Optional[str] = None):
     if not match_tracker_manager:
         return
     
-    from logic.match_tracker import MatchState
-    
     # Cleanup discarded trackers before logging
     match_tracker_manager.cleanup_discarded()
     
+    # Nothing to format when INFO is disabled
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     all_trackers = match_tracker_manager.get_all_trackers()
     # Filter out DISQUALIFIED and FINISHED trackers
     active_trackers = [t for t in all_trackers 
                      if t.state != MatchState.DISQUALIFIED 
                      and t.state != MatchState.FINISHED]
     
-    logger.info("📊 Tracking List (Betfair event name + Live event name + min + score)")
+    header = "📊 Tracking List (Betfair event name + Live event name + min + score)"
     
     if not active_trackers:
-        logger.info("(No active matches being tracked)")
-        logger.info("")
+        logger.info(f"{header}\n(No active matches being tracked)\n")
         return
     
     # Sort trackers by match start time (earliest first, latest last)
@@ -524,16 +659,25 @@ def log_tracking_list(match_tracker_manager, excel_path: Optional[str] = None):
     
     # Get Excel path if not provided
     if not excel_path:
-        from pathlib import Path
-        project_root = Path(__file__).parent.parent.parent
-        excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
-        excel_path = str(excel_path) if excel_path.exists() else None
+        excel_path = excel_path_or_none()
+    
+    # Rows only depend on event, minute and score (names/competition are fixed per event)
+    global _last_tracking_table, _unchanged_tracking_table_calls
+    fingerprint = (excel_path, tuple((t.betfair_event_id, t.current_minute, t.current_score) for t in active_trackers))
+    if _last_tracking_table is not None and _last_tracking_table[0] == fingerprint:
+        # Same table as last time: skip it, except for a periodic heartbeat
+        _unchanged_tracking_table_calls += 1
+        if _unchanged_tracking_table_calls >= TRACKING_TABLE_HEARTBEAT_CALLS:
+            _unchanged_tracking_table_calls = 0
+            logger.info(_last_tracking_table[1])
+        return
+    _unchanged_tracking_table_calls = 0
     
+    lines = [header]
     for idx, tracker in enumerate(active_trackers, 1):
         # Get target scores from Excel for this competition
         target_scores = []
         if excel_path:
-            from logic.qualification import get_competition_targets
             targets = get_competition_targets(tracker.competition_name, excel_path)
             if targets:
                 target_scores = sorted(list(targets))
@@ -545,8 +689,11 @@ def log_tracking_list(match_tracker_manager, excel_path: Optional[str] = None):
         # Use latest data from tracker (updated every 15s)
         betfair_name = tracker.betfair_event_name
         live_name = tracker.live_event_name
-        log_line = f"{idx}. {betfair_name} + {live_name} (min {tracker.current_minute}, score {tracker.current_score}) [{targets_str}]"
-        logger.info(log_line)
+        lines.append(f"{idx}. {betfair_name} + {live_name} (min {tracker.current_minute}, score {tracker.current_score}) [{targets_str}]")
     
-    logger.info("")
+    # Whole table in one logging call
+    lines.append("")
+    table = "\n".join(lines)
+    _last_tracking_table = (fingerprint, table)
+    logger.info(table)
 
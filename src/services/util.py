@@ -4,12 +4,19 @@ Consolidated utility functions: Auth, Setup, Formatters, Bet Utils, Session Util
 """
 import time
 import logging
+import operator
+import random
 import re
+import threading
 import pandas as pd
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
 from typing import Tuple, Optional, Any, List, Set, Dict
 from datetime import datetime
 
+from logic.match_tracker import MatchState
+
 logger = logging.getLogger("BetfairBot")
 
 
@@ -17,14 +24,46 @@ logger = logging.getLogger("BetfairBot")
 # AUTH UTILITIES
 # ============================================================================
 
-def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: Optional[Any] = None) -> Tuple[Optional[str], dict]:
-    """Perform login with retry logic and error handling"""
+# Minimum seconds between "Retrying in ..." console notices during login retries
+LOGIN_RETRY_NOTICE_INTERVAL = 100
+
+
+def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: Optional[Any] = None,
+                             stop_event: Optional[threading.Event] = None) -> Tuple[Optional[str], dict]:
+    """
+    Perform login with retry logic and error handling
+    
+    Args:
+        config: Configuration dictionary
+        authenticator: BetfairAuthenticator instance
+        email_notifier: Optional EmailNotifier for maintenance/terms alerts
+        stop_event: Optional Event; setting it ends a retry wait immediately and returns no token
+    
+    Returns:
+        Tuple of (session_token or None, email_flags)
+    """
     betfair_config = config["betfair"]
     use_password_login = betfair_config.get("use_password_login", False)
     retry_delay = config.get("session", {}).get("retry_delay_seconds", 10)
     max_login_attempts = 999999
     login_attempt = 0
     session_token = None
+    last_retry_notice: Optional[float] = None
+    
+    def wait_before_retry() -> bool:
+        """Wait retry_delay seconds; True if the caller should stop retrying"""
+        try:
+            if stop_event is not None:
+                if stop_event.wait(retry_delay):
+                    logger.info("Stop requested during login retry")
+                    return True
+            else:
+                time.sleep(retry_delay)
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user during login retry")
+            print("\n\nStopping...")
+            return True
+        return False
     
     email_flags = {
         'email_sent_for_maintenance': False,
@@ -58,7 +97,10 @@ def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: O
                     "NETWORK"
                 ])
                 
-                should_show_retry = (login_attempt == 1) or (login_attempt % 10 == 1)
+                now = time.monotonic()
+                should_show_retry = last_retry_notice is None or now - last_retry_notice >= LOGIN_RETRY_NOTICE_INTERVAL
+                if should_show_retry:
+                    last_retry_notice = now
                 
                 if is_maintenance_error:
                     if login_attempt == 1:
@@ -77,11 +119,7 @@ def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: O
                     if should_show_retry:
                         print(f"   Retrying in {retry_delay} seconds... (attempt {login_attempt})")
                     
-                    try:
-                        time.sleep(retry_delay)
-                    except KeyboardInterrupt:
-                        logger.info("Interrupted by user during login retry")
-                        print("\n\nStopping...")
+                    if wait_before_retry():
                         return None, email_flags
                 elif is_retryable_error:
                     if login_attempt == 1:
@@ -90,11 +128,7 @@ def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: O
                     if should_show_retry:
                         print(f"   Retrying in {retry_delay} seconds... (attempt {login_attempt})")
                     
-                    try:
-                        time.sleep(retry_delay)
-                    except KeyboardInterrupt:
-                        logger.info("Interrupted by user during login retry")
-                        print("\n\nStopping...")
+                    if wait_before_retry():
                         return None, email_flags
                 else:
                     error_str = str(error).upper()
@@ -105,8 +139,8 @@ def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: O
                     
                     if login_attempt == 1:
                         logger.error(f"Login failed: {error}")
-                        print(f"✗ Login failed: {error}")
-                        print(f"\nPlease check: https://www.betfair.it/ app_key, Username, password.")
+                        print(f"✗ Login failed: {error}\n"
+                              f"\nPlease check: https://www.betfair.it/ app_key, Username, password.")
                         
                         if login_attempt == 1 and is_terms_error and email_notifier and not email_flags['email_sent_for_terms']:
                             try:
@@ -119,11 +153,7 @@ def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: O
                     if should_show_retry:
                         print(f"\nRetrying in {retry_delay} seconds... (attempt {login_attempt}) (Press Ctrl+C to stop)")
                     
-                    try:
-                        time.sleep(retry_delay)
-                    except KeyboardInterrupt:
-                        logger.info("Interrupted by user during login retry")
-                        print("\n\nStopping...")
+                    if wait_before_retry():
                         return None, email_flags
         except KeyboardInterrupt:
             logger.info("Interrupted by user during login attempt")
@@ -137,28 +167,100 @@ def perform_login_with_retry(config: dict, authenticator: Any, email_notifier: O
 # SESSION UTILITIES
 # ============================================================================
 
+# Error message fragments that mean there is no internet connection (DNS / unreachable host)
+NO_INTERNET_ERROR_RE = re.compile(
+    r"getaddrinfo failed|NameResolutionError|Failed to resolve|unreachable host|Connection refused"
+)
+
+# Error message fragments that mean the Betfair session expired or is invalid
+AUTH_ERROR_RE = re.compile(r"401|INVALID_SESSION|UNAUTHORIZED")
+
+
+def relogin(use_password_login: bool, authenticator, market_service, 
+            keep_alive_manager, betting_service=None) -> Tuple[bool, Optional[str]]:
+    """
+    Log in again and hand the new session token to every service that uses it
+    
+    The authenticator and services keep their pooled HTTP session across re-logins,
+    so only the token changes and open TLS connections are reused.
+    
+    Returns:
+        Tuple of (success, error message); login exceptions propagate to the caller
+    """
+    if use_password_login:
+        success, error = authenticator.login_with_password()
+    else:
+        success, error = authenticator.login()
+    if success:
+        new_token = authenticator.get_session_token()
+        market_service.update_session_token(new_token)
+        keep_alive_manager.update_session_token(new_token)
+        if betting_service:
+            betting_service.update_session_token(new_token)
+    return success, error
+
+
+def try_relogin(use_password_login: bool, authenticator, market_service, keep_alive_manager,
+                betting_service=None, retry_wait: Optional[float] = None,
+                success_message: str = "Re-login successful") -> bool:
+    """
+    Re-login once and log the outcome (never raises)
+    
+    Args:
+        use_password_login: Use password login instead of certificate login
+        authenticator: BetfairAuthenticator instance
+        market_service: Market service to receive the new token
+        keep_alive_manager: Keep-alive manager to receive the new token
+        betting_service: Optional betting service to receive the new token
+        retry_wait: Seconds until the caller retries (shown in failure logs)
+        success_message: Log message on success
+    
+    Returns:
+        True if the new session token was handed to the services
+    """
+    retry_note = f" (will retry in {retry_wait:.0f}s)" if retry_wait is not None else ""
+    try:
+        success, error = relogin(use_password_login, authenticator, market_service,
+                                 keep_alive_manager, betting_service)
+    except Exception as e:
+        error_msg = str(e)
+        if NO_INTERNET_ERROR_RE.search(error_msg):
+            logger.warning("No internet connection - skipping re-login attempt")
+        else:
+            logger.warning(f"Re-login attempt failed{retry_note}: {error_msg[:100]}")
+        return False
+    
+    if success:
+        logger.info(success_message)
+    else:
+        logger.warning(f"Re-login failed{retry_note}: {error}")
+    return success
+
+
+def retry_backoff_delay(attempt: int, base_delay: float, max_delay: float = 60.0) -> float:
+    """
+    Delay before the next retry: capped exponential backoff with ±10% jitter
+    
+    Args:
+        attempt: Consecutive failed attempts so far (1 = first failure)
+        base_delay: Delay after the first failure in seconds
+        max_delay: Upper bound in seconds (before jitter)
+    
+    Returns:
+        Delay in seconds
+    """
+    delay = min(base_delay * (2 ** min(max(attempt - 1, 0), 6)), max_delay)
+    return delay * random.uniform(0.9, 1.1)
+
+
 def create_session_expired_handler(use_password_login: bool, authenticator, market_service, 
                                    keep_alive_manager, betting_service=None):
     """Create a callback function for handling session expiry"""
     def handle_session_expired():
         """Callback when keep-alive detects session expiry"""
         logger.warning("Session expiry detected by keep-alive, attempting re-login...")
-        try:
-            if use_password_login:
-                success, error = authenticator.login_with_password()
-            else:
-                success, error = authenticator.login()
-            if success:
-                new_token = authenticator.get_session_token()
-                market_service.update_session_token(new_token)
-                keep_alive_manager.update_session_token(new_token)
-                if betting_service:
-                    betting_service.update_session_token(new_token)
-                logger.info("Re-login successful after keep-alive detected expiry")
-            else:
-                logger.warning(f"Re-login failed after keep-alive expiry: {error}")
-        except Exception as e:
-            logger.error(f"Error during re-login from keep-alive callback: {str(e)}")
+        try_relogin(use_password_login, authenticator, market_service, keep_alive_manager,
+                    betting_service, success_message="Re-login successful after keep-alive detected expiry")
     
     return handle_session_expired
 
@@ -257,39 +359,57 @@ def format_tracking_table(trackers: List[Any], excel_path: Optional[str] = None)
     return "\n".join(lines)
 
 
-def format_skipped_matches_section(skipped_matches: List[Dict[str, Any]]) -> str:
-    """Format skipped matches section for console output"""
+def format_skipped_matches_section(skipped_matches: List[Any]) -> str:
+    """Format skipped matches section (list of SkippedMatch) for console output"""
     if not skipped_matches:
         return ""
     
     lines = []
     for skipped in skipped_matches:
-        match_name = skipped.get("match_name", "N/A")
-        reason = skipped.get("reason", "Unknown reason")
-        lines.append(f"[SKIPPED] {match_name} – Reason: {reason}")
+        lines.append(f"[SKIPPED] {skipped.match_name} – Reason: {skipped.reason}")
     
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=256)
+def _box_borders(inner_width: int) -> Tuple[str, str]:
+    """Top and bottom box borders around inner_width columns (widths repeat, so cached)"""
+    bar = "─" * inner_width
+    return f"┌{bar}┐", f"└{bar}┘"
+
+
 def format_boxed_message(message: str) -> str:
     """Format a message with a box border"""
-    width = max(60, len(message) + 4)
-    
-    top_border = "┌" + "─" * (width - 2) + "┐"
-    bottom_border = "└" + "─" * (width - 2) + "┘"
-    
-    padding = (width - len(message) - 2) // 2
-    left_padding = " " * padding
-    right_padding = " " * (width - len(message) - 2 - padding)
-    content = f"│{left_padding}{message}{right_padding}│"
+    inner_width = max(58, len(message) + 2)
+    top_border, bottom_border = _box_borders(inner_width)
     
-    return f"{top_border}\n{content}\n{bottom_border}"
+    padding = (inner_width - len(message)) // 2
+    return f"{top_border}\n│{' ' * padding}{message}{' ' * (inner_width - len(message) - padding)}│\n{bottom_border}"
+
+
+def render_checklist_box(items: List[str], title: str = "Setup Checklist"):
+    """Log checklist items inside a titled box (empty items render as blank rows)"""
+    inner_width = (max(len(item) for item in items) if items else 60) + 2
+    top_border, bottom_border = _box_borders(inner_width)
+    
+    lines = ["", top_border, f"│{title.center(inner_width)}│", f"├{'─' * inner_width}┤"]
+    lines.extend(f"│{item.ljust(inner_width)}│" for item in items)
+    lines.extend([bottom_border, ""])
+    logger.info("\n".join(lines))
 
 
 # ============================================================================
 # BET UTILITIES
 # ============================================================================
 
+# Goal line in an Over/Under selection name, e.g. "Over 2.5 Goals" -> "2.5"
+SELECTION_TARGET_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Winning condition per selection side: total goals vs. the goal line
+# (matched as substrings like bet_executor's runner lookup; "under" is checked first)
+SELECTION_SIDE_COMPARATORS = (("under", operator.lt), ("over", operator.gt))
+
+
 def determine_bet_outcome(final_score: str, selection: str, target_over: Optional[float] = None) -> str:
     """Determine bet outcome from final score for Over/Under markets"""
     try:
@@ -303,7 +423,7 @@ def determine_bet_outcome(final_score: str, selection: str, target_over: Optiona
         total_goals = home_goals + away_goals
         
         if target_over is None:
-            match = re.search(r'(\d+\.?\d*)', selection)
+            match = SELECTION_TARGET_RE.search(selection)
             if match:
                 target_over = float(match.group(1))
             else:
@@ -311,20 +431,12 @@ def determine_bet_outcome(final_score: str, selection: str, target_over: Optiona
                 return "Void"
         
         selection_lower = selection.lower()
+        for side, compare in SELECTION_SIDE_COMPARATORS:
+            if side in selection_lower:
+                return "Won" if compare(total_goals, target_over) else "Lost"
         
-        if "over" in selection_lower:
-            if total_goals > target_over:
-                return "Won"
-            else:
-                return "Lost"
-        elif "under" in selection_lower:
-            if total_goals < target_over:
-                return "Won"
-            else:
-                return "Lost"
-        else:
-            logger.warning(f"Unknown selection type: {selection}")
-            return "Void"
+        logger.warning(f"Unknown selection type: {selection}")
+        return "Void"
             
     except (ValueError, IndexError) as e:
         logger.warning(f"Error determining bet outcome: {str(e)}")
@@ -335,13 +447,10 @@ def process_finished_matches(match_tracker_manager, bet_tracker, excel_writer,
                              target_over: Optional[float] = None,
                              telegram_notifier: Optional[Any] = None):
     """Process finished matches: settle bets and export to Excel"""
-    from logic.match_tracker import MatchState
-    
     if not bet_tracker or not excel_writer:
         return
     
-    all_trackers = match_tracker_manager.get_all_trackers()
-    finished_trackers = [t for t in all_trackers if t.state == MatchState.FINISHED]
+    finished_trackers = match_tracker_manager.get_trackers_by_state(MatchState.FINISHED)
     
     for tracker in finished_trackers:
         final_score = tracker.current_score
@@ -377,18 +486,9 @@ def process_finished_matches(match_tracker_manager, bet_tracker, excel_writer,
                             logger.error(f"Failed to send Telegram bet settled notification: {str(e)}")
                     
                     try:
-                        bet_dict = settled_bet.to_dict()
-                        excel_writer.update_bet_record(
-                            bet_id=settled_bet.bet_id,
-                            updates={
-                                "Outcome": bet_dict.get("Outcome", "Pending"),
-                                "Profit_Loss": bet_dict.get("Profit_Loss", 0.0),
-                                "Updated_Bankroll": bet_dict.get("Updated_Bankroll", settled_bet.bankroll_before),
-                                "Status": bet_dict.get("Status", "Pending"),
-                                "Settled_At": bet_dict.get("Settled_At")
-                            }
-                        )
-                        logger.info(f"Bet {settled_bet.bet_id} settled and updated in Excel: {outcome}, P/L: {settled_bet.profit_loss:.2f}, Updated Bankroll: {bet_dict.get('Updated_Bankroll', 0.0):.2f}")
+                        settlement_update = settled_bet.to_settlement_update()
+                        excel_writer.update_bet_record(bet_id=settled_bet.bet_id, updates=settlement_update)
+                        logger.info(f"Bet {settled_bet.bet_id} settled and updated in Excel: {outcome}, P/L: {settled_bet.profit_loss:.2f}, Updated Bankroll: {settlement_update['Updated_Bankroll']:.2f}")
                     except Exception as e:
                         logger.error(f"Error updating bet {settled_bet.bet_id} in Excel: {str(e)}")
 
@@ -397,14 +497,41 @@ def process_finished_matches(match_tracker_manager, bet_tracker, excel_writer,
 # SETUP UTILITIES
 # ============================================================================
 
+def _load_bankroll_from_excel(excel_writer: Any) -> Optional[float]:
+    """Get Updated_Bankroll of the last settled bet in the bet log (None if unavailable)"""
+    try:
+        all_bets = excel_writer.get_all_bets()
+        if not all_bets.empty and 'Updated_Bankroll' in all_bets.columns:
+            settled_bets = all_bets[all_bets['Outcome'].isin(['Won', 'Lost', 'VOID'])]
+            if not settled_bets.empty:
+                last_bankroll = settled_bets['Updated_Bankroll'].dropna()
+                if not last_bankroll.empty:
+                    try:
+                        bankroll_from_excel = float(last_bankroll.iloc[-1])
+                        logger.info(f"Loaded bankroll from Excel (last settled bet): {bankroll_from_excel:.2f}")
+                        return bankroll_from_excel
+                    except (ValueError, TypeError):
+                        pass
+    except Exception as e:
+        logger.debug(f"Could not load bankroll from Excel: {str(e)}")
+    return None
+
+
 def initialize_all_services(config: dict, session_token: str, service_factory: Any, 
-                            authenticator: Any, use_password_login: bool) -> Tuple[Dict[str, Any], List[str]]:
-    """Initialize all services and build setup checklist"""
+                            authenticator: Any, use_password_login: bool) -> Tuple[SimpleNamespace, List[str]]:
+    """
+    Initialize all services and build setup checklist
+    
+    Returns:
+        Tuple of (services namespace, checklist_items). Optional services that are
+        disabled or failed to initialize are None (collections default to empty).
+    """
     # create_session_expired_handler is defined in this file, no need to import
     from notifications.sound_notifier import SoundNotifier
     from notifications.email_notifier import EmailNotifier
     from notifications.telegram_notifier import TelegramNotifier
-    from services.tracking import BetTracker, ExcelWriter, SkippedMatchesWriter
+    from services.tracking import (BetTracker, ExcelWriter, SkippedMatchesWriter, PROJECT_ROOT,
+                                   EXCEL_PATH, SKIPPED_MATCHES_PATH)
     from services.live import MatchMatcher
     from logic.match_tracker import MatchTrackerManager
     from config.competition_mapper import (get_competition_ids_from_excel, 
@@ -431,6 +558,19 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
     
     services['market_service'] = market_service
     
+    # The account funds call (network) and the bet log read (Excel) run in the background
+    # while keep-alive, Live API and Excel competition data are set up
+    setup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Setup")
+    account_funds_future = setup_pool.submit(market_service.get_account_funds)
+    
+    bet_tracking_config = config.get("bet_tracking", {})
+    track_outcomes = bet_tracking_config.get("track_outcomes", True)
+    bankroll_future = None
+    if track_outcomes:
+        excel_path = bet_tracking_config.get("excel_path", "competitions/Competitions_Results_Odds_Stake.xlsx")
+        excel_path_full = PROJECT_ROOT / excel_path
+        bankroll_future = setup_pool.submit(_load_bankroll_from_excel, ExcelWriter(str(excel_path_full)))
+    
     keep_alive_interval = config["session"].get("keep_alive_interval_seconds", 300)
     keep_alive_manager = KeepAliveManager(
         app_key=betfair_config["app_key"],
@@ -450,27 +590,13 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
     keep_alive_manager.start()
     services['keep_alive_manager'] = keep_alive_manager
     
-    account_funds = market_service.get_account_funds()
-    initial_bankroll = 0.0
-    account_balance_str = "N/A"
-    if account_funds:
-        available_balance = account_funds.get("availableToBetBalance", "N/A")
-        account_balance_str = str(available_balance)
-        try:
-            initial_bankroll = float(available_balance) if isinstance(available_balance, (int, float, str)) else 0.0
-        except (ValueError, TypeError):
-            initial_bankroll = 0.0
-    
-    login_method_str = "Password" if use_password_login else "Certificate"
-    checklist_items.append(f"  ✓ Login ({login_method_str}): Success - Account balance: {account_balance_str}")
-    
     live_score_config = config.get("live_score_api", {})
     live_api_rate_limit = "N/A"
     if not live_score_config:
         services['live_score_client'] = None
         services['match_matcher'] = None
         services['match_tracker_manager'] = None
-        services['zero_zero_exception_competitions'] = set()
+        services['zero_zero_exception_competitions'] = frozenset()
     else:
         api_plan = live_score_config.get("api_plan", "trial")
         rate_limit = live_score_config.get("rate_limit_per_day")
@@ -490,38 +616,34 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
         services['match_matcher'] = MatchMatcher()
         services['match_tracker_manager'] = MatchTrackerManager()
         
-        project_root = Path(__file__).parent.parent.parent
-        excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
-        if excel_path.exists():
-            services['zero_zero_exception_competitions'] = get_competitions_with_zero_zero_exception(str(excel_path))
-            live_api_competition_ids = get_live_api_competition_ids_from_excel(str(excel_path))
+        if EXCEL_PATH.exists():
+            services['zero_zero_exception_competitions'] = get_competitions_with_zero_zero_exception(str(EXCEL_PATH))
+            live_api_competition_ids = get_live_api_competition_ids_from_excel(str(EXCEL_PATH))
             services['live_api_competition_ids'] = live_api_competition_ids
         else:
-            services['zero_zero_exception_competitions'] = set()
+            services['zero_zero_exception_competitions'] = frozenset()
             services['live_api_competition_ids'] = []
     
-    bet_tracking_config = config.get("bet_tracking", {})
-    if bet_tracking_config.get("track_outcomes", True):
-        excel_path = bet_tracking_config.get("excel_path", "competitions/Competitions_Results_Odds_Stake.xlsx")
-        project_root = Path(__file__).parent.parent.parent
-        excel_path_full = project_root / excel_path
-        
-        excel_writer_temp = ExcelWriter(str(excel_path_full))
-        bankroll_from_excel = None
+    login_method_str = "Password" if use_password_login else "Certificate"
+    try:
+        account_funds = account_funds_future.result()
+    except Exception as e:
+        logger.warning(f"Could not retrieve account funds: {str(e)}")
+        account_funds = None
+    initial_bankroll = 0.0
+    account_balance_str = "N/A"
+    if account_funds:
+        available_balance = account_funds.get("availableToBetBalance", "N/A")
+        account_balance_str = str(available_balance)
         try:
-            all_bets = excel_writer_temp.get_all_bets()
-            if not all_bets.empty and 'Updated_Bankroll' in all_bets.columns:
-                settled_bets = all_bets[all_bets['Outcome'].isin(['Won', 'Lost', 'VOID'])]
-                if not settled_bets.empty:
-                    last_bankroll = settled_bets['Updated_Bankroll'].dropna()
-                    if not last_bankroll.empty:
-                        try:
-                            bankroll_from_excel = float(last_bankroll.iloc[-1])
-                            logger.info(f"Loaded bankroll from Excel (last settled bet): {bankroll_from_excel:.2f}")
-                        except (ValueError, TypeError):
-                            pass
-        except Exception as e:
-            logger.debug(f"Could not load bankroll from Excel: {str(e)}")
+            initial_bankroll = float(available_balance) if isinstance(available_balance, (int, float, str)) else 0.0
+        except (ValueError, TypeError):
+            initial_bankroll = 0.0
+    
+    checklist_items.append(f"  ✓ Login ({login_method_str}): Success - Account balance: {account_balance_str}")
+    
+    if track_outcomes:
+        bankroll_from_excel = bankroll_future.result()
         
         final_bankroll = bankroll_from_excel if bankroll_from_excel is not None else initial_bankroll
         if bankroll_from_excel is not None:
@@ -536,14 +658,13 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
         services['excel_writer'] = None
         checklist_items.append(f"  ✗ Bet tracker: Disabled")
     
-    project_root = Path(__file__).parent.parent.parent
-    skipped_matches_path = project_root / "competitions" / "Skipped Matches.xlsx"
-    services['skipped_matches_writer'] = SkippedMatchesWriter(str(skipped_matches_path))
-    checklist_items.append(f"  ✓ Skipped matches writer: {skipped_matches_path.name}")
+    setup_pool.shutdown(wait=False)
     
-    excel_path_for_zero_zero = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
-    zero_zero_exception_competitions = services.get('zero_zero_exception_competitions', set())
-    if excel_path_for_zero_zero.exists():
+    services['skipped_matches_writer'] = SkippedMatchesWriter(str(SKIPPED_MATCHES_PATH))
+    checklist_items.append(f"  ✓ Skipped matches writer: {SKIPPED_MATCHES_PATH.name}")
+    
+    zero_zero_exception_competitions = services.get('zero_zero_exception_competitions', frozenset())
+    if EXCEL_PATH.exists():
         zero_zero_count = len(zero_zero_exception_competitions)
         if zero_zero_count > 0:
             checklist_items.append(f"  ✓ 0-0 exception competitions: {zero_zero_count} competition(s)")
@@ -610,14 +731,13 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
     event_type_ids = monitoring_config.get("event_type_ids", [1])
     competition_ids = monitoring_config.get("competition_ids", [])
     
-    project_root = Path(__file__).parent.parent.parent
-    excel_path = project_root / "competitions" / "Competitions_Results_Odds_Stake.xlsx"
-    if excel_path.exists():
+    excel_path = EXCEL_PATH
+    if EXCEL_PATH.exists():
         checklist_items.append(f"  ✓ Reading competitions from Excel: {excel_path.name}")
     else:
         checklist_items.append(f"  ⚠ Reading competitions from Excel: File not found")
     
-    if not competition_ids and excel_path.exists():
+    if not competition_ids and EXCEL_PATH.exists():
         betfair_competitions = market_service.list_competitions(event_type_ids)
         
         if betfair_competitions:
@@ -641,7 +761,7 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
     
     checklist_items.append(f"  ✓ Logging initialized successfully")
     
-    if competition_ids and excel_path.exists():
+    if competition_ids and EXCEL_PATH.exists():
         try:
             df = pd.read_excel(str(excel_path))
             betfair_competitions = market_service.list_competitions(event_type_ids)
@@ -695,5 +815,12 @@ def initialize_all_services(config: dict, session_token: str, service_factory: A
     checklist_items.append("")
     checklist_items.append(f"  ℹ Press Ctrl + C to stop the program")
     
-    return services, checklist_items
+    services.setdefault('zero_zero_exception_competitions', frozenset())
+    services.setdefault('live_api_competition_ids', [])
+    for optional_service in ('live_score_client', 'match_matcher', 'match_tracker_manager',
+                             'bet_tracker', 'excel_writer', 'betting_service',
+                             'sound_notifier', 'telegram_notifier'):
+        services.setdefault(optional_service, None)
+    
+    return SimpleNamespace(**services), checklist_items
 
@@ -5,7 +5,8 @@ Allows communication between BotService and main() for stop signals
 import threading
 
 # Global stop event that can be set by BotService and checked by main()
-_stop_event = None
+# (a default Event is provided so main() can always wait on it)
+_stop_event = threading.Event()
 
 
 def set_stop_event(event: threading.Event):
@@ -19,9 +20,11 @@ def get_stop_event() -> threading.Event:
     return _stop_event
 
 
+def request_stop():
+    """Signal main() to stop"""
+    _stop_event.set()
+
+
 def should_stop() -> bool:
     """Check if bot should stop"""
-    if _stop_event is None:
-        return False
     return _stop_event.is_set()
-
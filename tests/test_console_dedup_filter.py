@@ -0,0 +1,54 @@
+"""
+Test script for ConsoleDedupFilter
+Checks that repeated INFO console messages are suppressed and warnings never are
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.logging_setup import ConsoleDedupFilter
+
+
+def make_record(level: int, msg: str, *args) -> logging.LogRecord:
+    """Build a log record as the BetfairBot logger would"""
+    return logging.LogRecord("BetfairBot", level, __file__, 1, msg, args, None)
+
+
+def test_identical_info_suppressed_within_window():
+    """An identical consecutive INFO message is dropped until the window expires"""
+    dedup = ConsoleDedupFilter(window_seconds=0.2)
+    assert dedup.filter(make_record(logging.INFO, "Live API: %d matches", 3))
+    # Same formatted message, even when built from a different format/args
+    assert not dedup.filter(make_record(logging.INFO, "Live API: 3 matches"))
+
+    # A different message passes and becomes the one being compared against
+    assert dedup.filter(make_record(logging.INFO, "Live API: 4 matches"))
+    assert not dedup.filter(make_record(logging.INFO, "Live API: 4 matches"))
+
+    # Same text at another level is not a repeat
+    assert dedup.filter(make_record(logging.DEBUG, "Live API: 4 matches"))
+
+    time.sleep(0.25)
+    assert dedup.filter(make_record(logging.DEBUG, "Live API: 4 matches"))
+
+
+def test_warnings_never_suppressed():
+    """WARNING and ERROR records always pass, and don't reset the INFO comparison"""
+    dedup = ConsoleDedupFilter(window_seconds=60)
+    for _ in range(3):
+        assert dedup.filter(make_record(logging.WARNING, "Live Score API call failed"))
+        assert dedup.filter(make_record(logging.ERROR, "Live Score API call failed"))
+
+    assert dedup.filter(make_record(logging.INFO, "Waiting for matches"))
+    assert dedup.filter(make_record(logging.WARNING, "Live Score API call failed"))
+    assert not dedup.filter(make_record(logging.INFO, "Waiting for matches"))
+
+
+if __name__ == "__main__":
+    test_identical_info_suppressed_within_window()
+    test_warnings_never_suppressed()
+    print("✓ Console dedup filter tests passed")
@@ -0,0 +1,105 @@
+"""
+Test script for ExcelWriteQueue
+Checks batching, write order, the synchronous fallback and draining on stop()
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services.excel_write_queue import ExcelWriteQueue
+
+
+class FakeWriter:
+    """Stands in for ExcelWriter / SkippedMatchesWriter, recording each save"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def write_bet_records(self, bet_records):
+        self.calls.append(("bet records", [r["Bet_ID"] for r in bet_records], threading.current_thread().name))
+
+    def write_skipped_matches(self, skipped_matches):
+        self.calls.append(("skipped matches", list(skipped_matches), threading.current_thread().name))
+
+
+def make_queue(**kwargs):
+    """Create a queue whose writers share one call log"""
+    calls = []
+    write_queue = ExcelWriteQueue(FakeWriter(calls), FakeWriter(calls), **kwargs)
+    return write_queue, calls
+
+
+def test_batch_written_with_one_save():
+    """Records queued within the batch window are written with a single save"""
+    write_queue, calls = make_queue(batch_window_seconds=5)
+    write_queue.start()
+    for bet_id in ("b1", "b2", "b3"):
+        write_queue.submit_bet_record({"Bet_ID": bet_id})
+    write_queue.stop()
+
+    assert calls == [("bet records", ["b1", "b2", "b3"], "ExcelWriter")]
+
+
+def test_max_batch_size_splits_saves():
+    """A batch never holds more than max_batch_size records"""
+    write_queue, calls = make_queue(max_batch_size=2, batch_window_seconds=5)
+    write_queue.start()
+    for bet_id in ("b1", "b2", "b3", "b4", "b5"):
+        write_queue.submit_bet_record({"Bet_ID": bet_id})
+    write_queue.stop()
+
+    assert [ids for _, ids, _ in calls] == [["b1", "b2"], ["b3", "b4"], ["b5"]]
+
+
+def test_bet_records_written_before_skipped_matches():
+    """Within a batch, bet records are saved first, each kind in submission order"""
+    write_queue, calls = make_queue(batch_window_seconds=5)
+    write_queue.start()
+    write_queue.submit_skipped_match("s1")
+    write_queue.submit_bet_record({"Bet_ID": "b1"})
+    write_queue.submit_skipped_match("s2")
+    write_queue.submit_bet_record({"Bet_ID": "b2"})
+    write_queue.stop()
+
+    assert [(kind, items) for kind, items, _ in calls] == [
+        ("bet records", ["b1", "b2"]),
+        ("skipped matches", ["s1", "s2"]),
+    ]
+
+
+def test_sync_fallback_when_not_started():
+    """Without a running worker, each record is written right away on the calling thread"""
+    write_queue, calls = make_queue()
+    write_queue.submit_bet_record({"Bet_ID": "b1"})
+    assert calls == [("bet records", ["b1"], threading.current_thread().name)]
+
+    write_queue.submit_skipped_match("s1")
+    assert calls[-1] == ("skipped matches", ["s1"], threading.current_thread().name)
+
+
+def test_stop_drains_pending_records():
+    """stop() returns only after records still inside the batch window are written"""
+    write_queue, calls = make_queue(batch_window_seconds=60)
+    write_queue.start()
+    write_queue.submit_bet_record({"Bet_ID": "b1"})
+    write_queue.submit_skipped_match("s1")
+    write_queue.stop()
+
+    assert [kind for kind, _, _ in calls] == ["bet records", "skipped matches"]
+    assert not write_queue._worker_thread.is_alive()
+
+    # Once stopped, records are written synchronously again
+    write_queue.submit_bet_record({"Bet_ID": "b2"})
+    assert calls[-1] == ("bet records", ["b2"], threading.current_thread().name)
+
+
+if __name__ == "__main__":
+    test_batch_written_with_one_save()
+    test_max_batch_size_splits_saves()
+    test_bet_records_written_before_skipped_matches()
+    test_sync_fallback_when_not_started()
+    test_stop_drains_pending_records()
+    print("✓ Excel write queue tests passed")
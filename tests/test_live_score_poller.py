@@ -0,0 +1,66 @@
+"""
+Test script for LiveScorePoller background refresh
+Checks that poll() waits a bounded time for the prefetched Live API call
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services.live_score_poller import LiveScorePoller
+
+
+class FakeLiveScoreClient:
+    """Live Score client whose calls block until release is set"""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.release = threading.Event()
+        self.calls = 0
+
+    def get_live_matches(self, competition_ids=None):
+        self.calls += 1
+        self.release.wait(5)
+        return self.matches
+
+
+def test_poll_uses_prefetched_result():
+    """A prefetched call that finishes within the wait is used by the same poll"""
+    client = FakeLiveScoreClient([{"id": "1"}])
+    client.release.set()
+    poller = LiveScorePoller(client, prefetch_wait_seconds=2)
+    try:
+        poller.prefetch(60)
+        assert poller.poll(60) == [{"id": "1"}]
+        assert client.calls == 1
+    finally:
+        poller.close()
+
+
+def test_poll_falls_back_to_cache_after_timeout():
+    """A slow prefetched call doesn't block poll() past prefetch_wait_seconds"""
+    client = FakeLiveScoreClient([{"id": "2"}])
+    poller = LiveScorePoller(client, prefetch_wait_seconds=0.1)
+    poller.cached_matches = [{"id": "cached"}]
+    try:
+        poller.prefetch(60)
+        started = time.monotonic()
+        assert poller.poll(60) == [{"id": "cached"}]
+        assert time.monotonic() - started < 1
+
+        # The result is picked up once the call finishes, without a second call
+        client.release.set()
+        poller._refresh_future.result(timeout=2)
+        assert poller.poll(60) == [{"id": "2"}]
+        assert client.calls == 1
+    finally:
+        poller.close()
+
+
+if __name__ == "__main__":
+    test_poll_uses_prefetched_result()
+    test_poll_falls_back_to_cache_after_timeout()
+    print("✓ Live score poller tests passed")
@@ -0,0 +1,80 @@
+"""
+Test script for MatchTrackerManager state buckets
+Checks that trackers are bucketed by state in the order they entered it
+"""
+import sys
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from logic.match_tracker import MatchTracker, MatchTrackerManager, MatchState
+
+
+def make_tracker(event_id: str) -> MatchTracker:
+    """Create a tracker with placeholder match details"""
+    return MatchTracker(event_id, f"Home {event_id} v Away {event_id}", f"live-{event_id}", "Test League")
+
+
+def event_ids(manager: MatchTrackerManager, state: MatchState):
+    """Event IDs returned by get_trackers_by_state, in order"""
+    return [t.betfair_event_id for t in manager.get_trackers_by_state(state)]
+
+
+def test_buckets_follow_state_assignment():
+    """Buckets follow state changes and keep the order trackers entered each state"""
+    manager = MatchTrackerManager()
+    trackers = {event_id: make_tracker(event_id) for event_id in ("3", "1", "2")}
+    for tracker in trackers.values():
+        manager.add_tracker(tracker)
+    assert event_ids(manager, MatchState.WAITING_60) == ["3", "1", "2"]
+
+    trackers["2"].state = MatchState.MONITORING_60_74
+    trackers["3"].state = MatchState.MONITORING_60_74
+    assert event_ids(manager, MatchState.WAITING_60) == ["1"]
+    assert event_ids(manager, MatchState.MONITORING_60_74) == ["2", "3"]
+
+    # Re-assigning the same state doesn't move a tracker to the end
+    trackers["2"].state = MatchState.MONITORING_60_74
+    assert event_ids(manager, MatchState.MONITORING_60_74) == ["2", "3"]
+
+    trackers["3"].state = MatchState.FINISHED
+    trackers["1"].state = MatchState.FINISHED
+    assert event_ids(manager, MatchState.FINISHED) == ["3", "1"]
+    assert event_ids(manager, MatchState.MONITORING_60_74) == ["2"]
+
+
+def test_remove_and_cleanup_update_buckets():
+    """remove_tracker and cleanup drop trackers from their buckets and detach them"""
+    manager = MatchTrackerManager()
+    trackers = {event_id: make_tracker(event_id) for event_id in ("1", "2", "3", "4")}
+    for tracker in trackers.values():
+        manager.add_tracker(tracker)
+    trackers["1"].state = MatchState.FINISHED
+    trackers["2"].state = MatchState.DISQUALIFIED
+    trackers["3"].state = MatchState.FINISHED
+
+    manager.remove_tracker("3")
+    assert event_ids(manager, MatchState.FINISHED) == ["1"]
+    # A removed tracker no longer updates the manager
+    trackers["3"].state = MatchState.WAITING_60
+    assert event_ids(manager, MatchState.WAITING_60) == ["4"]
+
+    assert manager.cleanup({MatchState.FINISHED, MatchState.DISQUALIFIED}) == 2
+    assert event_ids(manager, MatchState.FINISHED) == []
+    assert event_ids(manager, MatchState.DISQUALIFIED) == []
+    assert len(manager) == 1
+
+    # Re-adding a tracker puts it at the end of its state bucket
+    manager.add_tracker(trackers["1"])
+    assert event_ids(manager, MatchState.FINISHED) == ["1"]
+    manager.add_tracker(trackers["3"])
+    trackers["4"].state = MatchState.MONITORING_60_74
+    trackers["4"].state = MatchState.WAITING_60
+    assert event_ids(manager, MatchState.WAITING_60) == ["3", "4"]
+
+
+if __name__ == "__main__":
+    test_buckets_follow_state_assignment()
+    test_remove_and_cleanup_update_buckets()
+    print("✓ Match tracker manager tests passed")
@@ -0,0 +1,96 @@
+"""
+Test script for MatchingService pass skipping
+Checks that perform_matching only repeats a pass when its inputs change
+"""
+import sys
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from logic.match_tracker import MatchTracker, MatchTrackerManager
+from services.matching_service import MatchingService
+
+
+class FakeMatcher:
+    """Match matcher that never matches and records which events it was asked about"""
+
+    def __init__(self):
+        self.matched_events = []
+
+    def match_betfair_to_live_api(self, betfair_event, live_matches, competition_name, mapping):
+        self.matched_events.append(betfair_event["id"])
+        return None
+
+    def analyze_rejection_reason(self, betfair_event, live_matches, competition_name, mapping):
+        return "No match"
+
+
+def make_event(event_id: str):
+    """Betfair event entry as built by the market detector"""
+    return {
+        "event": {"id": event_id, "name": f"Home {event_id} v Away {event_id}"},
+        "competition": {"id": "100", "name": "Test League"},
+    }
+
+
+def make_service():
+    """MatchingService with a fake matcher and an empty tracker manager"""
+    matcher = FakeMatcher()
+    manager = MatchTrackerManager()
+    service = MatchingService(None, matcher, manager, {}, set())
+    return service, matcher, manager
+
+
+def test_unchanged_inputs_skip_the_pass():
+    """Same events, same live list object and same trackers repeat nothing"""
+    service, matcher, _ = make_service()
+    events = {"1": make_event("1")}
+    live_matches = [{"id": "live-1"}]
+
+    service.perform_matching(events, live_matches, iteration=1)
+    service.perform_matching(dict(events), live_matches, iteration=2)
+    assert matcher.matched_events == ["1"]
+
+    # A refresh always runs a full pass
+    service.perform_matching(events, live_matches, iteration=3, is_refresh=True)
+    assert matcher.matched_events == ["1", "1"]
+
+
+def test_new_live_list_forces_a_pass():
+    """A new live list object runs the pass again, even with equal contents"""
+    service, matcher, _ = make_service()
+    events = {"1": make_event("1")}
+    live_matches = [{"id": "live-1"}]
+
+    service.perform_matching(events, live_matches, iteration=1)
+    service.perform_matching(events, list(live_matches), iteration=2)
+    assert matcher.matched_events == ["1", "1"]
+
+
+def test_tracker_changes_force_a_pass():
+    """Adding or removing a tracker runs the pass again"""
+    service, matcher, manager = make_service()
+    events = {"1": make_event("1"), "2": make_event("2")}
+    live_matches = [{"id": "live-1"}]
+
+    service.perform_matching(events, live_matches, iteration=1)
+    assert matcher.matched_events == ["1", "2"]
+
+    manager.add_tracker(MatchTracker("2", "Home 2 v Away 2", "live-2", "Test League"))
+    service.perform_matching(events, live_matches, iteration=2)
+    assert matcher.matched_events == ["1", "2", "1"]
+
+    service.perform_matching(events, live_matches, iteration=3)
+    assert matcher.matched_events == ["1", "2", "1"]
+
+    manager.remove_tracker("2")
+    service.perform_matching(events, live_matches, iteration=4)
+    assert matcher.matched_events == ["1", "2", "1", "1", "2"]
+
+
+if __name__ == "__main__":
+    test_unchanged_inputs_skip_the_pass()
+    test_new_live_list_forces_a_pass()
+    test_tracker_changes_force_a_pass()
+    print("✓ Matching service tests passed")
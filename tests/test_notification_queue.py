@@ -0,0 +1,89 @@
+"""
+Test script for NotificationQueue
+Checks background dispatch, the synchronous fallback, draining on stop() and dropping when full
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from notifications.notification_queue import NotificationQueue
+
+
+def test_sync_fallback_when_not_started():
+    """Without a running worker, the notification is sent right away on the calling thread"""
+    notification_queue = NotificationQueue()
+    sent = []
+    assert notification_queue.submit("test", lambda *args, **kwargs: sent.append(
+        (args, kwargs, threading.current_thread().name)), 1, key="value")
+    assert sent == [((1,), {"key": "value"}, threading.current_thread().name)]
+
+
+def test_stop_drains_in_order_on_worker():
+    """Queued notifications are sent in order on the worker thread before stop() returns"""
+    notification_queue = NotificationQueue()
+    release = threading.Event()
+    sent = []
+
+    def notify(value):
+        release.wait(5)
+        sent.append((value, threading.current_thread() is not threading.main_thread()))
+
+    notification_queue.start()
+    for value in range(3):
+        assert notification_queue.submit("test", notify, value)
+    # Nothing can be sent before the first notifier call is released
+    assert sent == []
+    release.set()
+    notification_queue.stop()
+
+    assert sent == [(0, True), (1, True), (2, True)]
+    assert not notification_queue._worker_thread.is_alive()
+
+
+def test_full_queue_drops_notification():
+    """submit() returns False once max_size notifications are pending"""
+    notification_queue = NotificationQueue(max_size=1)
+    release = threading.Event()
+    started = threading.Event()
+    sent = []
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    notification_queue.start()
+    assert notification_queue.submit("blocking", block)
+    assert started.wait(5)
+    assert notification_queue.submit("pending", sent.append, "kept")
+    assert not notification_queue.submit("dropped", sent.append, "dropped")
+    release.set()
+    notification_queue.stop()
+
+    assert sent == ["kept"]
+
+
+def test_failed_notification_does_not_stop_worker():
+    """An exception from a notifier is logged, and later notifications are still sent"""
+    notification_queue = NotificationQueue()
+    sent = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    notification_queue.start()
+    notification_queue.submit("failing", fail)
+    notification_queue.submit("ok", sent.append, "after failure")
+    notification_queue.stop()
+
+    assert sent == ["after failure"]
+
+
+if __name__ == "__main__":
+    test_sync_fallback_when_not_started()
+    test_stop_drains_in_order_on_worker()
+    test_full_queue_drops_notification()
+    test_failed_notification_does_not_stop_worker()
+    print("✓ Notification queue tests passed")
@@ -0,0 +1,41 @@
+"""
+Test script for PollingIntervalService idle backoff
+Checks that a long idle period keeps a capped interval instead of overflowing
+"""
+import sys
+from pathlib import Path
+
+# Add src to path (go up one level from tests/ to project root, then into src/)
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services.polling_interval_service import PollingIntervalService
+
+
+def test_geometric_idle_backoff_long_idle():
+    """Thousands of idle iterations stay at the capped interval (no OverflowError)"""
+    service = PollingIntervalService(default_interval=60, idle_backoff_base=1.3,
+                                     max_idle_multiplier=8, max_idle_interval=300)
+    interval = None
+    for _ in range(10000):
+        interval = service.apply_idle_backoff(60, False)
+    assert interval == 300
+    assert service.idle_iterations == 10000
+
+    # Activity resets to the normal interval
+    assert service.apply_idle_backoff(60, True) == 60
+    assert service.idle_iterations == 0
+
+
+def test_stepwise_idle_backoff_long_idle():
+    """Default (stepwise) backoff stays at the maximum multiplier"""
+    service = PollingIntervalService(default_interval=10, max_idle_multiplier=8)
+    interval = None
+    for _ in range(10000):
+        interval = service.apply_idle_backoff(10, False)
+    assert interval == 80
+
+
+if __name__ == "__main__":
+    test_geometric_idle_backoff_long_idle()
+    test_stepwise_idle_backoff_long_idle()
+    print("✓ Idle backoff tests passed")